@@ -1,19 +1,113 @@
 from abc import ABC, abstractmethod
+from functools import wraps
+
+import numpy as np
+
+import instrumentation
+from gradestats import GradeStats
+from plan import passes
+
+
+def cached_aggregate(method):
+    """Memoize an aggregate until the element (or one of its children) changes."""
+    key = method.__name__
+    name = method.__qualname__
+
+    @wraps(method)
+    def wrapper(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        elif key in cache:
+            if instrumentation.is_enabled():
+                instrumentation.record_cache(name, True)
+            return cache[key]
+        if instrumentation.is_enabled():
+            instrumentation.record_cache(name, False)
+        value = cache[key] = method(self)
+        return value
+    return wrapper
+
+
+def cached_structure(method):
+    """Memoize a value derived from the structure only, until the structure changes."""
+    key = method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        cache = self._structure_cache
+        if cache is None:
+            cache = self._structure_cache = {}
+        if key not in cache:
+            cache[key] = method(self)
+        return cache[key]
+    return wrapper
+
+
+def cached_cohort_result(method):
+    """Memoize the evaluation of a cohort like an aggregate, for the last cohort evaluated.
+
+    The cached result is shared by every caller and must not be modified.
+    """
+    key = method.__name__
+
+    @wraps(method)
+    def wrapper(self, cohort):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        entry = cache.get(key)
+        if entry is None or entry[0] is not cohort:
+            entry = cache[key] = (cohort, method(self, cohort))
+        return entry[1]
+    return wrapper
+
+
+class TrackedAttribute:
+    """Attribute whose assignment invalidates the cached aggregates of its owner."""
+
+    def __set_name__(self, owner, name):
+        self.private_name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.private_name)
+
+    def __set__(self, obj, value):
+        setattr(obj, self.private_name, value)
+        obj.invalidate(structure=True)
+
 
 class AcademicElement(ABC):
     """Abstract base class for academic entities (Module, Unit, Semester, etc.)."""
 
+    # Slotted layout: elements are created in large numbers, one tree per student
+    __slots__ = ("name", "title", "_coef", "_credit", "_cache", "_structure_cache", "_parents")
+
+    _WEEKS = 15  # Encapsulation: private class constant
+
+    # Workload distribution (volume horaire); only modules have their own
+    hours_lecture = 0
+    hours_td = 0
+    hours_tp = 0
+
+    coef = TrackedAttribute()
+    credit = TrackedAttribute()
+
     def __init__(self, name, title):
+        # Memoized aggregates, artifacts derived from the structure only
+        # (e.g. compiled plans) and the elements aggregating this one.
+        # Caches are allocated on first use to keep idle elements small.
+        self._cache = None
+        self._structure_cache = None
+        self._parents = ()
+
         self.name = name
         self.title = title
-        self._WEEKS = 15  # Encapsulation: private attribute
-        self.coef = 0
-        self.credit = 0
-
-        # Workload distribution (volume horaire)
-        self.hours_lecture = 0
-        self.hours_td = 0
-        self.hours_tp = 0
+        # Nothing is cached or aggregated yet: set tracked fields directly
+        self._coef = 0
+        self._credit = 0
 
     @abstractmethod
     def calculate_average(self):
@@ -25,6 +119,59 @@ class AcademicElement(ABC):
         """Abstract method to be implemented by subclasses."""
         pass
 
+    def children(self):
+        """The elements aggregated by this one, in order."""
+        return ()
+
+    @cached_structure
+    def required_credits(self):
+        """Credits awarded when everything below this element is passed."""
+        return sum(child.required_credits() for child in self.children())
+
+    @cached_aggregate
+    def eliminated(self):
+        """Whether a module below was failed on an eliminatory grade (per student in cohort mode)."""
+        eliminated = False
+        for child in self.children():
+            eliminated = eliminated | child.eliminated()
+        return eliminated
+
+    def _compensate(self, earned):
+        """Award every required credit where the average reaches the pass mark.
+
+        Failed modules are then compensated by the others, unless one of
+        them was failed on an eliminatory grade.
+        """
+        compensated = passes(self.calculate_average()) & np.logical_not(self.eliminated())
+        if np.ndim(compensated) == 0:
+            return self.required_credits() if compensated else earned
+        return np.where(compensated, self.required_credits(), earned)
+
+    @cached_aggregate
+    def statistics(self):
+        """Mean, variance, extrema, pass rate and histogram of the averages, in one pass."""
+        return GradeStats.from_values(self.calculate_average())
+
+    def invalidate(self, structure=False):
+        """Drop cached aggregates of this element and of every ancestor.
+
+        With structure=True, structure-derived artifacts are dropped as well.
+        """
+        self._cache = None
+        if structure:
+            self._structure_cache = None
+        for parent in self._parents:
+            parent.invalidate(structure)
+
+    def _adopt(self, child):
+        """Register self as an aggregating parent of child."""
+        child._parents += (self,)
+        self.invalidate(structure=True)
+
+    def to_csv(self):
+        """Describe the element as a curriculum CSV row (see from_csv)."""
+        return {'code': self.name, 'title': self.title}
+
     def display_info(self):
         """Display basic information about the academic element."""
-        return f"{self.name}: {self.title} (Coef: {self.coef}, Credit: {self.credit})"
\ No newline at end of file
+        return f"{self.name}: {self.title} (Coef: {self.coef}, Credit: {self.credit})"
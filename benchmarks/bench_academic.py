@@ -0,0 +1,183 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import GSIAcademicManager
+from synthetic import (
+    fill_random_grades, synthetic_student_ids, write_synthetic_curriculum,
+    write_synthetic_grades,
+)
+
+# name -> (semesters, units per semester, modules per unit, students)
+SIZES = {
+    "small": (1, 5, 2, 1_000),
+    "medium": (2, 6, 4, 10_000),
+    "large": (4, 8, 5, 50_000),
+}
+
+# A metric slower than baseline by more than this factor is a regression
+DEFAULT_TOLERANCE = 1.25
+
+
+def best_of(repeat, func):
+    """Return the best wall-clock time of repeat calls to func, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def quiet(func):
+    """Wrap func so that its stdout is discarded."""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+
+def invalidate_all(manager):
+    for semester in manager.semesters.values():
+        for unit in semester._units:
+            for module in unit._modules:
+                module.invalidate()
+
+
+def bench_size(workdir, semesters, units, modules, students, repeat, grade_rows_limit):
+    """Time every stage for one synthetic size; returns {metric: seconds}."""
+    curriculum_csv = os.path.join(workdir, "curriculum.csv")
+    module_codes = write_synthetic_curriculum(curriculum_csv, semesters, units, modules)
+    results = {}
+
+    def load():
+        manager = GSIAcademicManager()
+        manager.load_from_csv(curriculum_csv)
+        return manager
+    results["load_curriculum"] = best_of(repeat, quiet(load))
+
+    # Grade ingestion is measured on a bounded number of students so the
+    # file stays reasonable; the rate is what gets compared
+    grade_students = max(1, min(students, grade_rows_limit // len(module_codes)))
+    grades_csv = os.path.join(workdir, "grades.csv")
+    write_synthetic_grades(grades_csv, module_codes, grade_students)
+
+    def ingest():
+        manager = quiet(load)()
+        quiet(lambda: manager.load_grades_csv(grades_csv))()
+    seconds = best_of(repeat, ingest)
+    results["ingest_grades_per_1k_rows"] = seconds / (grade_students * len(module_codes)) * 1000
+
+    single = quiet(load)()
+
+    def report():
+        invalidate_all(single)
+        single.display_academic_structure()
+        single.calculate_student_results()
+    results["render_report"] = best_of(repeat, quiet(report))
+
+    manager = quiet(load)()
+    cohort = manager.enable_cohort(synthetic_student_ids(students))
+    fill_random_grades(cohort)
+
+    def aggregate():
+        invalidate_all(manager)
+        for semester in manager.semesters.values():
+            semester.calculate_average()
+    results["aggregate_average"] = best_of(repeat, aggregate)
+
+    def credits():
+        invalidate_all(manager)
+        for semester in manager.semesters.values():
+            semester.calculate_credits()
+    results["aggregate_credits"] = best_of(repeat, credits)
+
+    def cached_reads():
+        for semester in manager.semesters.values():
+            semester.calculate_average()
+            semester.calculate_credits()
+    results["cached_reads"] = best_of(repeat, cached_reads)
+
+    def compiled():
+        for semester in manager.semesters.values():
+            semester.compile().evaluate_cohort(cohort)
+    results["compiled_plan_evaluate"] = best_of(repeat, compiled)
+
+    return results
+
+
+def run(sizes, repeat, grade_rows_limit):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in sizes:
+            semesters, units, modules, students = SIZES[name]
+            results[name] = bench_size(workdir, semesters, units, modules, students,
+                                       repeat, grade_rows_limit)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Print current/baseline ratios and return the list of regressions."""
+    regressions = []
+    for size, metrics in current["results"].items():
+        for metric, seconds in metrics.items():
+            reference = baseline.get("results", {}).get(size, {}).get(metric)
+            if not reference:
+                continue
+            ratio = seconds / reference
+            flag = ""
+            if ratio > tolerance:
+                flag = "  ✗ REGRESSION"
+                regressions.append((size, metric, ratio))
+            print(f"  {size:>7} {metric:<28} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def print_results(current):
+    for size, metrics in current["results"].items():
+        print(f"\n{size}:")
+        for metric, seconds in metrics.items():
+            print(f"  {metric:<28} {seconds * 1000:10.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GSI academic model.")
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--grade-rows", type=int, default=200_000,
+                        help="upper bound on generated grade rows per size")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat, args.grade_rows)
+    print_results(current)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print("\nCompared to baseline:")
+        if compare(current, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from concurrency import ConcurrentManager
+from events import grade_event
+from main import GSIAcademicManager
+from synthetic import fill_random_grades, synthetic_student_ids
+
+CURRICULUM_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gsi_curriculum.csv")
+
+
+def build(students):
+    manager = GSIAcademicManager()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.load_from_csv(CURRICULUM_CSV)
+    fill_random_grades(manager.enable_cohort(synthetic_student_ids(students)))
+    return ConcurrentManager(manager)
+
+
+def run(students, threads, operations, write_share, batch_size, seed=0):
+    """Run a mixed read/write load on a thread pool; returns throughput and latencies."""
+    concurrent = build(students)
+    manager = concurrent.manager
+    student_ids = manager.cohort.student_ids
+    module_codes = list(manager.modules)
+    semester_code = next(iter(manager.semesters))
+    rng = np.random.default_rng(seed)
+    plan = rng.random(operations) < write_share
+    picks = rng.integers(0, len(student_ids), (operations, batch_size))
+    modules = rng.integers(0, len(module_codes), (operations, batch_size))
+    values = rng.integers(0, 81, (operations, batch_size)) / 4
+
+    def operation(i):
+        start = time.perf_counter()
+        if plan[i]:
+            concurrent.apply_events(
+                grade_event(student_ids[s], module_codes[m], "exam", float(v))
+                for s, m, v in zip(picks[i], modules[i], values[i]))
+        else:
+            concurrent.result(student_ids[picks[i, 0]], semester_code)
+        return plan[i], time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        outcomes = list(executor.map(operation, range(operations)))
+    elapsed = time.perf_counter() - start
+
+    write_latencies = np.array([seconds for is_write, seconds in outcomes if is_write])
+    read_latencies = np.array([seconds for is_write, seconds in outcomes if not is_write])
+    return {
+        "threads": threads,
+        "seconds": elapsed,
+        "writes_per_second": len(write_latencies) * batch_size / elapsed,
+        "reads_per_second": len(read_latencies) / elapsed,
+        "write_p50_ms": float(np.percentile(write_latencies, 50) * 1000) if len(write_latencies) else None,
+        "write_p99_ms": float(np.percentile(write_latencies, 99) * 1000) if len(write_latencies) else None,
+        "read_p50_ms": float(np.percentile(read_latencies, 50) * 1000) if len(read_latencies) else None,
+        "read_p99_ms": float(np.percentile(read_latencies, 99) * 1000) if len(read_latencies) else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark concurrent grade writes and reads.")
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--operations", type=int, default=20_000)
+    parser.add_argument("--write-share", type=float, default=0.2,
+                        help="fraction of operations that are grade batches")
+    parser.add_argument("--batch-size", type=int, default=10, help="grades per write batch")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = [run(args.students, threads, args.operations, args.write_share, args.batch_size)
+               for threads in args.threads]
+    for result in results:
+        print(f"  {result['threads']:>3} threads: {result['writes_per_second']:10,.0f} grades/s written, "
+              f"{result['reads_per_second']:10,.0f} reads/s, "
+              f"write p99 {result['write_p99_ms']:.2f} ms, read p99 {result['read_p99_ms']:.2f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, file, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import GSIAcademicManager
+from parallel import evaluate_semesters
+from synthetic import fill_random_grades, synthetic_student_ids, write_synthetic_curriculum
+
+
+def build(students, semesters, units, modules):
+    manager = GSIAcademicManager()
+    with tempfile.TemporaryDirectory() as workdir:
+        curriculum_csv = os.path.join(workdir, "curriculum.csv")
+        write_synthetic_curriculum(curriculum_csv, semesters, units, modules)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.load_from_csv(curriculum_csv)
+    fill_random_grades(manager.enable_cohort(synthetic_student_ids(students)))
+    return manager
+
+
+def best_of(repeat, func):
+    """Return the best wall-clock time of repeat calls to func, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(manager, workers, repeat):
+    """Time batch results inline, on a fresh pool per call and on a reused pool."""
+    semesters = list(manager.semesters.values())
+    cohort = manager.cohort
+    result = {"students": len(cohort), "workers": workers}
+    if workers == 1:
+        result["inline_seconds"] = best_of(repeat, lambda: evaluate_semesters(semesters, cohort, workers=1))
+        return result
+
+    def fresh_pool():
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            evaluate_semesters(semesters, cohort, workers=workers, executor=executor)
+    result["fresh_pool_seconds"] = best_of(repeat, fresh_pool)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Warm the pool up once: workers start on first use
+        evaluate_semesters(semesters, cohort, workers=workers, executor=executor)
+        result["reused_pool_seconds"] = best_of(
+            repeat, lambda: evaluate_semesters(semesters, cohort, workers=workers, executor=executor))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark batch results inline and on process pools.")
+    parser.add_argument("--students", type=int, nargs="+", default=[10_000, 100_000, 200_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--semesters", type=int, default=4)
+    parser.add_argument("--units", type=int, default=6)
+    parser.add_argument("--modules", type=int, default=4, help="modules per unit")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{os.cpu_count()} CPU(s)")
+    for students in args.students:
+        manager = build(students, args.semesters, args.units, args.modules)
+        for workers in args.workers:
+            result = run(manager, workers, args.repeat)
+            results.append(result)
+            timings = ", ".join(f"{key[:-len('_seconds')].replace('_', ' ')} {value:.3f} s"
+                                for key, value in result.items() if key.endswith("_seconds"))
+            print(f"  {students:>9,} students, {workers} worker(s): {timings}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "cpus": os.cpu_count(), "results": results}, file, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+import csv
+import gc
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+from grade_ingest import GRADE_COLUMNS, to_float, parse_chunks, read_chunks
+from policies import BUILTIN_POLICIES, parse_policy
+
+TEACHING_MODES = ("In-person", "Online", "Hybrid")
+
+# Numeric curriculum columns and the value used when a cell is left empty
+# or the column is absent (the Module.from_csv defaults)
+INTEGER_COLUMNS = {"coef": 1, "credit": 1, "continous_percent": 40, "exam_percent": 60}
+FLOAT_COLUMNS = {"hours_lecture": 0.0, "hours_td": 0.0, "hours_tp": 0.0}
+TEXT_COLUMNS = ("type", "code", "title", "parent", "teaching_mode", "policy", "rules")
+# Module constructor arguments after code and title, in order
+MODULE_COLUMNS = ("coef", "credit", "hours_lecture", "hours_td", "hours_tp",
+                  "teaching_mode", "continous_percent", "exam_percent")
+
+# Data rows start on the second line of a file
+FIRST_LINE = 2
+
+ELEMENT_TYPES = ("module", "unit", "semester", "year", "diploma")
+
+Problem = namedtuple("Problem", ["line", "code", "column", "message"])
+
+
+class ValidationReport(namedtuple("ValidationReport", ["rows", "problems"])):
+    """Every problem found in a file, sorted by line."""
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    def lines(self):
+        return [f"line {p.line} ({p.code or '?'}, {p.column}): {p.message}" for p in self.problems]
+
+
+def _split_plain(text):
+    """Split an unquoted CSV text into (header, line numbers, row-major cells), or None if ragged."""
+    lines = text.splitlines()
+    header = lines[0].split(',')
+    lines = lines[1:]
+    numbers = np.arange(FIRST_LINE, FIRST_LINE + len(lines))
+    if not all(lines):
+        filled = [i for i, line in enumerate(lines) if line]
+        numbers = numbers[filled]
+        lines = [lines[i] for i in filled]
+    cells = ','.join(lines).split(',') if lines else []
+    if len(cells) != len(lines) * len(header):
+        return None
+    return header, numbers, cells
+
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic garbage collector while building many objects at once.
+
+    Bulk loads allocate hundreds of thousands of elements that all survive;
+    letting the collector rescan them repeatedly roughly doubles the load time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_columns(csv_file):
+    """Read a CSV file into {column: list of cells}.
+
+    Returns (line numbers, columns); blank lines are skipped.
+    """
+    with open(csv_file, 'r', encoding='utf-8', newline='') as file:
+        return split_columns(file.read())
+
+
+def split_columns(text):
+    """Split CSV text, header line first, into (line numbers, {column: list of cells}).
+
+    Text without quoted fields is split in one pass; other text goes
+    through the csv module.
+    """
+    split = _split_plain(text) if text and '"' not in text else None
+    if split is None:
+        reader = csv.reader(text.splitlines())
+        header = next(reader, [])
+        numbered = [(reader.line_num, row) for row in reader if row]
+        width = len(header)
+        cells = [cell for _, row in numbered for cell in (row + [''] * width)[:width]]
+        split = header, np.array([line for line, _ in numbered], dtype=np.int64), cells
+    header, numbers, cells = split
+    width = len(header)
+    return numbers, {name.strip(): cells[i::width] for i, name in enumerate(header)}
+
+
+def to_numbers(cells, default):
+    """Convert a column of cells at once; returns (values, mask of unparsable cells).
+
+    Empty cells take the default value.
+    """
+    try:
+        values = np.fromiter(map(float, cells), dtype=np.float64, count=len(cells))
+        empty = np.zeros(len(cells), dtype=bool)
+    except ValueError:
+        # Slow path only for columns containing empty or malformed cells
+        values = np.array([to_float(cell) for cell in cells], dtype=np.float64).reshape(-1)
+        empty = np.array([not cell.strip() for cell in cells], dtype=bool).reshape(-1)
+    bad = ~np.isfinite(values) & ~empty
+    values[empty | bad] = default
+    return values, bad
+
+
+def _problems(mask, line_codes, column, message):
+    lines, codes = line_codes
+    return [Problem(int(lines[i]), codes[i], column, message) for i in np.flatnonzero(mask)]
+
+
+def parse_curriculum(csv_file, element_types=ELEMENT_TYPES, policies=BUILTIN_POLICIES):
+    """Parse and validate a curriculum file column by column.
+
+    Returns (columns, report): text columns as string arrays, numeric
+    columns as int/float arrays. Every check runs over whole columns, and
+    all problems are collected instead of stopping at the first one. Rows
+    of other types than element_types are ignored, as by the loader, except
+    "policy" rows declaring an evaluation policy from its rules; modules may
+    reference those and the already known policies.
+    """
+    return check_curriculum(*read_columns(csv_file), element_types, policies)
+
+
+def check_curriculum(lines, cells, element_types=ELEMENT_TYPES, policies=BUILTIN_POLICIES):
+    """Type and validate curriculum cells as read by read_columns (see parse_curriculum)."""
+    count = len(lines)
+    blank = np.full(count, '', dtype=str)
+    columns = {name: np.char.strip(np.array(cells[name], dtype=str)) if name in cells else blank
+               for name in TEXT_COLUMNS}
+    columns["type"] = np.char.lower(columns["type"])
+    known = np.isin(columns["type"], element_types)
+    line_codes = (lines, columns["code"].tolist())
+    modules = columns["type"] == "module"
+
+    problems = []
+    for name, default in {**INTEGER_COLUMNS, **FLOAT_COLUMNS}.items():
+        if name in cells:
+            values, bad = to_numbers(cells[name], default)
+        else:
+            values, bad = np.full(count, default, dtype=np.float64), np.zeros(count, dtype=bool)
+        problems += _problems(known & bad, line_codes, name, f"not a number: {name}")
+        if name in INTEGER_COLUMNS:
+            problems += _problems(known & ~bad & (values != np.round(values)), line_codes, name,
+                                  f"{name} must be a whole number")
+            values = np.round(values).astype(np.int64)
+        problems += _problems(known & (values < 0), line_codes, name, f"{name} must not be negative")
+        columns[name] = values
+
+    declared = columns["type"] == "policy"
+    coded = known | declared
+    problems += _problems(coded & (columns["code"] == ''), line_codes, "code", "missing code")
+    # Every occurrence of a code but the first one is a duplicate
+    order = np.argsort(columns["code"], kind="stable")
+    sorted_codes = columns["code"][order]
+    duplicated = np.zeros(count, dtype=bool)
+    duplicated[order[1:]] = sorted_codes[1:] == sorted_codes[:-1]
+    problems += _problems(coded & duplicated & (columns["code"] != ''), line_codes, "code", "duplicate code")
+
+    problems += _problems(declared & np.isin(columns["code"], list(BUILTIN_POLICIES)), line_codes,
+                          "code", "built-in policy name")
+    for i in np.flatnonzero(declared):
+        try:
+            parse_policy(columns["code"][i], columns["rules"][i])
+        except ValueError as error:
+            problems.append(Problem(int(lines[i]), line_codes[1][i], "rules", f"invalid policy: {error}"))
+    referenced = columns["policy"]
+    problems += _problems(modules & (referenced != '') & ~np.isin(referenced, list(policies))
+                          & ~np.isin(referenced, columns["code"][declared]),
+                          line_codes, "policy", "unknown evaluation policy")
+
+    percents = columns["continous_percent"] + columns["exam_percent"]
+    problems += _problems(modules & (percents != 100), line_codes, "exam_percent",
+                          "continous_percent + exam_percent must equal 100")
+    problems += _problems(modules & ~np.isin(columns["teaching_mode"], TEACHING_MODES),
+                          line_codes, "teaching_mode",
+                          f"unknown teaching mode (expected one of {', '.join(TEACHING_MODES)})")
+
+    problems.sort(key=lambda problem: problem.line)
+    columns["line"] = lines
+    return columns, ValidationReport(count, problems)
+
+
+def validate_grade_file(csv_file, module_codes, chunk_size=50_000):
+    """Check a student_id,module_code,tp,td,exam file; returns a ValidationReport.
+
+    Unlike ingest_grades, which drops bad rows, this reports each of them.
+    """
+    known = np.array(sorted(module_codes), dtype=str)
+    problems = []
+    line = FIRST_LINE
+    for chunk in parse_chunks(read_chunks(csv_file, chunk_size)):
+        lines = np.arange(line, line + len(chunk.student_ids))
+        line_codes = (lines, chunk.module_codes)
+        problems += _problems(np.char.strip(np.array(chunk.student_ids, dtype=str)) == '',
+                              line_codes, "student_id", "missing student id")
+        problems += _problems(~np.isin(np.array(chunk.module_codes, dtype=str), known),
+                              line_codes, "module_code", "unknown module")
+        for column, name in enumerate(GRADE_COLUMNS[2:]):
+            values = chunk.values[:, column]
+            problems += _problems(np.isinf(values), line_codes, name, "not a number")
+            problems += _problems(np.isfinite(values) & ((values < 0) | (values > 20)),
+                                  line_codes, name, "grade outside 0-20")
+        line += len(chunk.student_ids)
+    problems.sort(key=lambda problem: problem.line)
+    return ValidationReport(line - FIRST_LINE, problems)
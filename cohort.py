@@ -0,0 +1,216 @@
+import numpy as np
+
+# Order of the grade columns in every cohort array
+COMPONENTS = ("tp", "td", "exam", "resit")
+
+# Grades are quarter points stored in one byte: code = grade * GRADE_SCALE,
+# 0..80 for 0..20/20, and MISSING for a grade not entered yet
+GRADE_SCALE = 4
+GRADE_DTYPE = np.uint8
+MISSING = 255
+MAX_GRADE = 20
+
+# code -> grade, with NaN for MISSING
+_DECODE = np.append(np.arange(MISSING, dtype=np.float64) / GRADE_SCALE, np.nan)
+
+
+def encode_grades(values):
+    """Round grades to the nearest quarter point and encode them; NaN becomes MISSING.
+
+    Raises ValueError for a grade outside 0-20 (or infinite), which would
+    otherwise wrap around in the byte encoding.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    invalid = ~missing & ~((values >= 0) & (values <= MAX_GRADE))
+    if invalid.any():
+        raise ValueError(f"Grade {values[invalid].flat[0]:g} outside 0-{MAX_GRADE}")
+    codes = np.rint(np.where(missing, 0, values) * GRADE_SCALE)
+    return np.where(missing, MISSING, codes).astype(GRADE_DTYPE)
+
+
+def decode_grades(codes):
+    """Turn encoded grades back into floats, with NaN for missing grades."""
+    return _DECODE[codes]
+
+
+def incomplete_rows(missing, counted):
+    """Reduce a (..., components) mask of missing grades to the rows missing a counted one.
+
+    counted broadcasts against missing. The components are combined one at
+    a time: reducing over a short last axis is many times slower.
+    """
+    rows = missing[..., 0] & counted[..., 0]
+    for component in range(1, missing.shape[-1]):
+        rows |= missing[..., component] & counted[..., component]
+    return rows
+
+
+def weighted_average(codes, weights):
+    """Weighted average of encoded (..., components) grades, computed on the codes.
+
+    The result is NaN (incomplete) where a grade with a positive weight is missing.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    averages = np.asarray(codes @ (weights / GRADE_SCALE))
+    missing = codes == MISSING
+    if missing.any():
+        incomplete = incomplete_rows(missing, weights > 0)
+        averages = np.where(incomplete, np.nan, averages)
+    return averages
+
+
+class Cohort:
+    """Columnar grade storage for a group of students following the same curriculum.
+
+    Grades live in a single contiguous array of shape
+    (modules, students, components), so each module owns one
+    (students, components) block and a whole cohort is evaluated in one call.
+    The array holds encoded grades (see encode_grades): one byte per grade,
+    MISSING until a grade is entered.
+    """
+
+    def __init__(self, student_ids=(), module_codes=()):
+        self.module_codes = list(module_codes)
+        self._slots = {code: i for i, code in enumerate(self.module_codes)}
+        self.student_ids = []
+        self._row_index = {}
+        self._bound = []
+        self._listeners = []
+        # Shared memory block holding _grades, if any (see shared_cohort.share)
+        self._buffer = None
+        self._grades = np.full((len(self.module_codes), 0, len(COMPONENTS)), MISSING, dtype=GRADE_DTYPE)
+        self.add_students(student_ids)
+
+    @classmethod
+    def from_array(cls, student_ids, module_codes, grades):
+        """Wrap an existing array of encoded grades without copying it."""
+        cohort = cls((), module_codes)
+        cohort._grades = grades
+        cohort.student_ids = list(student_ids)
+        # Built on first lookup, so wrapping (e.g. in a worker) stays cheap
+        cohort._row_index = None
+        return cohort
+
+    @property
+    def _rows(self):
+        if self._row_index is None:
+            self._row_index = {sid: i for i, sid in enumerate(self.student_ids)}
+        return self._row_index
+
+    def __len__(self):
+        return len(self.student_ids)
+
+    @property
+    def grades(self):
+        """View of the encoded grade array restricted to registered students."""
+        return self._grades[:, :len(self.student_ids)]
+
+    def add_students(self, student_ids):
+        """Register new students, growing the storage geometrically when full."""
+        new_ids = [sid for sid in dict.fromkeys(student_ids) if sid not in self._rows]
+        if not new_ids:
+            return
+        size = len(self.student_ids) + len(new_ids)
+        capacity = self._grades.shape[1]
+        if size > capacity:
+            grown = np.full((len(self.module_codes), max(size, 2 * capacity), len(COMPONENTS)),
+                            MISSING, dtype=GRADE_DTYPE)
+            grown[:, :capacity] = self._grades
+            self._grades = grown
+        for sid in new_ids:
+            self._rows[sid] = len(self.student_ids)
+            self.student_ids.append(sid)
+        self.invalidate()
+
+    def attach(self, module):
+        """Bind a module to its grade block; returns the module's slot."""
+        self._bound.append(module)
+        return self.slot(module.name)
+
+    def slot(self, module_code):
+        """Return the index of a module in the grade array."""
+        return self._slots[module_code]
+
+    def row(self, student_id):
+        """Return the index of a student in the grade array."""
+        try:
+            return self._rows[student_id]
+        except KeyError:
+            raise KeyError(f"Unknown student: {student_id}") from None
+
+    def rows(self, student_ids):
+        """Return the indices of several students as an integer array."""
+        return np.fromiter((self.row(sid) for sid in student_ids), dtype=np.intp)
+
+    def module_block(self, slot):
+        """Return the encoded (students, components) grade block of one module."""
+        return self._grades[slot, :len(self.student_ids)]
+
+    def module_grades(self, slot):
+        """Return the grades of one module as floats, NaN where missing."""
+        return decode_grades(self.module_block(slot))
+
+    def set_grades(self, slot, row, tp=None, td=None, exam=None, resit=None):
+        """Write the given components of one student's grades in one module.
+
+        Go through Module.set_grade so cached aggregates are invalidated.
+        """
+        codes = {column: encode_grades(value)
+                 for column, value in enumerate((tp, td, exam, resit)) if value is not None}
+        for column, code in codes.items():
+            self._grades[slot, row, column] = code
+        self._notify([slot], [row])
+
+    def scatter(self, slots, rows, values):
+        """Write many grades at once; NaN entries in values leave grades unchanged.
+
+        slots and rows are integer arrays of equal length, values has one
+        column per component. Modules whose grades changed are invalidated.
+        """
+        present = ~np.isnan(values)
+        # Encode every column first, so an invalid grade leaves the cohort unchanged
+        codes = [encode_grades(values[present[:, column], column]) for column in range(len(COMPONENTS))]
+        for column, code in enumerate(codes):
+            self._grades[slots[present[:, column]], rows[present[:, column]], column] = code
+        self._invalidate_modules(np.unique(slots).tolist())
+        self._notify(slots, rows)
+
+    def invalidate(self, slots=None):
+        """Invalidate the modules bound to the given slots (all by default).
+
+        Call this after writing to the grade array directly; listeners are
+        told that any grade may have changed.
+        """
+        self._invalidate_modules(slots)
+        self._notify(None, None)
+
+    def _invalidate_modules(self, slots=None):
+        touched = None if slots is None else set(slots)
+        for module in self._bound:
+            if touched is None or module._slot in touched:
+                module.invalidate()
+
+    def subscribe(self, listener):
+        """Call listener(slots, rows) after grades change.
+
+        slots and rows are parallel sequences of the changed (module, student)
+        cells, or both None when any grade may have changed.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, slots, rows):
+        for listener in self._listeners:
+            listener(slots, rows)
+
+    def student_grades(self, student_id, module_code):
+        """Return one student's grades in a module as a dict, NaN where missing."""
+        values = decode_grades(self._grades[self.slot(module_code), self.row(student_id)])
+        return dict(zip(COMPONENTS, values.tolist()))
+
+    def nbytes(self):
+        """Memory used by the grade array, in bytes."""
+        return self._grades.nbytes
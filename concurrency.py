@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+
+from cohort import COMPONENTS
+from events import grade_event
+from plan import result_status
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer.
+
+    Waiting writers take precedence over new readers, so a steady stream of
+    dashboard reads cannot starve grade entry.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class ConcurrentManager:
+    """Thread-safe front of a GSIAcademicManager in cohort mode.
+
+    Grade batches are applied under the write lock, all at once; every read
+    runs under the read lock, so readers run side by side and never see a
+    half-applied batch. Use read() to make several reads from one consistent
+    state. The wrapped manager must not be used directly meanwhile.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.lock = ReadWriteLock()
+        # Serializes the lazy creation of shared trackers between readers
+        self._setup = threading.Lock()
+
+    def read(self):
+        """Hold the read lock across several calls on self.manager."""
+        return self.lock.read()
+
+    def apply_events(self, events):
+        events = list(events)
+        with self.lock.write():
+            return self.manager.apply_events(events)
+
+    def set_student_grade(self, student_id, module_code, tp=None, td=None, exam=None, resit=None):
+        return self.apply_events(
+            grade_event(student_id, module_code, component, value)
+            for component, value in zip(COMPONENTS, (tp, td, exam, resit))
+            if value is not None
+        )
+
+    def result(self, student_id, semester_code):
+        """Average, credits and status of one student in one semester."""
+        with self.lock.read():
+            cohort = self.manager.cohort
+            plan = self.manager.semesters[semester_code].compile()
+            slots = [cohort.slot(code) for code in plan.module_codes]
+            evaluated = plan.evaluate(cohort.grades[slots, cohort.row(student_id)][:, None, :])
+        average = float(evaluated.average[0])
+        return {
+            "student": student_id,
+            "semester": semester_code,
+            "average": None if average != average else average,
+            "credits": int(evaluated.credits[0]),
+            "status": result_status(average, bool(evaluated.eliminated[0])),
+        }
+
+    def evaluate_cohort(self, semester_code):
+        with self.lock.read():
+            return self.manager.evaluate_cohort(semester_code)
+
+    def rank(self, code, student_id):
+        with self.lock.read():
+            with self._setup:
+                rankings = self.manager.rankings()
+            return rankings.rank(code, student_id)
+
+    def statistics(self, code):
+        """Statistics of a module, unit or semester, copied out under the lock."""
+        with self.lock.read():
+            with self._setup:
+                statistics = self.manager.statistics()
+            return statistics[code].as_dict()
@@ -0,0 +1,285 @@
+from collections import namedtuple
+
+import numpy as np
+
+from cohort import COMPONENTS, GRADE_DTYPE, MISSING
+from year import rollup
+
+CHANGE_KINDS = ("structural", "weight", "cosmetic")
+# Fields placing an element in the hierarchy
+STRUCTURAL_FIELDS = ("type", "parent")
+# Fields changing results without changing the structure; all others are cosmetic
+WEIGHT_FIELDS = ("coef", "credit", "hours_td", "hours_tp", "continous_percent", "exam_percent",
+                 "policy", "rules")
+# Levels whose results are rolled up from semester results
+ROLLUP_TYPES = ("year", "diploma")
+
+ElementChange = namedtuple("ElementChange", ["code", "element_type", "kind", "fields"])
+ElementChange.__doc__ = """One element that differs between two curriculum versions.
+
+kind is one of CHANGE_KINDS; fields names the changed fields, or is
+("added",) or ("removed",) for an element present in one version only.
+"""
+
+ResultDelta = namedtuple(
+    "ResultDelta",
+    ["student", "code", "old_average", "new_average", "old_credits", "new_credits"],
+)
+ResultDelta.__doc__ = """A student whose average or credits in an element changed (NaN average if incomplete)."""
+
+ElementDeltas = namedtuple(
+    "ElementDeltas",
+    ["code", "rows", "old_averages", "new_averages", "old_credits", "new_credits"],
+)
+ElementDeltas.__doc__ = """The changed results of one element, as arrays over the cohort rows in rows."""
+
+
+class CurriculumDiff(namedtuple("CurriculumDiff", ["changes"])):
+    """Every element change between two curriculum versions, in curriculum order."""
+
+    __slots__ = ()
+
+    def of_kind(self, kind):
+        return [change for change in self.changes if change.kind == kind]
+
+    @property
+    def structural(self):
+        """Whether an element was added, removed or moved."""
+        return any(change.kind == "structural" for change in self.changes)
+
+    def lines(self):
+        return [f"{change.element_type} {change.code}: {change.kind} ({', '.join(change.fields)})"
+                for change in self.changes]
+
+
+class RedeliberationReport(namedtuple("RedeliberationReport", ["diff", "recomputed", "student_ids", "changes"])):
+    """Results changed by a new curriculum version.
+
+    recomputed maps each semester evaluated again to the module codes that
+    were evaluated again in it, or None when the whole semester was (after
+    a structural change). changes holds an ElementDeltas for every module,
+    unit, semester, year or diploma with at least one changed student
+    result; rows index student_ids.
+    """
+
+    __slots__ = ()
+
+    @property
+    def students(self):
+        """Students with at least one changed result, in cohort order."""
+        if not self.changes:
+            return []
+        rows = np.unique(np.concatenate([change.rows for change in self.changes]))
+        return [self.student_ids[row] for row in rows.tolist()]
+
+    def deltas(self):
+        """Yield one ResultDelta per changed (element, student) result."""
+        for change in self.changes:
+            for row, *values in zip(change.rows.tolist(), change.old_averages.tolist(),
+                                    change.new_averages.tolist(), change.old_credits.tolist(),
+                                    change.new_credits.tolist()):
+                yield ResultDelta(self.student_ids[row], change.code, *values)
+
+    def lines(self):
+        return [f"{delta.student} {delta.code}: {delta.old_average:.2f} -> {delta.new_average:.2f}, "
+                f"credits {delta.old_credits:g} -> {delta.new_credits:g}"
+                for delta in self.deltas()]
+
+
+def _describe(manager):
+    """{code: {field: value}} for every element, with the coefficients and rules that affect results."""
+    described = {}
+    for element_type, (_, registry) in manager.ELEMENT_TYPES.items():
+        for code, element in getattr(manager, registry).items():
+            row = element.to_csv()
+            row.update(type=element_type, coef=element.coef, credit=element.credit,
+                       parent=element._parents[0].name if element._parents else '')
+            if element_type == 'module':
+                row['rules'] = element.policy.rules()
+            described[code] = row
+    return described
+
+
+def diff_curricula(old, new):
+    """Compare the curricula loaded by two managers, element by element.
+
+    A change of type or parent, or an element present in one version only,
+    is structural; a change to a field in WEIGHT_FIELDS (coefficients,
+    credits, evaluation percentages, hours deciding which grades count,
+    policy) is a weight change; anything else (titles, lecture hours,
+    teaching mode) is cosmetic and cannot change a result.
+    """
+    old_rows = _describe(old)
+    new_rows = _describe(new)
+    changes = []
+    for code in dict.fromkeys([*old_rows, *new_rows]):
+        before, after = old_rows.get(code), new_rows.get(code)
+        if after is None:
+            changes.append(ElementChange(code, before['type'], "structural", ("removed",)))
+        elif before is None:
+            changes.append(ElementChange(code, after['type'], "structural", ("added",)))
+        else:
+            fields = tuple(field for field in dict.fromkeys([*before, *after])
+                           if before.get(field) != after.get(field))
+            if not fields:
+                continue
+            if any(field in STRUCTURAL_FIELDS for field in fields):
+                kind = "structural"
+            elif any(field in WEIGHT_FIELDS for field in fields):
+                kind = "weight"
+            else:
+                kind = "cosmetic"
+            changes.append(ElementChange(code, after['type'], kind, fields))
+    return CurriculumDiff(changes)
+
+
+def _lookup(manager, code):
+    """(element type, element) of a code in a manager, or None."""
+    for element_type, (_, registry) in manager.ELEMENT_TYPES.items():
+        element = getattr(manager, registry).get(code)
+        if element is not None:
+            return element_type, element
+    return None
+
+
+def _chain(manager, code):
+    """(element type, element) of a code and of each of its ancestors."""
+    found = _lookup(manager, code)
+    if found is None:
+        return []
+    chain = [found]
+    element = found[1]
+    while element._parents:
+        element = element._parents[0]
+        chain.append(_lookup(manager, element.name))
+    return chain
+
+
+def affected(old, new, diff):
+    """Which results a curriculum diff can change.
+
+    Returns (semesters, rollups): semesters maps a semester code of the new
+    version to the module codes to evaluate again (possibly none, when only
+    unit coefficients changed), or to None to evaluate it whole; rollups
+    lists the year and diploma codes to roll up again.
+    """
+    semesters = {}
+    rollups = {}
+    for change in diff.changes:
+        if change.kind == "cosmetic":
+            continue
+        for manager in (old, new):
+            for element_type, element in _chain(manager, change.code):
+                if element_type in ROLLUP_TYPES:
+                    rollups[element.name] = None
+                elif element_type != "semester" or element.name not in new.semesters:
+                    continue
+                elif change.element_type in ("module", "unit"):
+                    targets = semesters.setdefault(element.name, set())
+                    if change.kind == "structural":
+                        semesters[element.name] = None
+                    elif targets is not None and change.element_type == "module":
+                        targets.add(change.code)
+                elif "added" in change.fields:
+                    semesters[element.name] = None
+    return semesters, list(rollups)
+
+
+def _gather(plan, cohort):
+    """Cohort grades of a plan's modules; modules the cohort lacks have none entered."""
+    known = set(cohort.module_codes)
+    slots = [cohort.slot(code) if code in known else None for code in plan.module_codes]
+    if None not in slots:
+        return cohort.grades[slots]
+    grades = np.full((len(slots), len(cohort), len(COMPONENTS)), MISSING, dtype=GRADE_DTYPE)
+    present = [m for m, slot in enumerate(slots) if slot is not None]
+    grades[present] = cohort.grades[[slots[m] for m in present]]
+    return grades
+
+
+def _deltas(codes, old_averages, new_averages, old_credits, new_credits):
+    """Yield ElementDeltas for every element (row) with a changed average or credits."""
+    changed = (old_credits != new_credits) | ~np.isclose(old_averages, new_averages, rtol=0, atol=1e-9,
+                                                         equal_nan=True)
+    for e in np.flatnonzero(changed.any(axis=1)).tolist():
+        rows = np.flatnonzero(changed[e])
+        yield ElementDeltas(codes[e], rows, old_averages[e, rows], new_averages[e, rows],
+                            old_credits[e, rows], new_credits[e, rows])
+
+
+def _common(old_codes, new_codes):
+    """Row indices, in both versions, of the codes present in both."""
+    position = {code: i for i, code in enumerate(old_codes)}
+    pairs = [(position[code], i) for i, code in enumerate(new_codes) if code in position]
+    return [code for code in new_codes if code in position], [o for o, _ in pairs], [n for _, n in pairs]
+
+
+def redeliberate(old, new, cohort=None, diff=None):
+    """Results of the old version's cohort under the new curriculum, where they changed.
+
+    Only what the diff can affect is evaluated again: after a weight-only
+    change, the changed modules of a semester are evaluated again and its
+    units and semester aggregated from the cached module averages of the old
+    version; a structural change re-evaluates the semesters concerned. Years
+    and diplomas are rolled up again from the new semester results and the
+    cached results of the others. Returns a RedeliberationReport.
+    """
+    cohort = old.cohort if cohort is None else cohort
+    diff = diff_curricula(old, new) if diff is None else diff
+    semesters, rollups = affected(old, new, diff)
+    results = {}
+    changes = []
+    for code, module_codes in semesters.items():
+        plan = new.semesters[code].compile()
+        before = old.semesters[code].evaluate_cohort(cohort) if code in old.semesters else None
+        old_plan = old.semesters[code].compile() if before is not None else None
+        if module_codes is not None and before is not None \
+                and (old_plan.module_codes, old_plan.unit_codes) == (plan.module_codes, plan.unit_codes):
+            module_codes = semesters[code] = sorted(module_codes, key=plan.module_codes.index)
+            rows = [plan.module_codes.index(module) for module in module_codes]
+            grades = cohort.grades[[cohort.slot(module) for module in module_codes]]
+            after = plan.reevaluate(before, grades, rows)
+        else:
+            semesters[code] = None
+            after = plan.evaluate(_gather(plan, cohort))
+        results[code] = after
+        if before is None:
+            continue
+        if semesters[code] is None:
+            module_codes, old_rows, rows = _common(old_plan.module_codes, plan.module_codes)
+        else:
+            old_rows = rows
+        changes.extend(_deltas(module_codes, before.module_averages[old_rows],
+                               after.module_averages[rows], before.module_credits[old_rows],
+                               after.module_credits[rows]))
+        unit_codes, old_rows, rows = _common(old_plan.unit_codes, plan.unit_codes)
+        changes.extend(_deltas(unit_codes, before.unit_averages[old_rows], after.unit_averages[rows],
+                               before.unit_credits[old_rows], after.unit_credits[rows]))
+        changes.extend(_deltas([code], before.average[None], after.average[None],
+                               before.credits[None], after.credits[None]))
+
+    def evaluated(element_type, element):
+        # New results where the change reaches, the cached old ones elsewhere
+        if element.name in results:
+            return results[element.name]
+        if element.name not in rollups:
+            return getattr(old, element_type + "s")[element.name].evaluate_cohort(cohort)
+        children = element.children()
+        child_type = "semester" if element_type == "year" else "year"
+        results[element.name] = rollup([evaluated(child_type, child) for child in children],
+                                       [child.coef for child in children], element.required_credits(),
+                                       compensate=element_type == "year")
+        return results[element.name]
+
+    # Years before diplomas, so that each is rolled up once
+    for element_type in ROLLUP_TYPES:
+        for code in rollups:
+            found = _lookup(new, code)
+            if found is None or found[0] != element_type:
+                continue
+            after = evaluated(*found)
+            if _lookup(old, code) is not None:
+                before = getattr(old, found[0] + "s")[code].evaluate_cohort(cohort)
+                changes.extend(_deltas([code], before.average[None], after.average[None],
+                                       before.credits[None], after.credits[None]))
+    return RedeliberationReport(diff, semesters, cohort.student_ids, changes)
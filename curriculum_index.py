@@ -0,0 +1,173 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from bulk_csv import FIRST_LINE, split_columns
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".idx"
+
+# A run of consecutive rows of the file: byte offset, byte length, first line number
+Span = namedtuple("Span", ["offset", "length", "line"])
+
+
+class CurriculumIndex(namedtuple("CurriculumIndex",
+                                 ["size", "mtime_ns", "header", "semesters", "programs", "policies"])):
+    """Where each semester of a curriculum file lies, in byte ranges.
+
+    semesters maps a semester code to the spans holding its row and the rows
+    of its units and modules; programs maps a program code ('' when the file
+    has no program column) to its semester codes, in file order. policies
+    maps each declared evaluation policy to its rules: they are few, and
+    every semester may use them. size and mtime_ns identify the version of
+    the file the index was built from.
+    """
+
+    __slots__ = ()
+
+    def fresh(self, csv_file):
+        """Whether csv_file is still the file this index was built from."""
+        stat = os.stat(csv_file)
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+    def spans(self, semester_codes):
+        """Spans of several semesters, in file order."""
+        return sorted(span for code in semester_codes for span in self.semesters[code])
+
+
+class LazySemesters(dict):
+    """Semester registry that loads a missing semester on its first lookup.
+
+    load(codes) adds the semesters to the registry. Only [] lookups load:
+    get() and the in operator see the semesters loaded so far.
+    """
+
+    def __init__(self, load, loaded=()):
+        super().__init__(loaded)
+        self._load = load
+
+    def __missing__(self, code):
+        self._load([code])
+        if not dict.__contains__(self, code):
+            raise KeyError(code)
+        return dict.__getitem__(self, code)
+
+
+def _line_starts(data):
+    """Byte offset of every line of data, plus the end of the data."""
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n')) + 1
+    if not len(newlines) or newlines[-1] != len(data):
+        newlines = np.append(newlines, len(data))
+    return np.concatenate(([0], newlines))
+
+
+def _spans(lines, starts):
+    """Merge sorted line numbers into spans of consecutive lines."""
+    lines = np.asarray(lines)
+    breaks = np.flatnonzero(np.diff(lines) != 1) + 1
+    return [Span(int(starts[run[0] - 1]), int(starts[run[-1]] - starts[run[0] - 1]), int(run[0]))
+            for run in np.split(lines, breaks) if len(run)]
+
+
+def build_index(csv_file):
+    """Index a curriculum file by semester and program in one pass.
+
+    Each row goes to the semester it belongs to through its parent chain;
+    rows that reach no semester (orphans) are left out, as they never load
+    lazily. A program column, when present, is read from semester rows.
+    Records must not span several lines.
+    """
+    stat = os.stat(csv_file)
+    with open(csv_file, 'rb') as file:
+        data = file.read()
+    starts = _line_starts(data)
+    lines, cells = split_columns(data.decode('utf-8'))
+    count = len(lines)
+    types = [value.strip().lower() for value in cells.get("type", [''] * count)]
+    codes = [value.strip() for value in cells.get("code", [''] * count)]
+    parent_of = dict(zip(codes, (value.strip() for value in cells.get("parent", [''] * count))))
+    type_of = dict(zip(codes, types))
+    programs = {}
+    for element_type, code, program in zip(types, codes, cells.get("program", [''] * count)):
+        if element_type == "semester":
+            programs.setdefault(program.strip(), []).append(code)
+    policies = {code: rules.strip() for element_type, code, rules
+                in zip(types, codes, cells.get("rules", [''] * count)) if element_type == "policy"}
+
+    semester_lines = {code: [] for semester_codes in programs.values() for code in semester_codes}
+    for line, code in zip(lines.tolist(), codes):
+        # module -> unit -> semester at most
+        ancestor = code
+        for _ in range(3):
+            if type_of.get(ancestor) == "semester":
+                semester_lines[ancestor].append(line)
+                break
+            ancestor = parent_of.get(ancestor)
+
+    header = data[:starts[1]].decode('utf-8')
+    return CurriculumIndex(stat.st_size, stat.st_mtime_ns, header,
+                           {code: _spans(found, starts) for code, found in semester_lines.items()},
+                           programs, policies)
+
+
+def write_index(index, index_file):
+    """Store an index as a JSON sidecar file."""
+    with open(index_file, 'w', encoding='utf-8') as file:
+        json.dump({"version": INDEX_VERSION, **index._asdict()}, file, ensure_ascii=False)
+
+
+def read_index(index_file):
+    """Read a sidecar index; raises ValueError when it is not one of this version."""
+    with open(index_file, 'r', encoding='utf-8') as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{index_file} is not a curriculum index") from error
+    if not isinstance(data, dict) or data.pop("version", None) != INDEX_VERSION:
+        raise ValueError(f"{index_file} is not a curriculum index (version {INDEX_VERSION})")
+    data["semesters"] = {code: [Span(*span) for span in spans] for code, spans in data["semesters"].items()}
+    return CurriculumIndex(**data)
+
+
+def load_index(csv_file, index_file=None):
+    """Index of csv_file, read from its sidecar file when still fresh.
+
+    The sidecar (csv_file + ".idx" by default) is rebuilt when missing,
+    unreadable or older than the file; freshness is checked on size and
+    modification time only, so opening costs no pass over the file.
+    """
+    index_file = index_file or csv_file + INDEX_SUFFIX
+    try:
+        index = read_index(index_file)
+        if index.fresh(csv_file):
+            return index
+    except (FileNotFoundError, ValueError, TypeError, KeyError):
+        pass
+    index = build_index(csv_file)
+    try:
+        write_index(index, index_file)
+    except OSError:
+        # Read-only location: the index is simply rebuilt next time
+        pass
+    return index
+
+
+def read_spans(csv_file, index, semester_codes):
+    """Read only the rows of some semesters: (line numbers, {column: list of cells}).
+
+    Same result as read_columns restricted to those rows, with the line
+    numbers of the whole file.
+    """
+    spans = index.spans(semester_codes)
+    with open(csv_file, 'rb') as file:
+        chunks = []
+        for span in spans:
+            file.seek(span.offset)
+            chunks.append(file.read(span.length).decode('utf-8'))
+    text = index.header + "".join(chunk if chunk.endswith('\n') else chunk + '\n' for chunk in chunks)
+    lines, cells = split_columns(text)
+    file_lines = np.array([line for span, chunk in zip(spans, chunks)
+                           for line in range(span.line, span.line + len(chunk.splitlines()))], dtype=np.int64)
+    return file_lines[lines - FIRST_LINE], cells
@@ -0,0 +1,69 @@
+from academicelement import AcademicElement, cached_aggregate, cached_cohort_result
+from instrumentation import instrumented
+from year import rollup
+
+
+class Diploma(AcademicElement):
+    """Represents a diploma (a whole program) containing its academic years."""
+
+    __slots__ = ("_years",)
+
+    def __init__(self, name, title, years=None):
+        super().__init__(name, title)
+        self._years = []
+        self._coef = 1
+        for year in years or []:
+            self.add_year(year)
+
+    def add_year(self, year):
+        """Add a year to the diploma."""
+        self._years.append(year)
+        self._adopt(year)
+
+    # Generic entry point used by the hierarchy builder
+    add_child = add_year
+
+    def children(self):
+        return self._years
+
+    @cached_aggregate
+    @instrumented("Diploma.calculate_average")
+    def calculate_average(self):
+        """Calculate the diploma average from year averages (NaN while one is incomplete)."""
+        if not self._years:
+            return 0
+        total = sum(year.calculate_average() * year.coef for year in self._years if year.coef)
+        coef_sum = sum(year.coef for year in self._years)
+        return total / coef_sum if coef_sum != 0 else 0
+
+    @cached_aggregate
+    @instrumented("Diploma.calculate_credits")
+    def calculate_credits(self):
+        """Calculate the credits earned over all years.
+
+        Years are not compensated by one another: the diploma is awarded
+        once every required credit is earned.
+        """
+        if not self._years:
+            return 0
+        return sum(year.calculate_credits() for year in self._years)
+
+    def awarded(self):
+        """Whether every required credit is earned (per student in cohort mode)."""
+        return self.calculate_credits() >= self.required_credits()
+
+    @cached_cohort_result
+    @instrumented("Diploma.evaluate_cohort")
+    def evaluate_cohort(self, cohort):
+        """RollupResult of every cohort student, from the cached year results."""
+        return rollup([year.evaluate_cohort(cohort) for year in self._years],
+                      [year.coef for year in self._years], self.required_credits(), compensate=False)
+
+    def display_years(self):
+        """Display all years in this diploma."""
+        return [year.display_info() for year in self._years]
+
+    @classmethod
+    def from_csv(cls, csv_data):
+        """Create Diploma instance from CSV data."""
+        return cls(csv_data['code'], csv_data['title'])
@@ -0,0 +1,127 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from cohort import COMPONENTS, decode_grades
+from plan import passes
+
+GradeEvent = namedtuple("GradeEvent", ["student", "module", "component", "old", "new", "timestamp"])
+GradeEvent.__doc__ = """One grade change of one student; old is filled in when the event is applied (NaN if missing)."""
+
+ResultChange = namedtuple(
+    "ResultChange",
+    ["student", "code", "old_credits", "new_credits", "old_passed", "new_passed"],
+)
+ResultChange.__doc__ = """A module, unit or semester whose credits or pass status flipped for a student."""
+
+
+def grade_event(student, module, component, new, timestamp=None):
+    """Build an event for a new grade; old is read from the cohort when applied."""
+    if component not in COMPONENTS:
+        raise ValueError(f"Unknown grade component: {component} (expected one of {COMPONENTS})")
+    return GradeEvent(student, module, component, None, new,
+                      time.time() if timestamp is None else timestamp)
+
+
+class EventLog:
+    """Append-only log of applied grade events."""
+
+    def __init__(self):
+        self._events = []
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def append(self, events):
+        self._events.extend(events)
+
+    def since(self, position):
+        """Events applied after the first position ones, e.g. to replay them elsewhere."""
+        return self._events[position:]
+
+
+def _eliminated(plan, result):
+    """(modules, units) masks of the cells failed on an eliminatory grade."""
+    if result.module_eliminated is None:
+        return (np.zeros(result.module_averages.shape, dtype=bool),
+                np.zeros(result.unit_averages.shape, dtype=bool))
+    return result.module_eliminated, (plan.unit_membership @ result.module_eliminated) > 0
+
+
+def _changes(student_ids, codes, old_credits, new_credits, old_averages, new_averages,
+             old_eliminated, new_eliminated):
+    """Yield a ResultChange for every (element, student) cell that flipped."""
+    old_passed = passes(old_averages) & ~old_eliminated
+    new_passed = passes(new_averages) & ~new_eliminated
+    flipped = (old_credits != new_credits) | (old_passed != new_passed)
+    for e, s in zip(*np.nonzero(flipped)):
+        yield ResultChange(student_ids[s], codes[e], int(old_credits[e, s]), int(new_credits[e, s]),
+                           bool(old_passed[e, s]), bool(new_passed[e, s]))
+
+
+def apply_events(semesters, cohort, events):
+    """Apply grade events to a cohort and return (applied events, change feed).
+
+    Events are applied in order, so the last one on a grade wins. Only the
+    affected students are re-evaluated, once before and once after the
+    write, and only through the semesters containing a changed module; the
+    feed lists the modules, units and semesters whose credits or pass status
+    flipped, so its size follows the change and not the cohort.
+    """
+    cells = {}
+    applied = []
+    for event in events:
+        if event.component not in COMPONENTS:
+            raise ValueError(f"Unknown grade component: {event.component} (expected one of {COMPONENTS})")
+        slot, row = cohort.slot(event.module), cohort.row(event.student)
+        column = COMPONENTS.index(event.component)
+        values = cells.get((slot, row))
+        if values is None:
+            values = cells[(slot, row)] = np.full(len(COMPONENTS), np.nan)
+        if np.isnan(values[column]):
+            old = float(decode_grades(cohort.grades[slot, row, column]))
+        else:
+            old = float(values[column])
+        values[column] = event.new
+        applied.append(event._replace(old=old))
+    if not cells:
+        return applied, []
+
+    slots = np.fromiter((slot for slot, _ in cells), dtype=np.intp, count=len(cells))
+    rows = np.fromiter((row for _, row in cells), dtype=np.intp, count=len(cells))
+    changed_slots = set(slots.tolist())
+
+    affected = []
+    for semester in semesters:
+        plan = semester.compile()
+        plan_slots = np.array([cohort.slot(code) for code in plan.module_codes], dtype=np.intp)
+        touched = np.isin(plan_slots, list(changed_slots))
+        if touched.any():
+            students = np.unique(rows[np.isin(slots, plan_slots)])
+            before = plan.evaluate(cohort.grades[np.ix_(plan_slots, students)])
+            affected.append((semester, plan, plan_slots, touched, students, before))
+
+    cohort.scatter(slots, rows, np.array(list(cells.values())))
+
+    feed = []
+    for semester, plan, plan_slots, touched, students, before in affected:
+        after = plan.evaluate(cohort.grades[np.ix_(plan_slots, students)])
+        ids = [cohort.student_ids[row] for row in students.tolist()]
+        units = (plan.unit_membership[:, touched] > 0).any(axis=1)
+        module_codes = [code for code, hit in zip(plan.module_codes, touched) if hit]
+        unit_codes = [code for code, hit in zip(plan.unit_codes, units) if hit]
+        (old_modules, old_units), (new_modules, new_units) = _eliminated(plan, before), _eliminated(plan, after)
+        feed.extend(_changes(ids, module_codes, before.module_credits[touched], after.module_credits[touched],
+                             before.module_averages[touched], after.module_averages[touched],
+                             old_modules[touched], new_modules[touched]))
+        feed.extend(_changes(ids, unit_codes, before.unit_credits[units], after.unit_credits[units],
+                             before.unit_averages[units], after.unit_averages[units],
+                             old_units[units], new_units[units]))
+        feed.extend(_changes(ids, [semester.name], before.credits[None], after.credits[None],
+                             before.average[None], after.average[None],
+                             before.eliminated[None], after.eliminated[None]))
+    return applied, feed
@@ -0,0 +1,145 @@
+import csv
+import time
+from collections import namedtuple
+from itertools import islice
+from operator import itemgetter
+
+import numpy as np
+
+from cohort import COMPONENTS
+
+GRADE_COLUMNS = ("student_id", "module_code") + COMPONENTS
+# Columns a grade file may leave out: resits are only entered after the exam session
+OPTIONAL_COLUMNS = ("resit",)
+
+# A block of parsed grade rows: parallel lists of ids and a (rows, components)
+# float array where NaN marks a grade left empty in the file
+GradeChunk = namedtuple("GradeChunk", ["student_ids", "module_codes", "values"])
+
+
+class IngestStats(namedtuple("IngestStats", ["rows", "accepted", "rejected", "seconds"])):
+    """Counters reported at the end of a grade ingestion run."""
+
+    __slots__ = ()
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def read_chunks(csv_file, chunk_size):
+    """Yield lists of at most chunk_size raw rows, skipping the header."""
+    with open(csv_file, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        missing = [column for column in GRADE_COLUMNS
+                   if column not in header and column not in OPTIONAL_COLUMNS]
+        if missing:
+            raise ValueError(f"Missing grade column(s): {', '.join(missing)}")
+        # Optional columns come last; absent ones read as empty cells
+        positions = [header.index(column) for column in GRADE_COLUMNS if column in header]
+        padding = ('',) * (len(GRADE_COLUMNS) - len(positions))
+        select = itemgetter(*positions)
+
+        def project(row):
+            return select(row) + padding
+
+        if not padding:
+            project = select
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            try:
+                yield list(map(project, chunk))
+            except IndexError:
+                # Short rows: pad the missing trailing cells
+                yield [tuple(row[i] if i < len(row) else '' for i in positions) + padding for row in chunk]
+
+
+def to_float(cell):
+    """Convert one grade cell, mapping empty to NaN and garbage to infinity."""
+    cell = cell.strip()
+    if not cell:
+        return float("nan")
+    try:
+        return float(cell)
+    except ValueError:
+        return float("inf")
+
+
+def parse_chunks(chunks):
+    """Turn raw rows into GradeChunks, converting the grade columns at once.
+
+    Rows whose grades cannot be converted get an infinite value so that
+    validation rejects them.
+    """
+    for rows in chunks:
+        columns = list(zip(*rows))
+        cells = np.array(columns[2:], dtype=str).T
+        try:
+            values = np.where(np.char.strip(cells) == '', 'nan', cells).astype(np.float64)
+        except ValueError:
+            # Slow path only for chunks containing malformed cells
+            values = np.array([[to_float(cell) for cell in row] for row in cells.tolist()])
+        yield GradeChunk(list(columns[0]), list(columns[1]), values)
+
+
+def validate_chunks(parsed, module_codes, counters):
+    """Drop rows with unknown modules, empty ids or grades outside 0-20.
+
+    The number of rejected rows is accumulated in counters["rejected"].
+    """
+    known = set(module_codes)
+    for chunk in parsed:
+        in_range = np.isnan(chunk.values) | ((chunk.values >= 0) & (chunk.values <= 20))
+        valid = in_range.all(axis=1)
+        valid &= np.fromiter(
+            (bool(sid) and code in known for sid, code in zip(chunk.student_ids, chunk.module_codes)),
+            dtype=bool, count=len(chunk.student_ids),
+        )
+        counters["rejected"] += int(len(valid) - valid.sum())
+        if valid.all():
+            yield chunk
+        else:
+            keep = np.flatnonzero(valid)
+            yield GradeChunk(
+                [chunk.student_ids[i] for i in keep],
+                [chunk.module_codes[i] for i in keep],
+                chunk.values[keep],
+            )
+
+
+def ingest_grades(csv_file, cohort, chunk_size=50_000):
+    """Stream a student_id,module_code,tp,td,exam[,resit] file into a cohort.
+
+    The file is processed chunk by chunk through a read -> parse -> validate
+    -> scatter generator pipeline, so memory stays bounded by chunk_size.
+    Unknown students are added to the cohort on the fly.
+    """
+    start = time.perf_counter()
+    counters = {"rows": 0, "rejected": 0}
+
+    def counted(chunks):
+        for chunk in chunks:
+            counters["rows"] += len(chunk)
+            yield chunk
+
+    pipeline = validate_chunks(
+        parse_chunks(counted(read_chunks(csv_file, chunk_size))),
+        cohort.module_codes, counters,
+    )
+    accepted = 0
+    for chunk in pipeline:
+        if not chunk.student_ids:
+            continue
+        cohort.add_students(chunk.student_ids)
+        slots = np.fromiter((cohort.slot(code) for code in chunk.module_codes),
+                            dtype=np.intp, count=len(chunk.module_codes))
+        cohort.scatter(slots, cohort.rows(chunk.student_ids), chunk.values)
+        accepted += len(chunk.student_ids)
+
+    seconds = time.perf_counter() - start
+    return IngestStats(counters["rows"], accepted, counters["rejected"], seconds)
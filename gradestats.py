@@ -0,0 +1,177 @@
+import numpy as np
+
+from plan import passes
+from tracking import CohortTracker
+
+# One histogram bin per grade point: [0, 1), [1, 2), ..., [19, 20]
+HISTOGRAM_BINS = 20
+
+
+def _histogram(values):
+    bins = np.clip(np.floor(values), 0, HISTOGRAM_BINS - 1).astype(np.intp)
+    return np.bincount(bins, minlength=HISTOGRAM_BINS)
+
+
+def _split(values):
+    """(complete averages, number of NaN ones) of a block of averages."""
+    values = np.asarray(values, dtype=np.float64).ravel()
+    complete = ~np.isnan(values)
+    if complete.all():
+        return values, 0
+    return values[complete], values.size - int(complete.sum())
+
+
+class GradeStats:
+    """Mergeable summary statistics of a set of averages.
+
+    Count, mean and sum of squared deviations follow Welford's online
+    algorithm; summaries of disjoint sets (shards, workers) merge with Chan's
+    parallel formula, and values can be removed again so a summary follows
+    grade changes without a new pass. After a removal, minimum and maximum
+    are only bounds until recomputed (see extrema_exact). NaN averages
+    (incomplete records) are only counted in incomplete.
+    """
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum", "passed", "histogram", "extrema_exact",
+                 "incomplete")
+
+    def __init__(self):
+        self.incomplete = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.passed = 0
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        self.extrema_exact = True
+
+    @classmethod
+    def from_values(cls, values):
+        """Summarize an array of averages."""
+        stats = cls()
+        stats.add(values)
+        return stats
+
+    @classmethod
+    def merge_all(cls, summaries):
+        """Combine the summaries of disjoint sets of averages."""
+        total = cls()
+        for stats in summaries:
+            total.merge(stats)
+        return total
+
+    @property
+    def variance(self):
+        """Population variance."""
+        return self.m2 / self.count if self.count else float("nan")
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    @property
+    def pass_rate(self):
+        return self.passed / self.count if self.count else float("nan")
+
+    def merge(self, other):
+        """Fold another summary into this one (Chan et al.)."""
+        self.incomplete += other.incomplete
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.passed += other.passed
+        self.histogram = self.histogram + other.histogram
+        self.extrema_exact = self.extrema_exact and other.extrema_exact
+        return self
+
+    def add(self, values):
+        """Fold a block of averages into the summary."""
+        values, incomplete = _split(values)
+        self.incomplete += incomplete
+        if values.size == 0:
+            return self
+        block = GradeStats()
+        block.count = values.size
+        block.mean = float(values.mean())
+        block.m2 = float(((values - block.mean) ** 2).sum())
+        block.minimum = float(values.min())
+        block.maximum = float(values.max())
+        block.passed = int(passes(values).sum())
+        block.histogram = _histogram(values)
+        return self.merge(block)
+
+    def remove(self, values):
+        """Take back a block of averages previously added."""
+        values, incomplete = _split(values)
+        self.incomplete -= incomplete
+        if values.size == 0:
+            return self
+        remaining = self.count - values.size
+        if remaining <= 0:
+            incomplete = self.incomplete
+            self.__init__()
+            self.incomplete = incomplete
+            return self
+        removed_mean = float(values.mean())
+        mean = (self.count * self.mean - values.size * removed_mean) / remaining
+        delta = removed_mean - mean
+        self.m2 -= (float(((values - removed_mean) ** 2).sum())
+                    + delta * delta * remaining * values.size / self.count)
+        self.m2 = max(self.m2, 0.0)
+        self.mean = mean
+        self.count = remaining
+        self.passed -= int(passes(values).sum())
+        self.histogram = self.histogram - _histogram(values)
+        if values.min() <= self.minimum or values.max() >= self.maximum:
+            self.extrema_exact = False
+        return self
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "min": self.minimum,
+            "max": self.maximum,
+            "pass_rate": self.pass_rate,
+            "histogram": self.histogram.tolist(),
+            "incomplete": self.incomplete,
+        }
+
+
+class CohortStatistics(CohortTracker):
+    """Statistics of every module, unit and semester of a cohort, kept up to date.
+
+    A grade change swaps the changed students' old averages for the new ones
+    in the affected summaries (see CohortTracker).
+    """
+
+    def rebuild(self):
+        self.statistics = {}
+        self._values = {}
+        super().rebuild()
+
+    def reset(self, code, values):
+        self._values[code] = np.array(values, dtype=np.float64)
+        self.statistics[code] = GradeStats.from_values(values)
+
+    def update(self, code, rows, values):
+        stored = self._values[code]
+        stats = self.statistics[code]
+        stats.remove(stored[rows]).add(values)
+        stored[rows] = values
+        if not stats.extrema_exact:
+            complete = stored[~np.isnan(stored)]
+            stats.minimum = float(complete.min()) if complete.size else np.inf
+            stats.maximum = float(complete.max()) if complete.size else -np.inf
+            stats.extrema_exact = True
+
+    def __getitem__(self, code):
+        return self.statistics[code]
@@ -0,0 +1,59 @@
+import csv
+from collections import namedtuple
+
+# Element type -> type of the element that must contain it
+PARENT_TYPES = {
+    "module": "unit",
+    "unit": "semester",
+    "semester": "year",
+    "year": "diploma",
+}
+# Types that may also stand at the top of the hierarchy, without a parent
+OPTIONAL_PARENT = {"semester", "year"}
+
+HierarchyReport = namedtuple("HierarchyReport", ["orphans", "dangling"])
+HierarchyReport.__doc__ = """Problems found while wiring the hierarchy.
+
+orphans: codes that should have a parent but reference none.
+dangling: (code, parent_code, reason) for references that could not be attached.
+"""
+
+
+def read_parent_mapping(mapping_file):
+    """Read a sidecar "code,parent" CSV file into a dict."""
+    with open(mapping_file, 'r', encoding='utf-8') as file:
+        return {row['code']: row.get('parent') or '' for row in csv.DictReader(file)}
+
+
+def build_hierarchy(index, parents):
+    """Attach every element to its parent in one pass over a code index.
+
+    index maps a code to an (element_type, element) pair, parents maps a code
+    to its parent code ('' for none). Children are attached in index order.
+    All problems are collected and returned together instead of raising.
+    """
+    orphans = []
+    dangling = []
+
+    for code, (element_type, element) in index.items():
+        parent_code = parents.get(code, '')
+        expected_type = PARENT_TYPES.get(element_type)
+
+        if not parent_code:
+            if expected_type is not None and element_type not in OPTIONAL_PARENT:
+                orphans.append(code)
+            continue
+
+        parent_entry = index.get(parent_code)
+        if parent_entry is None:
+            dangling.append((code, parent_code, "unknown parent"))
+        elif parent_entry[0] != expected_type:
+            dangling.append((code, parent_code, f"a {element_type} cannot belong to a {parent_entry[0]}"))
+        else:
+            parent_entry[1].add_child(element)
+
+    for code, parent_code in parents.items():
+        if parent_code and code not in index:
+            dangling.append((code, parent_code, "unknown element"))
+
+    return HierarchyReport(orphans, dangling)
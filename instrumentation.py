@@ -0,0 +1,103 @@
+import time
+from functools import wraps
+
+# Instrumentation is off by default; while off, instrumented functions only
+# pay for one global flag check
+_enabled = False
+
+# name -> [calls, total seconds, max seconds]
+_timings = {}
+# name -> [hits, misses]
+_cache_counts = {}
+
+
+def enable():
+    """Start recording timings and cache hit rates."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording; collected statistics are kept until reset()."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """Whether timings and cache hit rates are being recorded."""
+    return _enabled
+
+
+def reset():
+    """Forget every recorded statistic."""
+    _timings.clear()
+    _cache_counts.clear()
+
+
+def instrumented(name):
+    """Record call count and latency of the decorated function under name."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                entry = _timings.get(name)
+                if entry is None:
+                    _timings[name] = [1, elapsed, elapsed]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+                    if elapsed > entry[2]:
+                        entry[2] = elapsed
+        return wrapper
+    return decorator
+
+
+def record_cache(name, hit):
+    """Count one cache lookup under name (callers check is_enabled first)."""
+    entry = _cache_counts.get(name)
+    if entry is None:
+        entry = _cache_counts[name] = [0, 0]
+    entry[0 if hit else 1] += 1
+
+
+def stats():
+    """Return the recorded statistics as plain dicts.
+
+    timings: name -> calls, total_ms (cumulative, inclusive of nested calls),
+    mean_us and max_us per call. caches: name -> hits, misses, hit_rate.
+    """
+    timings = {
+        name: {
+            "calls": calls,
+            "total_ms": total * 1e3,
+            "mean_us": total / calls * 1e6,
+            "max_us": longest * 1e6,
+        }
+        for name, (calls, total, longest) in _timings.items()
+    }
+    caches = {
+        name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+        for name, (hits, misses) in _cache_counts.items()
+    }
+    return {"enabled": _enabled, "timings": timings, "caches": caches}
+
+
+def format_stats(recorded):
+    """Render stats() as a text table, slowest cumulative time first."""
+    lines = [f"{'function':<46} {'calls':>8} {'total ms':>10} {'mean us':>10} {'max us':>10}"]
+    for name, entry in sorted(recorded["timings"].items(), key=lambda item: -item[1]["total_ms"]):
+        lines.append(f"{name:<46} {entry['calls']:>8} {entry['total_ms']:>10.3f} "
+                     f"{entry['mean_us']:>10.1f} {entry['max_us']:>10.1f}")
+    if recorded["caches"]:
+        lines.append("")
+        lines.append(f"{'cache':<46} {'hits':>8} {'misses':>10} {'hit rate':>10}")
+        for name, entry in sorted(recorded["caches"].items()):
+            lines.append(f"{name:<46} {entry['hits']:>8} {entry['misses']:>10} "
+                         f"{entry['hit_rate']:>9.1%}")
+    return "\n".join(lines)
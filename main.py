@@ -1,41 +1,87 @@
 from module import Module
 from unit import Unit
 from semester import Semester
-import csv
+from year import Year
+from diploma import Diploma
+from cohort import COMPONENTS, Cohort
+from hierarchy import HierarchyReport, build_hierarchy, read_parent_mapping
+from grade_ingest import ingest_grades
+from parallel import evaluate_semesters
+import shared_cohort
+from bulk_csv import MODULE_COLUMNS, check_curriculum, gc_paused, parse_curriculum, validate_grade_file
+from curriculum_index import LazySemesters, load_index, read_spans
+from curriculum_diff import diff_curricula, redeliberate
+from snapshot import file_sha256, read_snapshot, write_snapshot
+from report import build_result_tree, render, structure_lines, summary_lines, write_lines, write_transcripts
+from sqlite_store import SQLiteGradeStore
+from solver import required_exam_grades
+from ranking import CohortRanking
+from gradestats import CohortStatistics
+from events import EventLog, apply_events, grade_event
+from plan import PASS_MARK
+from policies import BUILTIN_POLICIES, STANDARD, parse_policy
+from instrumentation import instrumented
+import instrumentation
+import argparse
 import os
+import sys
+
+import numpy as np
 
 class GSIAcademicManager:
     """Main class to manage the GSI academic structure."""
     
+    # CSV "type" column -> element class and the registry holding it
+    ELEMENT_TYPES = {
+        'module': (Module, 'modules'),
+        'unit': (Unit, 'units'),
+        'semester': (Semester, 'semesters'),
+        'year': (Year, 'years'),
+        'diploma': (Diploma, 'diplomas'),
+    }
+    
     def __init__(self):
         self.modules = {}
         self.units = {}
         self.semesters = {}
+        self.years = {}
+        self.diplomas = {}
+        self.cohort = None
+        self.hierarchy_report = None
+        self.validation_report = None
+        self.database = None
+        self._trackers = {}
+        self.events = EventLog()
+        self.curriculum_index = None
+        self._curriculum_file = None
+        # Evaluation policies modules may reference, by name
+        self.policies = dict(BUILTIN_POLICIES)
     
-    def load_from_csv(self, csv_file):
-        """Load academic data from CSV file and organize it properly."""
+    @instrumented("GSIAcademicManager.load_from_csv")
+    def load_from_csv(self, csv_file, hierarchy_file=None):
+        """Load academic data from CSV file and organize it properly.
+        
+        Parent links come from the CSV "parent" column, or from a sidecar
+        "code,parent" file when hierarchy_file is given.
+        """
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
+            # First pass: Parse and check whole columns, then create every element
+            columns, report = parse_curriculum(csv_file, tuple(self.ELEMENT_TYPES), self.policies)
+            self.validation_report = report
+            if not report.ok:
+                print(f"✗ Invalid curriculum file {csv_file}: {len(report.problems)} problem(s)")
+                for line in report.lines():
+                    print(f"  ✗ {line}")
+                return False
+            with gc_paused():
+                index, parents = self._create_from_columns(columns)
                 
-                # First pass: Create all elements
-                for row in csv_reader:
-                    element_type = row.get('type', '').lower()
-                    
-                    if element_type == 'module':
-                        module = Module.from_csv(row)
-                        self.modules[module.name] = module
-                    
-                    elif element_type == 'unit':
-                        unit = Unit.from_csv(row)
-                        self.units[unit.name] = unit
-                    
-                    elif element_type == 'semester':
-                        semester = Semester.from_csv(row)
-                        self.semesters[semester.name] = semester
-            
-            # Second pass: Organize the hierarchy based on GSI curriculum
-            self.organize_gsi_curriculum()
+                if hierarchy_file is not None:
+                    parents.update(read_parent_mapping(hierarchy_file))
+                
+                # Second pass: Wire the hierarchy from the parent codes
+                self.hierarchy_report = build_hierarchy(index, parents)
+            self.report_hierarchy_problems()
             
             # Set default grades for all modules
             self.set_default_grades()
@@ -43,37 +89,337 @@ class GSIAcademicManager:
             print(f"✓ Successfully loaded data from {csv_file}")
             return True
                         
-        except FileNotFoundError:
-            print(f"✗ CSV file {csv_file} not found.")
+        except FileNotFoundError as error:
+            print(f"✗ CSV file {error.filename} not found.")
+            return False
+    
+    def open_curriculum(self, csv_file, index_file=None):
+        """Open a curriculum file for lazy loading, semester by semester.
+        
+        Nothing is parsed yet: a semester is read, with its units and
+        modules, on its first lookup in self.semesters (or through
+        load_semesters() / load_program()), seeking straight to its rows
+        through a byte-offset index kept in a sidecar file. Only loaded
+        semesters are listed when iterating over self.semesters. Years and
+        diplomas are not loaded lazily: use load_from_csv() for them.
+        """
+        try:
+            self.curriculum_index = load_index(csv_file, index_file)
+        except FileNotFoundError as error:
+            print(f"✗ CSV file {error.filename} not found.")
+            return False
+        try:
+            self._register_policies(self.curriculum_index.policies.items())
+        except ValueError as error:
+            print(f"✗ Invalid evaluation policy in {csv_file}: {error}")
+            return False
+        self._curriculum_file = csv_file
+        self.semesters = LazySemesters(self.load_semesters, self.semesters)
+        return True
+    
+    def load_program(self, program):
+        """Load every semester of a program from the opened curriculum file."""
+        if self.curriculum_index is None or program not in self.curriculum_index.programs:
+            print(f"✗ Unknown program: {program}")
+            return False
+        return self.load_semesters(self.curriculum_index.programs[program])
+    
+    @instrumented("GSIAcademicManager.load_semesters")
+    def load_semesters(self, semester_codes):
+        """Load semesters, with their units and modules, from the opened curriculum file.
+        
+        Semesters already loaded are skipped. Only their rows are read and
+        validated; problems are reported with their line in the whole file.
+        """
+        index = self.curriculum_index
+        if index is None:
+            print("✗ No curriculum file opened: call open_curriculum() first")
+            return False
+        codes = [code for code in dict.fromkeys(semester_codes) if code not in self.semesters]
+        unknown = [code for code in codes if code not in index.semesters]
+        if unknown:
+            print(f"✗ Unknown semester(s): {', '.join(unknown)}")
+            return False
+        if not codes:
+            return True
+        
+        columns, report = check_curriculum(*read_spans(self._curriculum_file, index, codes),
+                                           tuple(self.ELEMENT_TYPES), self.policies)
+        self.validation_report = report
+        if not report.ok:
+            print(f"✗ Invalid curriculum file {self._curriculum_file}: {len(report.problems)} problem(s)")
+            for line in report.lines():
+                print(f"  ✗ {line}")
             return False
+        module_codes = columns['code'][columns['type'] == 'module'].tolist()
+        if self.cohort is not None:
+            outside = [code for code in module_codes if code not in self.cohort.module_codes]
+            if outside:
+                print(f"✗ Module(s) outside the cohort: {', '.join(outside)} "
+                      f"(load semesters before enable_cohort())")
+                return False
+        
+        with gc_paused():
+            elements, parents = self._create_from_columns(columns)
+            # Years and diplomas are not indexed: lazily loaded semesters stand alone
+            for code, (element_type, _) in elements.items():
+                if element_type == 'semester':
+                    parents[code] = ''
+            report = build_hierarchy(elements, parents)
+        if self.hierarchy_report is not None:
+            report = HierarchyReport(*(old + new for old, new in zip(self.hierarchy_report, report)))
+        self.hierarchy_report = report
+        if self.cohort is not None:
+            for code in module_codes:
+                self.modules[code].bind_cohort(self.cohort)
+        # Trackers only follow the semesters that existed when they were built
+        for tracker in self._trackers.values():
+            tracker.close()
+        self._trackers.clear()
+        return True
+    
+    def _register_policies(self, declarations):
+        """Register (name, rules) evaluation policy declarations."""
+        for name, rules in declarations:
+            self.policies[name] = parse_policy(name, rules)
+    
+    def _policy(self, name):
+        """The policy a module references by name ('' for the standard one)."""
+        if not name:
+            return STANDARD
+        try:
+            return self.policies[name]
+        except KeyError:
+            raise ValueError(f"Unknown evaluation policy: {name}") from None
     
-    def organize_gsi_curriculum(self):
-        """Organize modules into units and units into semesters based on GSI curriculum."""
-        # Organize Semester 1 modules into their respective units
-        if 'UEF11' in self.units:
-            self.units['UEF11'].add_module(self.modules['F111'])
-            self.units['UEF11'].add_module(self.modules['F112'])
+    def _create_elements(self, rows):
+        """Create and register the elements described by curriculum rows.
         
-        if 'UEF12' in self.units:
-            self.units['UEF12'].add_module(self.modules['F121'])
-            self.units['UEF12'].add_module(self.modules['F122'])
+        Policy rows are registered first. Returns the code index and the
+        parent code of every element.
+        """
+        rows = list(rows)
+        self._register_policies((row['code'], row.get('rules') or '')
+                                for row in rows if row.get('type', '').lower() == 'policy')
+        index = {}
+        parents = {}
+        for row in rows:
+            element_type = row.get('type', '').lower()
+            if element_type not in self.ELEMENT_TYPES:
+                continue
+            
+            element_class, registry = self.ELEMENT_TYPES[element_type]
+            element = element_class.from_csv(row)
+            if element_type == 'module':
+                element._policy = self._policy(row.get('policy'))
+            getattr(self, registry)[element.name] = element
+            index[element.name] = (element_type, element)
+            parents[element.name] = row.get('parent') or ''
+        return index, parents
+    
+    def _create_from_columns(self, columns):
+        """Create and register the elements of a parsed curriculum (see bulk_csv).
         
-        if 'UEM11' in self.units:
-            self.units['UEM11'].add_module(self.modules['M111'])
-            self.units['UEM11'].add_module(self.modules['M112'])
+        Values are already typed and checked, so modules are built directly.
+        """
+        declared = columns['type'] == 'policy'
+        self._register_policies(zip(columns['code'][declared].tolist(), columns['rules'][declared].tolist()))
+        index = {}
+        parents = {}
+        registries = {element_type: getattr(self, registry)
+                      for element_type, (_, registry) in self.ELEMENT_TYPES.items()}
+        module_values = zip(*(columns[name].tolist() for name in MODULE_COLUMNS))
+        for element_type, code, title, parent, policy, values in zip(
+                columns['type'].tolist(), columns['code'].tolist(), columns['title'].tolist(),
+                columns['parent'].tolist(), columns['policy'].tolist(), module_values):
+            if element_type == 'module':
+                element = Module(code, title, *values, policy=self._policy(policy))
+            elif element_type in registries:
+                element = self.ELEMENT_TYPES[element_type][0].from_csv({'code': code, 'title': title})
+            else:
+                continue
+            registries[element_type][code] = element
+            index[code] = (element_type, element)
+            parents[code] = parent
+        return index, parents
+    
+    def curriculum_rows(self):
+        """Describe every element as a curriculum row, parents included.
         
-        if 'UED11' in self.units:
-            self.units['UED11'].add_module(self.modules['D111'])
+        Declared evaluation policies come first, as "policy" rows.
+        """
+        rows = [{'type': 'policy', 'code': name, 'title': '', 'parent': '', 'rules': policy.rules()}
+                for name, policy in self.policies.items() if name not in BUILTIN_POLICIES]
+        for element_type, (_, registry) in self.ELEMENT_TYPES.items():
+            for element in getattr(self, registry).values():
+                row = element.to_csv()
+                row['type'] = element_type
+                row['parent'] = element._parents[0].name if element._parents else ''
+                rows.append(row)
+        return rows
+    
+    def save_snapshot(self, snapshot_file, source_csv=None):
+        """Save structure and cohort grades in a memory-mappable binary snapshot.
+        
+        When source_csv is given its hash is recorded, so the snapshot is
+        rejected once that file changes. An unreadable source_csv records
+        no hash: the snapshot is then never taken as matching it.
+        """
+        rows = self.curriculum_rows()
+        for row in rows:
+            if row['type'] == 'module':
+                row['grades'] = dict(self.modules[row['code']]._grades)
+        source_hash = None
+        if source_csv:
+            try:
+                source_hash = file_sha256(source_csv)
+            except OSError:
+                pass
+        write_snapshot(snapshot_file, rows, self.cohort, source_hash=source_hash)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot_file, source_csv=None):
+        """Rebuild a manager from a snapshot without copying the grade arrays.
+        
+        Returns None when the snapshot is missing, unreadable or was taken
+        from a different version of source_csv, or when source_csv itself
+        cannot be read.
+        """
+        try:
+            snapshot = read_snapshot(snapshot_file)
+            if source_csv is not None and snapshot.source_hash != file_sha256(source_csv):
+                return None
+        except (OSError, ValueError):
+            return None
+        
+        manager = cls()
+        index, parents = manager._create_elements(snapshot.rows)
+        manager.hierarchy_report = build_hierarchy(index, parents)
+        for row in snapshot.rows:
+            if row.get('grades'):
+                manager.modules[row['code']].set_grade(**row['grades'])
+        if snapshot.cohort is not None:
+            manager.cohort = snapshot.cohort
+            for module in manager.modules.values():
+                module.bind_cohort(manager.cohort)
+        return manager
+    
+    def share_cohort(self):
+        """Move the cohort grades to shared memory; returns a picklable ManagerHandle.
+        
+        Send the handle to worker processes and rebuild a manager there with
+        attach(): only the curriculum rows are pickled, every worker maps the
+        same grade buffer. Call release_cohort() when the workers are done.
+        """
+        return shared_cohort.ManagerHandle(self.curriculum_rows(), shared_cohort.share(self.cohort))
+    
+    def release_cohort(self):
+        """Move the cohort grades back to private memory and free the shared block."""
+        shared_cohort.release(self.cohort)
+    
+    @classmethod
+    def attach(cls, handle):
+        """Rebuild a manager over a shared cohort (see share_cohort), without copying grades."""
+        manager = cls()
+        index, parents = manager._create_elements(handle.rows)
+        manager.hierarchy_report = build_hierarchy(index, parents)
+        manager.cohort = shared_cohort.attach(handle.cohort)
+        for module in manager.modules.values():
+            module.bind_cohort(manager.cohort)
+        return manager
+    
+    @classmethod
+    def load_cached(cls, csv_file, snapshot_file):
+        """Load from a snapshot when it matches csv_file, else parse the CSV and snapshot it."""
+        manager = cls.from_snapshot(snapshot_file, source_csv=csv_file)
+        if manager is not None:
+            return manager
+        manager = cls()
+        if not manager.load_from_csv(csv_file):
+            return None
+        manager.save_snapshot(snapshot_file, source_csv=csv_file)
+        return manager
+    
+    def stats(self):
+        """Return call counts, latencies and cache hit rates recorded so far.
         
-        if 'UET11' in self.units:
-            self.units['UET11'].add_module(self.modules['T111'])
+        Recording is opt-in: call instrumentation.enable() (or run main with
+        --profile) first.
+        """
+        return instrumentation.stats()
+    
+    def database_rows(self):
+        """Curriculum rows extended with the compiled weights stored in SQLite."""
+        factors = {}
+        for semester in self.semesters.values():
+            plan = semester.compile()
+            unit_factors = plan.unit_matrix.sum(axis=0)
+            semester_factors = plan.unit_factors @ plan.unit_matrix
+            for m, code in enumerate(plan.module_codes):
+                weight_tp, weight_td, weight_exam, _ = plan.module_weights[m].tolist()
+                policy = plan.policies[m]
+                factors[code] = {
+                    'semester': semester.name,
+                    'weight_tp': weight_tp, 'weight_td': weight_td, 'weight_exam': weight_exam,
+                    'resit_mode': policy.resit, 'resit_cap': policy.resit_cap, 'minimum': policy.minimum,
+                    'unit_factor': float(unit_factors[m]),
+                    'semester_factor': float(semester_factors[m]),
+                }
+        rows = self.curriculum_rows()
+        for row in rows:
+            row.update(factors.get(row['code'], {}))
+        return rows
+    
+    def save_to_database(self, database_file):
+        """Store the curriculum and the cohort grades (if any) in a SQLite file."""
+        with SQLiteGradeStore(database_file) as store:
+            store.save_curriculum(self.database_rows())
+            if self.cohort is not None:
+                store.insert_grades(
+                    (student_id, code, *values)
+                    for code in self.cohort.module_codes
+                    for student_id, values in zip(
+                        self.cohort.student_ids,
+                        self.cohort.module_grades(self.cohort.slot(code)).tolist())
+                )
+    
+    @classmethod
+    def from_database(cls, database_file):
+        """Rebuild the structure from a SQLite file without loading any grade.
         
-        # Organize units into Semester 1
-        if 'S1' in self.semesters:
-            semester1 = self.semesters['S1']
-            for unit_code in ['UEF11', 'UEF12', 'UEM11', 'UED11', 'UET11']:
-                if unit_code in self.units:
-                    semester1.add_unit(self.units[unit_code])
+        The store stays open as manager.database for aggregate queries and
+        for load_students_from_database().
+        """
+        manager = cls()
+        manager.database = SQLiteGradeStore(database_file)
+        index, parents = manager._create_elements(manager.database.curriculum_rows())
+        manager.hierarchy_report = build_hierarchy(index, parents)
+        return manager
+    
+    def load_students_from_database(self, student_ids):
+        """Load the grades of the given students only into the cohort."""
+        student_ids = list(student_ids)
+        if self.cohort is None:
+            self.enable_cohort([])
+        self.cohort.add_students(student_ids)
+        records = list(self.database.grades_for(student_ids))
+        if records:
+            slots = np.array([self.cohort.slot(record[1]) for record in records], dtype=np.intp)
+            rows = self.cohort.rows(record[0] for record in records)
+            # NULL components become NaN, which scatter leaves untouched
+            values = np.array([record[2:] for record in records], dtype=np.float64)
+            self.cohort.scatter(slots, rows, values)
+        return len(records)
+    
+    def report_hierarchy_problems(self):
+        """Print every orphan and dangling reference found while loading."""
+        orphans, dangling = self.hierarchy_report
+        if orphans:
+            print(f"⚠ {len(orphans)} orphan element(s) without parent: {', '.join(orphans)}")
+        if dangling:
+            print(f"⚠ {len(dangling)} dangling parent reference(s):")
+            for code, parent_code, reason in dangling:
+                print(f"    - {code} -> {parent_code}: {reason}")
     
     def set_default_grades(self):
         """Set realistic default grades for all modules."""
@@ -98,251 +444,241 @@ class GSIAcademicManager:
                     module.set_grade(td=(min_grade + max_grade) / 2)
                 module.set_grade(exam=(min_grade + max_grade) / 2)
     
-    def display_academic_structure(self):
-        """Display the complete academic structure."""
-        print("\n" + "=" * 60)
-        print("GSI ACADEMIC STRUCTURE - SEMESTER 1")
-        print("=" * 60)
-        
-        total_semester_credits = 0
-        
-        for sem_name, semester in self.semesters.items():
-            print(f"\n{semester.title} ({sem_name}):")
-            print(f"  Semester Average: {semester.calculate_average():.2f}/20")
-            sem_credits = semester.calculate_credits()
-            print(f"  Semester Credits: {sem_credits}/27")
-            total_semester_credits = sem_credits
-            
-            for unit in semester._units:
-                print(f"\n    {unit.title} ({unit.name}):")
-                print(f"      Unit Average: {unit.calculate_average():.2f}/20")
-                print(f"      Unit Credits: {unit.calculate_credits()}")
-                
-                for module in unit._modules:
-                    module_avg = module.calculate_average()
-                    module_credits = module.calculate_credits()
-                    status = "✓ PASS" if module_avg >= 10 else "✗ FAIL"
-                    print(f"        - {module.title}: {module_avg:.2f}/20 "
-                          f"(Credits: {module_credits}) {status}")
+    def enable_cohort(self, student_ids):
+        """Switch every module to cohort mode, with one grade row per student."""
+        self.cohort = Cohort(student_ids, self.modules.keys())
+        for module in self.modules.values():
+            module.bind_cohort(self.cohort)
+        return self.cohort
+    
+    def set_student_grade(self, student_id, module_code, tp=None, td=None, exam=None, resit=None):
+        """Set the grades of one student in one module (cohort mode).
         
-        return total_semester_credits
+        Shorthand for apply_events; returns the change feed.
+        """
+        return self.apply_events(
+            grade_event(student_id, module_code, component, value)
+            for component, value in zip(COMPONENTS, (tp, td, exam, resit))
+            if value is not None
+        )
     
-    def calculate_student_results(self):
-        """Calculate and display comprehensive student results."""
-        print("\n" + "=" * 60)
-        print("STUDENT ACADEMIC RESULTS SUMMARY")
-        print("=" * 60)
+    def apply_events(self, events):
+        """Apply a batch of GradeEvents to the cohort and log them.
         
-        for semester in self.semesters.values():
-            sem_avg = semester.calculate_average()
-            sem_credits = semester.calculate_credits()
-            
-            print(f"\n{semester.title}:")
-            print(f"  Average: {sem_avg:.2f}/20")
-            print(f"  Credits Obtained: {sem_credits}/27")
-            print(f"  Status: {'✓ PASS' if sem_avg >= 10 else '✗ FAIL'}")
-            
-            if sem_avg >= 10:
-                print(f"  Result: Student has passed the semester")
-            else:
-                print(f"  Result: Student must repeat the semester")
+        Only the affected students are re-evaluated; returns the list of
+        ResultChange for modules, units and semesters whose credits or pass
+        status flipped.
+        """
+        applied, feed = apply_events(self.semesters.values(), self.cohort, events)
+        self.events.append(applied)
+        return feed
+    
+    @instrumented("GSIAcademicManager.evaluate_cohort")
+    def evaluate_cohort(self, semester_code):
+        """Evaluate a whole semester for every cohort student through its compiled plan."""
+        return self.semesters[semester_code].compile().evaluate_cohort(self.cohort)
+    
+    @instrumented("GSIAcademicManager.evaluate_year")
+    def evaluate_year(self, year_code):
+        """Year-end results of every cohort student (see year.RollupResult).
         
-        print(f"\nNOTE: Total credits for Semester 1 should be 27")
-from module import Module
-from unit import Unit
-from semester import Semester
-import csv
-import os
-
-class GSIAcademicManager:
-    """Main class to manage the GSI academic structure."""
+        Rolled up from the cached results of its semesters: only semesters
+        whose grades changed since the last evaluation are evaluated again.
+        """
+        return self.years[year_code].evaluate_cohort(self.cohort)
     
-    def __init__(self):
-        self.modules = {}
-        self.units = {}
-        self.semesters = {}
+    @instrumented("GSIAcademicManager.evaluate_diploma")
+    def evaluate_diploma(self, diploma_code):
+        """Diploma results of every cohort student, rolled up from its years."""
+        return self.diplomas[diploma_code].evaluate_cohort(self.cohort)
     
-    def load_from_csv(self, csv_file):
-        """Load academic data from CSV file and organize it properly."""
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                
-                # First pass: Create all elements
-                for row in csv_reader:
-                    element_type = row.get('type', '').lower()
-                    
-                    if element_type == 'module':
-                        module = Module.from_csv(row)
-                        self.modules[module.name] = module
-                    
-                    elif element_type == 'unit':
-                        unit = Unit.from_csv(row)
-                        self.units[unit.name] = unit
-                    
-                    elif element_type == 'semester':
-                        semester = Semester.from_csv(row)
-                        self.semesters[semester.name] = semester
-            
-            # Second pass: Organize the hierarchy based on GSI curriculum
-            self.organize_gsi_curriculum()
-            
-            # Set default grades for all modules
-            self.set_default_grades()
-            
-            print(f"✓ Successfully loaded data from {csv_file}")
-            return True
-                        
-        except FileNotFoundError:
-            print(f"✗ CSV file {csv_file} not found.")
-            return False
+    def compare_curriculum(self, other):
+        """Classify the differences between this curriculum and another version (see curriculum_diff)."""
+        return diff_curricula(self, other)
     
-    def organize_gsi_curriculum(self):
-        """Organize modules into units and units into semesters based on GSI curriculum."""
-        # Organize Semester 1 modules into their respective units
-        if 'UEF11' in self.units:
-            self.units['UEF11'].add_module(self.modules['F111'])
-            self.units['UEF11'].add_module(self.modules['F112'])
+    @instrumented("GSIAcademicManager.redeliberate")
+    def redeliberate(self, other):
+        """Results of this manager's cohort that change under another curriculum version.
         
-        if 'UEF12' in self.units:
-            self.units['UEF12'].add_module(self.modules['F121'])
-            self.units['UEF12'].add_module(self.modules['F122'])
+        Only the modules, units and semesters the change reaches are
+        evaluated again; returns a curriculum_diff.RedeliberationReport
+        listing every changed student result.
+        """
+        return redeliberate(self, other)
+    
+    def required_exam_grades(self, semester_code, student_ids=None, target=PASS_MARK):
+        """Minimum exam grades each cohort student needs to reach target in a semester.
         
-        if 'UEM11' in self.units:
-            self.units['UEM11'].add_module(self.modules['M111'])
-            self.units['UEM11'].add_module(self.modules['M112'])
+        Restrict the computation to some students (e.g. those at risk) with
+        student_ids; results are aligned with them. See solver.RequiredExam.
+        """
+        plan = self.semesters[semester_code].compile()
+        grades = plan.gather(self.cohort)
+        if student_ids is not None:
+            grades = grades[:, self.cohort.rows(student_ids)]
+        return required_exam_grades(plan, grades, target)
+    
+    def _tracker(self, tracker_class):
+        """Shared CohortTracker of the given class, following the current cohort and curriculum.
         
-        if 'UED11' in self.units:
-            self.units['UED11'].add_module(self.modules['D111'])
+        Grade changes reach the tracker as they happen; a change of
+        coefficients, credits or structure is caught here, by rebuilding a
+        tracker whose compiled plans are stale.
+        """
+        tracker = self._trackers.get(tracker_class)
+        if (tracker is None or tracker.cohort is not self.cohort
+                or tracker.semesters != list(self.semesters.values())):
+            if tracker is not None:
+                tracker.close()
+            tracker = self._trackers[tracker_class] = tracker_class(self.semesters.values(), self.cohort)
+        elif tracker.stale():
+            tracker.rebuild()
+        return tracker
+    
+    def rankings(self):
+        """Class rankings of the cohort in every module, unit and semester.
         
-        if 'UET11' in self.units:
-            self.units['UET11'].add_module(self.modules['T111'])
+        Built on first use, then kept up to date as grades change.
+        """
+        return self._tracker(CohortRanking)
+    
+    def statistics(self):
+        """Grade statistics of every module, unit and semester for jury reports.
         
-        # Organize units into Semester 1
-        if 'S1' in self.semesters:
-            semester1 = self.semesters['S1']
-            for unit_code in ['UEF11', 'UEF12', 'UEM11', 'UED11', 'UET11']:
-                if unit_code in self.units:
-                    semester1.add_unit(self.units[unit_code])
+        Built on first use, then kept up to date as grades change.
+        """
+        return self._tracker(CohortStatistics)
     
-    def set_default_grades(self):
-        """Set realistic default grades for all modules."""
-        grade_ranges = {
-            'F111': (12, 14),  # Réseaux des couches basses
-            'F112': (14, 16),  # Algorithmique Avancée
-            'F121': (13, 15),  # Système d'exploitation
-            'F122': (11, 13),  # Architectures Modernes
-            'M111': (15, 17),  # Architecture BD
-            'M112': (16, 18),  # Méthodes et Technologies
-            'D111': (12, 14),  # Communication Vocaux
-            'T111': (14, 16)   # Cloud Computing
-        }
+    @instrumented("GSIAcademicManager.batch_results")
+    def batch_results(self, workers=None, shard_size=None, executor=None):
+        """Compute averages, credits and pass/fail of every cohort student in every semester.
         
-        for module_code, (min_grade, max_grade) in grade_ranges.items():
-            if module_code in self.modules:
-                module = self.modules[module_code]
-                # Set grades based on module type
-                if module.hours_tp > 0:
-                    module.set_grade(tp=(min_grade + max_grade) / 2)
-                if module.hours_td > 0:
-                    module.set_grade(td=(min_grade + max_grade) / 2)
-                module.set_grade(exam=(min_grade + max_grade) / 2)
+        Large cohorts are sharded across a process pool of at most `workers`
+        processes (all CPUs by default), small ones evaluated inline; pass
+        an executor to reuse a pool. Returns a dict of CohortResults per
+        semester (see parallel.evaluate_semesters).
+        """
+        return evaluate_semesters(list(self.semesters.values()), self.cohort,
+                                  workers=workers, shard_size=shard_size, executor=executor)
     
-    def display_academic_structure(self):
-        """Display the complete academic structure."""
-        print("\n" + "=" * 60)
-        print("GSI ACADEMIC STRUCTURE - SEMESTER 1")
-        print("=" * 60)
+    @instrumented("GSIAcademicManager.load_grades_csv")
+    def load_grades_csv(self, csv_file, chunk_size=50_000):
+        """Stream a student_id,module_code,tp,td,exam export into the cohort.
         
-        total_semester_credits = 0
+        Cohort mode is enabled on first use; students are added as they appear.
+        """
+        if self.cohort is None:
+            self.enable_cohort([])
+        try:
+            stats = ingest_grades(csv_file, self.cohort, chunk_size=chunk_size)
+        except FileNotFoundError:
+            print(f"✗ Grade file {csv_file} not found.")
+            return None
+        except ValueError as error:
+            print(f"✗ Invalid grade file {csv_file}: {error}")
+            return None
         
-        for sem_name, semester in self.semesters.items():
-            print(f"\n{semester.title} ({sem_name}):")
-            print(f"  Semester Average: {semester.calculate_average():.2f}/20")
-            sem_credits = semester.calculate_credits()
-            print(f"  Semester Credits: {sem_credits}/27")
-            total_semester_credits = sem_credits
-            
-            for unit in semester._units:
-                print(f"\n    {unit.title} ({unit.name}):")
-                print(f"      Unit Average: {unit.calculate_average():.2f}/20")
-                print(f"      Unit Credits: {unit.calculate_credits()}")
-                
-                for module in unit._modules:
-                    module_avg = module.calculate_average()
-                    module_credits = module.calculate_credits()
-                    status = "✓ PASS" if module_avg >= 10 else "✗ FAIL"
-                    print(f"        - {module.title}: {module_avg:.2f}/20 "
-                          f"(Credits: {module_credits}) {status}")
+        print(f"✓ Loaded {stats.accepted} grade rows from {csv_file} "
+              f"({stats.rejected} rejected) in {stats.seconds:.2f}s "
+              f"({stats.rows_per_second:,.0f} rows/s)")
+        return stats
+    
+    def validate_grades_csv(self, csv_file, chunk_size=50_000):
+        """Report every bad row of a grade export without loading it.
         
-        return total_semester_credits
+        Returns the ValidationReport, or None if the file cannot be read.
+        """
+        try:
+            report = validate_grade_file(csv_file, self.modules.keys(), chunk_size)
+        except FileNotFoundError:
+            print(f"✗ Grade file {csv_file} not found.")
+            return None
+        except ValueError as error:
+            print(f"✗ Invalid grade file {csv_file}: {error}")
+            return None
+        if report.ok:
+            print(f"✓ {report.rows} grade rows checked in {csv_file}")
+        else:
+            print(f"✗ {len(report.problems)} problem(s) in {csv_file}:")
+            for line in report.lines():
+                print(f"  ✗ {line}")
+        return report
     
-    def calculate_student_results(self):
-        """Calculate and display comprehensive student results."""
-        print("\n" + "=" * 60)
-        print("STUDENT ACADEMIC RESULTS SUMMARY")
-        print("=" * 60)
+    def result_tree(self, student_id=None):
+        """Compute the results of every diploma, year, semester, unit and module once.
         
-        for semester in self.semesters.values():
-            sem_avg = semester.calculate_average()
-            sem_credits = semester.calculate_credits()
-            
-            print(f"\n{semester.title}:")
-            print(f"  Average: {sem_avg:.2f}/20")
-            print(f"  Credits Obtained: {sem_credits}/27")
-            print(f"  Status: {'✓ PASS' if sem_avg >= 10 else '✗ FAIL'}")
-            
-            if sem_avg >= 10:
-                print(f"  Result: Student has passed the semester")
-            else:
-                print(f"  Result: Student must repeat the semester")
+        The tree starts from the elements without a parent: diplomas, then
+        years and semesters outside any of them. In cohort mode the tree is
+        that of one student, who must be given (see write_transcripts for
+        the whole cohort).
+        """
+        index = None
+        if self.cohort is not None:
+            if student_id is None:
+                raise ValueError("Cohort mode: a student is required (use write_transcripts for every student)")
+            index = self.cohort.row(student_id)
+        roots = [element for registry in (self.diplomas, self.years, self.semesters)
+                 for element in registry.values() if not element._parents]
+        return build_result_tree(roots, index)
+    
+    @instrumented("GSIAcademicManager.display_academic_structure")
+    def display_academic_structure(self, out=None, student_id=None):
+        """Display the complete academic structure (of one student in cohort mode)."""
+        tree = self.result_tree(student_id)
+        write_lines(structure_lines(tree), out or sys.stdout)
+        return tree[-1]["credits"] if tree else 0
+    
+    @instrumented("GSIAcademicManager.calculate_student_results")
+    def calculate_student_results(self, out=None, student_id=None):
+        """Calculate and display comprehensive student results (of one student in cohort mode)."""
+        write_lines(summary_lines(self.result_tree(student_id)), out or sys.stdout)
+    
+    @instrumented("GSIAcademicManager.export_report")
+    def export_report(self, out, fmt="text", student_id=None):
+        """Write the full report (of one student in cohort mode) to a text stream as text, json or csv."""
+        render(self.result_tree(student_id), out, fmt)
+    
+    @instrumented("GSIAcademicManager.write_transcripts")
+    def write_transcripts(self, out, fmt="text", chunk_size=1000):
+        """Stream one transcript per cohort student to a file or pipe.
         
-        print(f"\nNOTE: Total credits for Semester 1 should be 27")
-       
+        Returns the number of transcripts written.
+        """
+        return write_transcripts(list(self.semesters.values()), self.cohort, out,
+                                 fmt=fmt, chunk_size=chunk_size)
+
 
 def create_sample_csv():
     """Create a sample CSV file if it doesn't exist."""
-    csv_content = """type,code,title,coef,credit,hours_lecture,hours_td,hours_tp,teaching_mode,continous_percent,exam_percent
-module,F111,Réseaux des couches basses,3,6,1.5,1.5,1.5,In-person,40,60
-module,F112,Algorithmique Avancée et Complexité,2,4,1.5,1.5,0,In-person,40,60
-module,F121,Système d'exploitation,2,4,1.5,1.5,0,In-person,40,60
-module,F122,Architectures Modernes des Systèmes Informatiques,2,4,1.5,1.5,0,In-person,40,60
-module,M111,Architecture et administration des bases de données,2,4,1.5,1.5,0,In-person,40,60
-module,M112,Méthodes et Technologies d'Implémentation,3,5,1.5,0,1.5,In-person,40,60
-module,D111,Systèmes de Communication Vocaux et Vidéos,2,2,1.5,1.5,0,In-person,40,60
-module,T111,Cloud Computing,1,1,1.5,0,0,In-person,100,0
-unit,UEF11,UE Fondamentales 1,0,0,0,0,0,In-person,0,0
-unit,UEF12,UE Fondamentales 2,0,0,0,0,0,In-person,0,0
-unit,UEM11,UE Méthodologie,0,0,0,0,0,In-person,0,0
-unit,UED11,UE Découverte,0,0,0,0,0,In-person,0,0
-unit,UET11,UE Transversale,0,0,0,0,0,In-person,0,0
-semester,S1,Semester 1,0,0,0,0,0,In-person,0,0"""
+    csv_content = """type,code,title,coef,credit,hours_lecture,hours_td,hours_tp,teaching_mode,continous_percent,exam_percent,parent
+module,F111,Réseaux des couches basses,3,6,1.5,1.5,1.5,In-person,40,60,UEF11
+module,F112,Algorithmique Avancée et Complexité,2,4,1.5,1.5,0,In-person,40,60,UEF11
+module,F121,Système d'exploitation,2,4,1.5,1.5,0,In-person,40,60,UEF12
+module,F122,Architectures Modernes des Systèmes Informatiques,2,4,1.5,1.5,0,In-person,40,60,UEF12
+module,M111,Architecture et administration des bases de données,2,4,1.5,1.5,0,In-person,40,60,UEM11
+module,M112,Méthodes et Technologies d'Implémentation,3,5,1.5,0,1.5,In-person,40,60,UEM11
+module,D111,Systèmes de Communication Vocaux et Vidéos,2,2,1.5,1.5,0,In-person,40,60,UED11
+module,T111,Cloud Computing,1,1,1.5,0,0,In-person,100,0,UET11
+unit,UEF11,UE Fondamentales 1,0,0,0,0,0,In-person,0,0,S1
+unit,UEF12,UE Fondamentales 2,0,0,0,0,0,In-person,0,0,S1
+unit,UEM11,UE Méthodologie,0,0,0,0,0,In-person,0,0,S1
+unit,UED11,UE Découverte,0,0,0,0,0,In-person,0,0,S1
+unit,UET11,UE Transversale,0,0,0,0,0,In-person,0,0,S1
+semester,S1,Semester 1,0,0,0,0,0,In-person,0,0,"""
     
     with open("gsi_curriculum.csv", "w", encoding="utf-8") as f:
         f.write(csv_content)
     print("✓ Sample CSV file created: gsi_curriculum.csv")
 
-def main():
+def main(argv=None):
     """Main function to run the GSI Academic Manager."""
-    manager = GSIAcademicManager()
+    parser = argparse.ArgumentParser(description="GSI Academic Manager")
+    parser.add_argument("--profile", action="store_true",
+                        help="print call counts, latencies and cache hit rates after the run")
+    args = parser.parse_args(argv)
+    if args.profile:
+        instrumentation.enable()
     
-    # Create sample CSV file if it doesn't exist
-    if not os.path.exists("gsi_curriculum.csv"):
-        create_sample_csv()
-    
-    # Load from CSV
-    csv_file = "gsi_curriculum.csv"
-    if manager.load_from_csv(csv_file):
-        # Display results
-        manager.display_academic_structure()
-        manager.calculate_student_results()
-    else:
-        print("Failed to load data. Please check the CSV file.")
-
-if __name__ == "__main__":
-    main()
-def main():
-    """Main function to run the GSI Academic Manager."""
     manager = GSIAcademicManager()
     
     # Create sample CSV file if it doesn't exist
@@ -357,6 +693,12 @@ def main():
         manager.calculate_student_results()
     else:
         print("Failed to load data. Please check the CSV file.")
+    
+    if args.profile:
+        print("\n" + "=" * 60)
+        print("PROFILE SUMMARY")
+        print("=" * 60)
+        print(instrumentation.format_stats(manager.stats()))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
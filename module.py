@@ -1,8 +1,27 @@
-from academicelement import AcademicElement
+import numpy as np
+
+from academicelement import AcademicElement, TrackedAttribute, cached_aggregate
+from cohort import COMPONENTS, decode_grades, weighted_average
+from instrumentation import instrumented
+from plan import passes
+from policies import STANDARD
 
 class Module(AcademicElement):
     """Represents a teaching module with pedagogical and evaluation attributes."""
 
+    __slots__ = (
+        "hours_lecture", "_hours_td", "_hours_tp", "teaching_mode",
+        "_evaluation_continous_percent", "_evaluation_exam_percent",
+        "total_hours", "_grades", "_cohort", "_slot", "_policy",
+    )
+
+    # Changing any of these changes the module average
+    hours_td = TrackedAttribute()
+    hours_tp = TrackedAttribute()
+    evaluation_continous_percent = TrackedAttribute()
+    evaluation_exam_percent = TrackedAttribute()
+    policy = TrackedAttribute()
+
     def __init__(
         self,
         name: str = "",
@@ -14,36 +33,63 @@ class Module(AcademicElement):
         hours_tp: float = 0,
         teaching_mode: str = "In-person",
         continous_percent: int = 40,
-        exam_percent: int = 60
+        exam_percent: int = 60,
+        policy=STANDARD
     ):
         super().__init__(name, title)
-        self.coef = coef
-        self.credit = credit
+        self._coef = coef
+        self._credit = credit
         self.hours_lecture = hours_lecture
-        self.hours_td = hours_td
-        self.hours_tp = hours_tp
+        self._hours_td = hours_td
+        self._hours_tp = hours_tp
         self.teaching_mode = teaching_mode
-        self.evaluation_continous_percent = continous_percent
-        self.evaluation_exam_percent = exam_percent
+        self._evaluation_continous_percent = continous_percent
+        self._evaluation_exam_percent = exam_percent
+        # EvaluationPolicy: resit, cap and eliminatory rules (see policies)
+        self._policy = policy
 
         # Total hours x semesters
         self.total_hours = self._WEEKS * (self.hours_lecture + self.hours_td + self.hours_tp)
-        self._grades = {"tp": 0, "td": 0, "exam": 0}
+        # None until a grade is entered
+        self._grades = dict.fromkeys(COMPONENTS)
+
+        # Cohort mode: grades are read from a shared columnar store instead
+        self._cohort = None
+        self._slot = None
+
+    def bind_cohort(self, cohort):
+        """Back this module by the grade columns of a cohort (None to detach)."""
+        self._cohort = cohort
+        self._slot = cohort.attach(self) if cohort is not None else None
+        self.invalidate()
 
-    def set_grade(self, tp=None, td=None, exam=None):
+    @property
+    def cohort(self):
+        return self._cohort
+
+    def set_grade(self, tp=None, td=None, exam=None, resit=None, student=None):
         """Encapsulation: controlled access to grades."""
-        if tp is not None:
-            self._grades["tp"] = tp
-        if td is not None:
-            self._grades["td"] = td
-        if exam is not None:
-            self._grades["exam"] = exam
+        if self._cohort is not None:
+            if student is None:
+                raise ValueError(f"Module {self.name} is in cohort mode: a student is required")
+            self._cohort.set_grades(self._slot, self._cohort.row(student), tp=tp, td=td, exam=exam, resit=resit)
+            self.invalidate()
+            return
+        for component, value in zip(COMPONENTS, (tp, td, exam, resit)):
+            if value is not None:
+                self._grades[component] = value
+        self.invalidate()
 
-    def calculate_average(self):
-        """Calculate the module average based on grades and percentages."""
-        tp = self._grades["tp"] or 0
-        td = self._grades["td"] or 0
-        exam = self._grades["exam"] or 0
+    def evaluation_weights(self):
+        """Return the (tp, td, exam, resit) weights applied to the grades, summing to 1.
+
+        The resit grade has no weight of its own: a policy folds it into the
+        exam grade.
+        """
+        return tuple(percent / 100 for percent in self.evaluation_percents())
+
+    def evaluation_percents(self):
+        """Return the (tp, td, exam, resit) percentages applied to the grades."""
         percent_exam = self.evaluation_exam_percent
         percent_tp = percent_td = 0
         
@@ -53,13 +99,61 @@ class Module(AcademicElement):
             percent_td = self.evaluation_continous_percent
         elif self.hours_tp:
             percent_tp = self.evaluation_continous_percent
-            
-        return (tp * percent_tp / 100 + td * percent_td / 100 + exam * percent_exam / 100)
 
+        return (percent_tp, percent_td, percent_exam, 0)
+
+    def _float_grades(self):
+        """Grades as a float array with NaN where missing (per student in cohort mode)."""
+        if self._cohort is not None:
+            return decode_grades(self._cohort.module_block(self._slot))
+        return np.array([np.nan if value is None else value for value in self._grades.values()],
+                        dtype=np.float64)
+
+    @cached_aggregate
+    @instrumented("Module.calculate_average")
+    def calculate_average(self):
+        """Calculate the module average based on grades and percentages.
+
+        In cohort mode this returns one average per student. The average is
+        NaN (incomplete) while a grade that counts is missing.
+        """
+        if not self.policy.linear:
+            averages = self.policy.averages(self._float_grades(), np.array(self.evaluation_weights()))
+            return averages if self._cohort is not None else float(averages)
+        if self._cohort is not None:
+            return weighted_average(self._cohort.module_block(self._slot), self.evaluation_weights())
+
+        # grade * percent / 100, in this order, as the baseline computed it
+        average = 0
+        for grade, percent in zip(self._grades.values(), self.evaluation_percents()):
+            if percent:
+                if grade is None:
+                    return float("nan")
+                average += grade * percent / 100
+        return average
+
+    @cached_aggregate
+    @instrumented("Module.calculate_credits")
     def calculate_credits(self):
-        """Calculate credits earned based on average."""
-        avg = self.calculate_average()
-        return self.credit if avg >= 10 else 0
+        """Calculate credits earned based on average (per student in cohort mode).
+
+        An eliminatory grade of the policy fails the module whatever its average.
+        """
+        passed = passes(self.calculate_average()) & np.logical_not(self.eliminated())
+        if self._cohort is not None:
+            return passed * self.credit
+        return self.credit if passed else 0
+
+    def required_credits(self):
+        return self.credit
+
+    @cached_aggregate
+    def eliminated(self):
+        """Whether an exam grade is below the policy's eliminatory minimum (per student in cohort mode)."""
+        if self.policy.minimum is None:
+            return False
+        eliminated = self.policy.eliminated(self._float_grades())
+        return eliminated if self._cohort is not None else bool(eliminated)
 
     def summary(self):
         """Return a short textual description of the module."""
@@ -73,6 +167,22 @@ class Module(AcademicElement):
             f"Exam {self.evaluation_exam_percent}%"
         )
 
+    def to_csv(self):
+        """Describe the module as a curriculum CSV row (see from_csv)."""
+        return {
+            'code': self.name,
+            'title': self.title,
+            'coef': self.coef,
+            'credit': self.credit,
+            'hours_lecture': self.hours_lecture,
+            'hours_td': self.hours_td,
+            'hours_tp': self.hours_tp,
+            'teaching_mode': self.teaching_mode,
+            'continous_percent': self.evaluation_continous_percent,
+            'exam_percent': self.evaluation_exam_percent,
+            'policy': self.policy.name,
+        }
+
     @classmethod
     def from_csv(cls, csv_data):
         """Create Module instance from CSV data."""
@@ -0,0 +1,118 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from plan import passes
+from shared_cohort import SharedGrades, attach_grades, create_shared, handle, is_shared
+
+# Below this many students per worker, starting processes and sharing the
+# grades costs more than evaluating inline (see benchmarks/bench_parallel.py)
+MIN_STUDENTS_PER_WORKER = 100_000
+
+CohortResults = namedtuple("CohortResults", ["student_ids", "averages", "credits", "passed"])
+CohortResults.__doc__ = """Per-student results of one semester, aligned with student_ids.
+
+passed is False for a student failed on an eliminatory grade, whatever the average.
+"""
+
+
+def _evaluate_shard(plans, shard):
+    """Worker entry point: evaluate every plan on one block of students.
+
+    plans is a list of (plan, slots) pairs, where slots selects the plan's
+    modules in the shard's module axis.
+    """
+    outcomes = []
+    for plan, slots in plans:
+        result = plan.evaluate(shard[slots])
+        outcomes.append((result.average, result.credits, passes(result.average) & ~result.eliminated))
+    return outcomes
+
+
+def _evaluate_shared_shard(plans, shared, start, stop):
+    """Worker entry point: evaluate a student range of a shared grade array in place."""
+    return _evaluate_shard(plans, attach_grades(shared)[:, start:stop])
+
+
+def _map_shards(executor, plans, shared, bounds):
+    return list(executor.map(_evaluate_shared_shard, [plans] * len(bounds), [shared] * len(bounds),
+                             *zip(*bounds)))
+
+
+def shard_bounds(n_students, shard_size):
+    """Yield (start, stop) student ranges of at most shard_size students."""
+    for start in range(0, n_students, shard_size):
+        yield start, min(start + shard_size, n_students)
+
+
+def pool_workers(n_students, workers=None):
+    """Number of worker processes worth starting for n_students; 1 means inline.
+
+    One process per MIN_STUDENTS_PER_WORKER students at most, and never
+    more than workers (all CPUs by default) nor on a single CPU.
+    """
+    cpus = os.cpu_count() or 1
+    workers = workers or cpus
+    if cpus == 1:
+        return 1
+    return max(1, min(workers, n_students // MIN_STUDENTS_PER_WORKER))
+
+
+def evaluate_semesters(semesters, cohort, workers=None, shard_size=None, executor=None):
+    """Evaluate several semesters for the whole cohort, on a process pool when it pays.
+
+    Students are split into contiguous shards; each worker receives only
+    the compiled plans and the bounds of its shard, and reads the grades
+    from shared memory (the cohort's own block once shared). Returns a dict
+    mapping semester codes to CohortResults.
+
+    Without executor, a pool is only started when pool_workers() finds it
+    worth it, and everything runs in the calling process otherwise. Pass a
+    ProcessPoolExecutor to reuse it across calls: it is always used (for
+    more than one shard), and left open.
+    """
+    n_students = len(cohort)
+    if executor is None:
+        workers = pool_workers(n_students, workers)
+    else:
+        workers = workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, -(-n_students // (4 * workers)))
+
+    plans = []
+    for semester in semesters:
+        plan = semester.compile()
+        plans.append((plan, np.array([cohort.slot(code) for code in plan.module_codes], dtype=np.intp)))
+
+    bounds = list(shard_bounds(n_students, shard_size))
+
+    if (executor is None and workers == 1) or len(bounds) <= 1:
+        shard_outcomes = [_evaluate_shard(plans, cohort.grades[:, start:stop]) for start, stop in bounds]
+    else:
+        # Workers map the grades from shared memory: only plans and bounds are pickled
+        if is_shared(cohort):
+            block, grades = None, None
+            shared = handle(cohort).grades
+        else:
+            block, grades = create_shared(cohort.grades)
+            shared = SharedGrades(block.name, grades.shape, grades.dtype.str)
+        try:
+            if executor is not None:
+                shard_outcomes = _map_shards(executor, plans, shared, bounds)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    shard_outcomes = _map_shards(pool, plans, shared, bounds)
+        finally:
+            if block is not None:
+                del grades
+                block.close()
+                block.unlink()
+
+    results = {}
+    for index, semester in enumerate(semesters):
+        averages = np.concatenate([[]] + [outcome[index][0] for outcome in shard_outcomes])
+        credits = np.concatenate([[]] + [outcome[index][1] for outcome in shard_outcomes])
+        passed = np.concatenate([np.zeros(0, dtype=bool)] + [outcome[index][2] for outcome in shard_outcomes])
+        results[semester.name] = CohortResults(list(cohort.student_ids), averages, credits, passed)
+    return results
@@ -0,0 +1,254 @@
+from collections import namedtuple
+
+import numpy as np
+
+from cohort import COMPONENTS, GRADE_DTYPE, GRADE_SCALE, MISSING, decode_grades, incomplete_rows
+from policies import STANDARD
+
+PASS_MARK = 10
+# Averages are sums of float products whose order differs between the object
+# tree, the compiled plans and SQL: a result within this of a mark reaches it
+PASS_TOLERANCE = 1e-9
+
+
+def passes(average, mark=PASS_MARK):
+    """Whether an average (or array of averages) reaches a mark; NaN never does."""
+    return average >= mark - PASS_TOLERANCE
+
+
+def result_status(average, eliminated=False):
+    """PASS, FAIL, ELIMINATED (failed on an eliminatory grade) or INCOMPLETE (NaN average) for API responses."""
+    if average != average:
+        return "INCOMPLETE"
+    if eliminated:
+        return "ELIMINATED"
+    return "PASS" if passes(average) else "FAIL"
+
+SemesterResult = namedtuple(
+    "SemesterResult",
+    ["module_averages", "unit_averages", "average", "credits", "module_credits", "unit_credits",
+     "eliminated", "module_eliminated"],
+)
+SemesterResult.__doc__ = """Cohort results of a semester, one column per student.
+
+module_* and unit_* arrays have one row per module/unit of the plan.
+Averages are NaN (incomplete) where a grade they depend on is missing;
+incomplete modules award no credits, nor do modules failed on an
+eliminatory grade. A unit or semester whose average reaches the pass mark
+awards all its credits by compensation, unless one of its modules was
+failed on an eliminatory grade; eliminated flags the students for whom
+one module of the semester was, and module_eliminated (None when no
+module has an eliminatory grade) the modules concerned.
+"""
+
+
+class SemesterPlan:
+    """Linear evaluation plan of a semester, flattened into weight arrays.
+
+    A module average is a fixed combination of its tp/td/exam grades and a
+    semester average a fixed combination of module averages, so the whole
+    semester reduces to weight arrays that evaluate a cohort without walking
+    Module/Unit objects. Modules under a non-linear evaluation policy (resits,
+    eliminatory grades) are grouped by policy, and each policy then runs once
+    over the grades of all its modules.
+    """
+
+    def __init__(self, module_codes, unit_codes, module_weights, unit_matrix,
+                 unit_membership, unit_factors, credits, thresholds, policies=None):
+        self.module_codes = list(module_codes)
+        self.unit_codes = list(unit_codes)
+        # (modules, components): evaluation weights of each module
+        self.module_weights = module_weights
+        # (units, modules): share of each module average in its unit average
+        self.unit_matrix = unit_matrix
+        # (units, modules): 1 where the module belongs to the unit
+        self.unit_membership = unit_membership
+        # (units,): share of each unit average in the semester average
+        self.unit_factors = unit_factors
+        # (modules,): credits awarded per module and the average needed for them
+        self.credits = credits
+        self.thresholds = thresholds
+        # Credits awarded by a unit, and by the semester, when compensated
+        self.unit_required = unit_membership @ credits
+        self.required = float(credits.sum())
+        # (modules, components): the semester average as a single weight array
+        self.weights = (unit_factors @ unit_matrix)[:, None] * module_weights
+        # EvaluationPolicy of each module, and the non-linear ones with their module rows
+        self.policies = list(policies) if policies is not None else [STANDARD] * len(self.module_codes)
+        groups = {}
+        for m, policy in enumerate(self.policies):
+            if not policy.linear:
+                groups.setdefault(policy, []).append(m)
+        self.policy_groups = [(policy, np.array(rows, dtype=np.intp)) for policy, rows in groups.items()]
+        # (modules,): eliminatory exam grade of each module, 0 for none
+        self.minimums = np.array([policy.minimum or 0 for policy in self.policies], dtype=np.float64)
+
+    @classmethod
+    def compile(cls, semester):
+        """Flatten a Semester into a plan."""
+        units = list(semester._units)
+        modules = [module for unit in units for module in unit._modules]
+
+        unit_matrix = np.zeros((len(units), len(modules)))
+        unit_membership = np.zeros((len(units), len(modules)))
+        position = 0
+        for row, unit in enumerate(units):
+            coef_sum = sum(m.coef for m in unit._modules)
+            for module in unit._modules:
+                if coef_sum != 0:
+                    unit_matrix[row, position] = module.coef / coef_sum
+                unit_membership[row, position] = 1
+                position += 1
+
+        unit_coef_sum = sum(unit.coef for unit in units)
+        unit_factors = np.array(
+            [unit.coef / unit_coef_sum if unit_coef_sum != 0 else 0 for unit in units],
+            dtype=np.float64,
+        )
+
+        return cls(
+            [m.name for m in modules],
+            [u.name for u in units],
+            np.array([m.evaluation_weights() for m in modules], dtype=np.float64).reshape(-1, len(COMPONENTS)),
+            unit_matrix,
+            unit_membership,
+            unit_factors,
+            np.array([m.credit for m in modules], dtype=np.float64),
+            np.full(len(modules), PASS_MARK, dtype=np.float64),
+            [m.policy for m in modules],
+        )
+
+    def gather(self, cohort):
+        """Return the cohort grades of the plan's modules, in plan order."""
+        return cohort.grades[[cohort.slot(code) for code in self.module_codes]]
+
+    def _scaled(self, grades, weights):
+        """Weights matching the grade encoding, and the mask of missing grades.
+
+        Encoded grades are aggregated directly, the quarter-point scale being
+        folded into the weights; float grades use NaN for missing.
+        """
+        if grades.dtype == GRADE_DTYPE:
+            return grades, weights / GRADE_SCALE, grades == MISSING
+        missing = np.isnan(grades)
+        return np.where(missing, 0, grades), weights, missing
+
+    def average(self, grades):
+        """Semester averages of (modules, students, components) grades in one product."""
+        if self.policy_groups:
+            return self.evaluate(grades).average
+        values, weights, missing = self._scaled(grades, self.weights)
+        averages = np.tensordot(weights, values, axes=([0, 1], [0, 2]))
+        if not missing.any():
+            return averages
+        incomplete = incomplete_rows(missing, (self.weights > 0)[:, None, :]).any(axis=0)
+        return np.where(incomplete, np.nan, averages)
+
+    def evaluate(self, grades):
+        """Compute module, unit and semester results for every student."""
+        return self._aggregate(*self._evaluate_modules(grades))
+
+    def reevaluate(self, result, grades, rows):
+        """Results under this plan, from those of a plan with the same modules and units.
+
+        Only the modules at the given rows are evaluated again, from their
+        (len(rows), students, components) grades; unit and semester results
+        are then aggregated again with this plan's coefficients and credits.
+        This is how a weight-only curriculum change is applied without
+        evaluating the unchanged modules.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        module_averages = result.module_averages.copy()
+        incomplete = np.isnan(module_averages)
+        if result.module_eliminated is None:
+            eliminated = np.zeros(module_averages.shape, dtype=bool)
+        else:
+            eliminated = result.module_eliminated.copy()
+        if len(rows):
+            averages, changed_incomplete, changed_eliminated = self._evaluate_modules(grades, rows)
+            module_averages[rows] = averages
+            incomplete[rows] = False if changed_incomplete is None else changed_incomplete
+            eliminated[rows] = False if changed_eliminated is None else changed_eliminated
+        return self._aggregate(module_averages, incomplete, eliminated if eliminated.any() else None)
+
+    def _evaluate_modules(self, grades, rows=None):
+        """Averages of the modules at rows (all by default), with their incomplete
+        and eliminated masks (None when empty)."""
+        module_weights = self.module_weights if rows is None else self.module_weights[rows]
+        values, weights, missing = self._scaled(grades, module_weights)
+        # One product per module: einsum would first cast all the codes to float
+        module_averages = np.empty(values.shape[:2])
+        for m, weight in enumerate(weights):
+            module_averages[m] = values[m] @ weight
+        incomplete = eliminated = None
+        if missing.any():
+            incomplete = incomplete_rows(missing, (module_weights > 0)[:, None, :])
+        groups = self.policy_groups
+        if rows is not None:
+            groups = [(policy, np.flatnonzero(np.isin(rows, group))) for policy, group in groups]
+            groups = [(policy, group) for policy, group in groups if len(group)]
+        if groups:
+            incomplete, eliminated = self._apply_policies(grades, module_weights, module_averages,
+                                                          incomplete, groups)
+        return module_averages, incomplete, eliminated
+
+    def _aggregate(self, module_averages, incomplete, eliminated):
+        """Unit and semester results from module averages; module_averages is updated in place."""
+        if incomplete is not None and incomplete.any():
+            module_averages[incomplete] = 0
+            unit_averages = self.unit_matrix @ module_averages
+            unit_incomplete = (self.unit_matrix > 0) @ incomplete
+            unit_averages[unit_incomplete] = 0
+            average = self.unit_factors @ unit_averages
+            average[(self.unit_factors > 0) @ unit_incomplete] = np.nan
+            module_averages[incomplete] = np.nan
+            unit_averages[unit_incomplete] = np.nan
+        else:
+            unit_averages = self.unit_matrix @ module_averages
+            average = self.unit_factors @ unit_averages
+        passed = passes(module_averages, self.thresholds[:, None])
+        unit_compensated = passes(unit_averages)
+        compensated = passes(average)
+        if eliminated is not None:
+            passed &= ~eliminated
+            unit_compensated &= (self.unit_membership @ eliminated) == 0
+            students_eliminated = eliminated.any(axis=0)
+            compensated &= ~students_eliminated
+        else:
+            students_eliminated = np.zeros(average.shape, dtype=bool)
+        module_credits = passed * self.credits[:, None]
+        unit_credits = np.where(unit_compensated, self.unit_required[:, None], self.unit_membership @ module_credits)
+        return SemesterResult(
+            module_averages,
+            unit_averages,
+            average,
+            np.where(compensated, self.required, unit_credits.sum(axis=0)),
+            module_credits,
+            unit_credits,
+            students_eliminated,
+            eliminated,
+        )
+
+    def _apply_policies(self, grades, module_weights, module_averages, incomplete, groups):
+        """Recompute the modules under non-linear policies, one kernel call per policy.
+
+        groups pairs each policy with its rows in grades. Updates
+        module_averages in place; returns the incomplete and eliminated
+        (modules, students) masks.
+        """
+        if incomplete is None:
+            incomplete = np.zeros(module_averages.shape, dtype=bool)
+        eliminated = np.zeros(module_averages.shape, dtype=bool)
+        for policy, rows in groups:
+            block = grades[rows]
+            if block.dtype == GRADE_DTYPE:
+                block = decode_grades(block)
+            averages = policy.averages(block, module_weights[rows][:, None, :])
+            module_averages[rows] = averages
+            incomplete[rows] = np.isnan(averages)
+            eliminated[rows] = policy.eliminated(block)
+        return incomplete, eliminated
+
+    def evaluate_cohort(self, cohort):
+        """Evaluate every student of a cohort."""
+        return self.evaluate(self.gather(cohort))
@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+import numpy as np
+
+from cohort import COMPONENTS
+
+RESIT_MODES = ("none", "max", "replace")
+POLICY_RULES = ("resit", "resit_cap", "minimum")
+MAX_GRADE = 20
+
+EXAM = COMPONENTS.index("exam")
+RESIT = COMPONENTS.index("resit")
+
+
+class EvaluationPolicy(namedtuple("EvaluationPolicy", ["name", "resit", "resit_cap", "minimum"])):
+    """Named rules turning the grades of a module into its average and pass.
+
+    resit: how a resit grade combines with the exam grade: "none" (ignored),
+    "max" (the better of both) or "replace" (a resit grade replaces it).
+    resit_cap: highest resit grade taken into account, or None.
+    minimum: eliminatory exam grade, or None: below it the module is failed
+    whatever its average.
+
+    The rules work on whole float arrays, NaN marking a missing grade, so a
+    policy runs over a cohort at once.
+    """
+
+    __slots__ = ()
+
+    @property
+    def linear(self):
+        """Whether the module average is the plain weighted sum of its grades."""
+        return self.resit == "none" and self.minimum is None
+
+    def rules(self):
+        """The rules as written in a curriculum file (see parse_policy)."""
+        rules = [f"resit={self.resit}"]
+        if self.resit_cap is not None:
+            rules.append(f"resit_cap={self.resit_cap:g}")
+        if self.minimum is not None:
+            rules.append(f"minimum={self.minimum:g}")
+        return ";".join(rules)
+
+    def exam_grades(self, exam, resit):
+        """The exam grade counted in the average, from exam and resit grades."""
+        if self.resit == "none":
+            return exam
+        if self.resit_cap is not None:
+            resit = np.minimum(resit, self.resit_cap)
+        if self.resit == "max":
+            return np.fmax(exam, resit)
+        return np.where(np.isnan(resit), exam, resit)
+
+    def averages(self, grades, weights):
+        """Averages of float (..., components) grades, NaN while incomplete.
+
+        weights broadcasts against grades, one weight per component.
+        """
+        exam = self.exam_grades(grades[..., EXAM], grades[..., RESIT])
+        average = np.where(weights[..., EXAM] > 0, exam * weights[..., EXAM], 0)
+        for component in range(len(COMPONENTS)):
+            if component not in (EXAM, RESIT):
+                weight = weights[..., component]
+                average = average + np.where(weight > 0, grades[..., component] * weight, 0)
+        return average
+
+    def eliminated(self, grades):
+        """Where float (..., components) grades fall below the eliminatory minimum."""
+        if self.minimum is None:
+            return np.zeros(grades.shape[:-1], dtype=bool)
+        with np.errstate(invalid="ignore"):
+            return self.exam_grades(grades[..., EXAM], grades[..., RESIT]) < self.minimum
+
+
+STANDARD = EvaluationPolicy("standard", "none", None, None)
+
+# Policies every curriculum may reference without declaring them
+BUILTIN_POLICIES = {STANDARD.name: STANDARD}
+
+
+def parse_policy(name, rules):
+    """Build a policy from "rule=value" pairs separated by ';'.
+
+    For example "resit=max;resit_cap=12;minimum=6". Omitted rules keep the
+    standard behaviour. Raises ValueError on an unknown rule or value.
+    """
+    values = {"resit": "none", "resit_cap": None, "minimum": None}
+    for rule in filter(None, (part.strip() for part in rules.split(';'))):
+        key, _, value = (text.strip() for text in rule.partition('='))
+        if key not in POLICY_RULES:
+            raise ValueError(f"unknown rule {key!r} (expected one of {', '.join(POLICY_RULES)})")
+        if key == "resit":
+            if value not in RESIT_MODES:
+                raise ValueError(f"unknown resit mode {value!r} (expected one of {', '.join(RESIT_MODES)})")
+            values[key] = value
+        else:
+            try:
+                grade = float(value)
+            except ValueError:
+                grade = float("nan")
+            if not 0 <= grade <= MAX_GRADE:
+                raise ValueError(f"{key} must be a grade between 0 and {MAX_GRADE}")
+            values[key] = grade
+    return EvaluationPolicy(name, **values)
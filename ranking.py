@@ -0,0 +1,115 @@
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+
+from tracking import CohortTracker
+
+# Values are rounded to this many decimals, so that averages evaluated in a
+# different order (incrementally or in a rebuild) tie as they should
+RANK_DECIMALS = 9
+
+
+class Ranking:
+    """Class ranking of students by one average.
+
+    Values are kept both per student and in a sorted list, so a rank or
+    percentile lookup is a binary search and a changed value moves in the
+    sorted list without re-sorting. Students with a NaN value (incomplete
+    record) are left out of the sorted list and have no rank. Values are
+    rounded to RANK_DECIMALS.
+    """
+
+    def __init__(self, student_ids, values):
+        self.student_ids = student_ids
+        self._values = np.round(np.array(values, dtype=np.float64), RANK_DECIMALS)
+        self._sorted = sorted(self._values[~np.isnan(self._values)].tolist())
+
+    def __len__(self):
+        """Number of ranked (complete) students."""
+        return len(self._sorted)
+
+    def update(self, index, value):
+        """Move the student at index to a new value."""
+        value = round(value, RANK_DECIMALS)
+        old = self._values[index]
+        if old == value or (np.isnan(old) and np.isnan(value)):
+            return
+        if not np.isnan(old):
+            del self._sorted[bisect_left(self._sorted, old)]
+        if not np.isnan(value):
+            insort(self._sorted, value)
+        self._values[index] = value
+
+    def value(self, index):
+        return float(self._values[index])
+
+    def rank(self, index):
+        """Competition rank of a student: 1 + number of strictly better students (None if incomplete)."""
+        value = self._values[index]
+        if np.isnan(value):
+            return None
+        return len(self._sorted) - bisect_right(self._sorted, value) + 1
+
+    def percentile(self, index):
+        """Percentage of ranked students whose value is lower than or equal to this student's (None if incomplete)."""
+        value = self._values[index]
+        if np.isnan(value):
+            return None
+        return 100.0 * bisect_right(self._sorted, value) / len(self._sorted)
+
+    def value_at_percentile(self, percent):
+        """Value below which percent % of the ranked students fall (nearest rank); None if none is."""
+        if not self._sorted:
+            return None
+        position = int(np.ceil(percent / 100 * len(self._sorted))) - 1
+        return self._sorted[min(max(position, 0), len(self._sorted) - 1)]
+
+    def top(self, k):
+        """The k best ranked (student_id, value) pairs, best first, by partial selection."""
+        ranked = np.flatnonzero(~np.isnan(self._values))
+        k = min(k, len(ranked))
+        if k <= 0:
+            return []
+        values = self._values[ranked]
+        best = np.argpartition(-values, k - 1)[:k]
+        best = best[np.argsort(-values[best], kind="stable")]
+        return [(self.student_ids[i], float(self._values[i])) for i in ranked[best].tolist()]
+
+
+class CohortRanking(CohortTracker):
+    """Rankings of every module, unit and semester of a cohort, kept up to date.
+
+    A grade change moves only the changed students within the rankings of
+    the module, its units and its semester (see CohortTracker).
+    """
+
+    def rebuild(self):
+        self.rankings = {}
+        super().rebuild()
+
+    def reset(self, code, values):
+        self.rankings[code] = Ranking(self.cohort.student_ids, values)
+
+    def update(self, code, rows, values):
+        ranking = self.rankings[code]
+        for row, value in zip(rows.tolist(), values.tolist()):
+            ranking.update(row, value)
+
+    def _ranking(self, code):
+        try:
+            return self.rankings[code]
+        except KeyError:
+            raise KeyError(f"No ranking for {code}") from None
+
+    def rank(self, code, student_id):
+        """Class rank (1 = best) of a student in a module, unit or semester; None if incomplete."""
+        return self._ranking(code).rank(self.cohort.row(student_id))
+
+    def percentile(self, code, student_id):
+        return self._ranking(code).percentile(self.cohort.row(student_id))
+
+    def value_at_percentile(self, code, percent):
+        return self._ranking(code).value_at_percentile(percent)
+
+    def top(self, code, k):
+        return self._ranking(code).top(k)
@@ -0,0 +1,294 @@
+import csv
+import json
+import math
+
+import numpy as np
+
+from plan import passes
+
+REPORT_FORMATS = ("text", "json", "csv")
+TRANSCRIPT_FORMATS = ("text", "jsonl", "csv")
+
+CSV_FIELDS = ("level", "code", "title", "parent", "average", "credits", "passed")
+
+
+def _incomplete(average):
+    return average is None or math.isnan(average)
+
+
+def _status(average, passed, eliminated=False):
+    if _incomplete(average):
+        return "⚠ INCOMPLETE"
+    if eliminated:
+        return "✗ ELIMINATED"
+    return "✓ PASS" if passed else "✗ FAIL"
+
+
+def _passed(average, eliminated):
+    """Passed at the pass mark and not failed on an eliminatory grade."""
+    return bool(passes(average) and not eliminated)
+
+
+def _score(average):
+    """Average as shown in text reports, '--' while incomplete."""
+    return "--" if _incomplete(average) else f"{average:.2f}"
+
+
+def _average(value):
+    """Average as stored in result trees and JSON: None while incomplete."""
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _rounded(value):
+    value = _average(value)
+    return None if value is None else round(value, 4)
+
+
+def _fixed(value):
+    return "" if math.isnan(value) else f"{value:.4f}"
+
+
+def _results(element, index):
+    """(average, credits, eliminated) of an element, for the student at index in cohort mode."""
+    results = element.calculate_average(), element.calculate_credits(), element.eliminated()
+    if index is not None:
+        # Cached per-student arrays; an element without eliminatory grade below has a plain False
+        results = tuple(value[index] if np.ndim(value) else value for value in results)
+    average, credits, eliminated = results
+    return float(average), int(credits), bool(eliminated)
+
+
+def _element_node(element, index):
+    average, credits, eliminated = _results(element, index)
+    return {
+        "code": element.name,
+        "title": element.title,
+        "average": _average(average),
+        "credits": credits,
+        "passed": _passed(average, eliminated),
+        "eliminated": eliminated,
+    }
+
+
+def _semester_node(semester, index):
+    units = []
+    for unit in semester._units:
+        node = _element_node(unit, index)
+        node["required"] = int(unit.required_credits())
+        node["modules"] = [_element_node(module, index) for module in unit._modules]
+        units.append(node)
+    node = _element_node(semester, index)
+    node["required"] = int(semester.required_credits())
+    node["units"] = units
+    return node
+
+
+def _rollup_node(element, index, children_key, children):
+    """Node of a year or diploma, passed once every required credit is earned."""
+    node = _element_node(element, index)
+    node["required"] = int(element.required_credits())
+    node["passed"] = node["credits"] >= node["required"]
+    node[children_key] = children
+    return node
+
+
+def _node(element, index):
+    # Dispatch on the children list each level keeps
+    if hasattr(element, "_years"):
+        return _rollup_node(element, index, "years", [_node(year, index) for year in element._years])
+    if hasattr(element, "_semesters"):
+        return _rollup_node(element, index, "semesters",
+                            [_node(semester, index) for semester in element._semesters])
+    return _semester_node(element, index)
+
+
+def build_result_tree(roots, index=None):
+    """Compute every average and credit once into a plain nested structure.
+
+    roots are semesters, or the years and diplomas containing them. Each
+    semester is a dict with code, title, average, credits, required (the
+    credits it awards in full), passed, eliminated and units; units carry the
+    same keys plus modules. An element failed on an eliminatory grade below
+    it is never passed. Years carry semesters and diplomas years; both count
+    as passed once all their credits are earned. The average is None while a
+    grade that counts is missing.
+
+    In cohort mode, index selects the student (cohort row) whose results
+    are taken from the cached per-student aggregates.
+    """
+    return [_node(root, index) for root in roots]
+
+
+def _walk(tree, parent=""):
+    """Yield (level, node, parent code) for every diploma, year and semester, parents first."""
+    for node in tree:
+        if "years" in node:
+            yield "diploma", node, parent
+            yield from _walk(node["years"], node["code"])
+        elif "semesters" in node:
+            yield "year", node, parent
+            yield from _walk(node["semesters"], node["code"])
+        else:
+            yield "semester", node, parent
+
+
+def _banner(title):
+    return ["", "=" * 60, title, "=" * 60]
+
+
+def structure_lines(tree):
+    """Text lines of the detailed structure report."""
+    semesters = [node for level, node, _ in _walk(tree) if level == "semester"]
+    lines = _banner("GSI ACADEMIC STRUCTURE - " + " / ".join(node["title"].upper() for node in semesters))
+    for level, node, _ in _walk(tree):
+        lines.append(f"\n{node['title']} ({node['code']}):")
+        label = level.capitalize()
+        lines.append(f"  {label} Average: {_score(node['average'])}/20")
+        lines.append(f"  {label} Credits: {node['credits']}/{node['required']}")
+        for unit in node.get("units", ()):
+            lines.append(f"\n    {unit['title']} ({unit['code']}):")
+            lines.append(f"      Unit Average: {_score(unit['average'])}/20")
+            lines.append(f"      Unit Credits: {unit['credits']}")
+            for module in unit["modules"]:
+                lines.append(f"        - {module['title']}: {_score(module['average'])}/20 "
+                             f"(Credits: {module['credits']}) "
+                             f"{_status(module['average'], module['passed'], module['eliminated'])}")
+    return lines
+
+
+# Result line of a passed and of a failed element, per level
+_OUTCOMES = {
+    "semester": ("Student has passed the semester", "Student must repeat the semester"),
+    "year": ("Student has validated the year", "Student must repeat the year"),
+    "diploma": ("Diploma awarded", "Diploma not awarded yet"),
+}
+
+
+def summary_lines(tree):
+    """Text lines of the results summary, per diploma, year and semester."""
+    lines = _banner("STUDENT ACADEMIC RESULTS SUMMARY")
+    semesters = []
+    for level, node, _ in _walk(tree):
+        lines.append(f"\n{node['title']}:")
+        lines.append(f"  Average: {_score(node['average'])}/20")
+        lines.append(f"  Credits Obtained: {node['credits']}/{node['required']}")
+        lines.append(f"  Status: {_status(node['average'], node['passed'], node['eliminated'])}")
+        if _incomplete(node["average"]):
+            lines.append(f"  Result: Grades are still missing for the {level}")
+        else:
+            lines.append(f"  Result: {_OUTCOMES[level][0 if node['passed'] else 1]}")
+        if level == "semester":
+            semesters.append(node)
+    for node in semesters:
+        lines.append(f"\nNOTE: Total credits for {node['title']} should be {node['required']}")
+    return lines
+
+
+def write_lines(lines, out):
+    """Write lines to out in a single call."""
+    out.write("\n".join(lines) + "\n")
+
+
+def _flatten(tree):
+    """Yield one CSV record per diploma, year, semester, unit and module."""
+    for level, semester, parent in _walk(tree):
+        yield (level, semester["code"], semester["title"], parent,
+               semester["average"], semester["credits"], semester["passed"])
+        for unit in semester.get("units", ()):
+            yield ("unit", unit["code"], unit["title"], semester["code"],
+                   unit["average"], unit["credits"], unit["passed"])
+            for module in unit["modules"]:
+                yield ("module", module["code"], module["title"], unit["code"],
+                       module["average"], module["credits"], module["passed"])
+
+
+def render(tree, out, fmt="text"):
+    """Render a result tree to a text stream as text, json or csv."""
+    if fmt == "text":
+        write_lines(structure_lines(tree) + summary_lines(tree), out)
+    elif fmt == "json":
+        json.dump(tree, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(_flatten(tree))
+    else:
+        raise ValueError(f"Unknown report format: {fmt} (expected one of {REPORT_FORMATS})")
+
+
+def _transcript_text(student_id, evaluated, index):
+    lines = [f"Student {student_id}"]
+    for semester, plan, result in evaluated:
+        average, eliminated = result.average[index], result.eliminated[index]
+        lines.append(f"  {semester.title} ({semester.name}): {_score(average)}/20, "
+                     f"Credits: {int(result.credits[index])} "
+                     f"{_status(average, _passed(average, eliminated), eliminated)}")
+        for u, unit_code in enumerate(plan.unit_codes):
+            lines.append(f"    {unit_code}: {_score(result.unit_averages[u, index])}/20, "
+                         f"Credits: {int(result.unit_credits[u, index])}")
+        for m, module_code in enumerate(plan.module_codes):
+            module_average = result.module_averages[m, index]
+            eliminated = result.module_eliminated is not None and result.module_eliminated[m, index]
+            lines.append(f"      {module_code}: {_score(module_average)}/20 "
+                         f"(Credits: {int(result.module_credits[m, index])}) "
+                         f"{_status(module_average, _passed(module_average, eliminated), eliminated)}")
+    return "\n".join(lines) + "\n"
+
+
+def _transcript_json(student_id, evaluated, index):
+    semesters = []
+    for semester, plan, result in evaluated:
+        semesters.append({
+            "code": semester.name,
+            "average": _rounded(result.average[index]),
+            "credits": int(result.credits[index]),
+            "units": {code: _rounded(result.unit_averages[u, index])
+                      for u, code in enumerate(plan.unit_codes)},
+            "modules": {code: _rounded(result.module_averages[m, index])
+                        for m, code in enumerate(plan.module_codes)},
+        })
+    return json.dumps({"student_id": student_id, "semesters": semesters}, ensure_ascii=False) + "\n"
+
+
+def _transcript_csv_rows(student_id, evaluated, index):
+    for semester, plan, result in evaluated:
+        yield (student_id, "semester", semester.name, _fixed(result.average[index]),
+               int(result.credits[index]))
+        for u, code in enumerate(plan.unit_codes):
+            yield (student_id, "unit", code, _fixed(result.unit_averages[u, index]),
+                   int(result.unit_credits[u, index]))
+        for m, code in enumerate(plan.module_codes):
+            yield (student_id, "module", code, _fixed(result.module_averages[m, index]),
+                   int(result.module_credits[m, index]))
+
+
+def write_transcripts(semesters, cohort, out, fmt="text", chunk_size=1000):
+    """Stream one transcript per cohort student to out.
+
+    Every semester is evaluated once through its compiled plan; transcripts
+    are then rendered and written chunk_size students at a time, so only one
+    chunk of text is ever held in memory.
+    """
+    if fmt not in TRANSCRIPT_FORMATS:
+        raise ValueError(f"Unknown transcript format: {fmt} (expected one of {TRANSCRIPT_FORMATS})")
+    evaluated = [(semester, semester.compile(), semester.compile().evaluate_cohort(cohort))
+                 for semester in semesters]
+
+    writer = None
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(("student_id", "level", "code", "average", "credits"))
+
+    render_one = _transcript_text if fmt == "text" else _transcript_json
+    student_ids = cohort.student_ids
+    for start in range(0, len(student_ids), chunk_size):
+        stop = min(start + chunk_size, len(student_ids))
+        if writer is not None:
+            writer.writerows(row for index in range(start, stop)
+                             for row in _transcript_csv_rows(student_ids[index], evaluated, index))
+        else:
+            out.write("".join(render_one(student_ids[index], evaluated, index)
+                              for index in range(start, stop)))
+    return len(student_ids)
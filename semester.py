@@ -1,30 +1,57 @@
-from academicelement import AcademicElement
+from academicelement import AcademicElement, cached_aggregate, cached_cohort_result, cached_structure
+from instrumentation import instrumented
+from plan import SemesterPlan
 
 class Semester(AcademicElement):
     """Represents an academic semester containing multiple units."""
 
+    __slots__ = ("_units",)
+
     def __init__(self, name, title, units=None):
         super().__init__(name, title)
-        self._units = units if units is not None else []
-        self.coef = 1
+        self._units = []
+        self._coef = 1
+        for unit in units or []:
+            self.add_unit(unit)
 
     def add_unit(self, unit):
         """Add a unit to the semester."""
         self._units.append(unit)
+        self._adopt(unit)
+
+    # Generic entry point used by the hierarchy builder
+    add_child = add_unit
+
+    def children(self):
+        return self._units
 
+    @cached_aggregate
+    @instrumented("Semester.calculate_average")
     def calculate_average(self):
-        """Calculate semester average from unit averages."""
+        """Calculate semester average from unit averages (NaN while one is incomplete)."""
         if not self._units:
             return 0
-        total = sum(unit.calculate_average() * unit.coef for unit in self._units)
+        total = sum(unit.calculate_average() * unit.coef for unit in self._units if unit.coef)
         coef_sum = sum(unit.coef for unit in self._units)
         return total / coef_sum if coef_sum != 0 else 0
 
+    @cached_aggregate
+    @instrumented("Semester.calculate_credits")
     def calculate_credits(self):
-        """Calculate total credits earned in the semester."""
+        """Calculate total credits earned in the semester, all of them when its average compensates."""
         if not self._units:
             return 0
-        return sum(unit.calculate_credits() for unit in self._units)
+        return self._compensate(sum(unit.calculate_credits() for unit in self._units))
+
+    @cached_structure
+    def compile(self):
+        """Return the linear evaluation plan, recompiled after structural changes."""
+        return SemesterPlan.compile(self)
+
+    @cached_cohort_result
+    def evaluate_cohort(self, cohort):
+        """SemesterResult of every cohort student, kept until a grade of the semester changes."""
+        return self.compile().evaluate_cohort(cohort)
 
     def display_units(self):
         """Display all units in this semester."""
@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from main import GSIAcademicManager
+from plan import result_status
+
+DEFAULT_CACHE_SIZE = 100_000
+
+
+class GradeService:
+    """Answer grade queries for a loaded cohort over a JSON-lines protocol.
+
+    Each request is one JSON object per line, answered by one JSON line:
+
+        {"op": "result", "student": "S1", "semester": "S1"}
+        {"op": "set_grade", "student": "S1", "module": "F111", "exam": 14}
+        {"op": "stats"}
+
+    Per-student semester results are kept in an LRU cache; a grade update
+    drops the cached results of that student only.
+    """
+
+    def __init__(self, manager, cache_size=DEFAULT_CACHE_SIZE):
+        self.manager = manager
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._plans = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _plan(self, semester_code):
+        """Compiled plan of a semester and its module slots in the cohort."""
+        plan = self.manager.semesters[semester_code].compile()
+        cached = self._plans.get(semester_code)
+        if cached is None or cached[0] is not plan:
+            if cached is not None:
+                # The structure changed: every cached result may be stale
+                self._cache.clear()
+            slots = np.array([self.manager.cohort.slot(code) for code in plan.module_codes], dtype=np.intp)
+            cached = self._plans[semester_code] = (plan, slots)
+        return cached
+
+    def result(self, student_id, semester_code):
+        """Average, credits and status of one student in one semester."""
+        plan, slots = self._plan(semester_code)
+        key = (student_id, semester_code)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        cohort = self.manager.cohort
+        grades = cohort.grades[slots, cohort.row(student_id)][:, None, :]
+        evaluated = plan.evaluate(grades)
+        average = float(evaluated.average[0])
+        result = {
+            "student": student_id,
+            "semester": semester_code,
+            "average": None if average != average else round(average, 4),
+            "credits": int(evaluated.credits[0]),
+            "status": result_status(average, bool(evaluated.eliminated[0])),
+        }
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def set_grade(self, student_id, module_code, tp=None, td=None, exam=None, resit=None):
+        """Apply a grade update and invalidate the student's cached results."""
+        self.manager.set_student_grade(student_id, module_code, tp=tp, td=td, exam=exam, resit=resit)
+        for semester_code in self.manager.semesters:
+            self._cache.pop((student_id, semester_code), None)
+
+    def stats(self):
+        return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def handle(self, request):
+        """Answer one decoded request; errors are reported, never raised."""
+        try:
+            op = request.get("op")
+            if op == "result":
+                return {"ok": True, **self.result(request["student"], request["semester"])}
+            if op == "set_grade":
+                self.set_grade(request["student"], request["module"],
+                               tp=request.get("tp"), td=request.get("td"), exam=request.get("exam"),
+                               resit=request.get("resit"))
+                return {"ok": True}
+            if op == "stats":
+                return {"ok": True, **self.stats()}
+            return {"ok": False, "error": f"unknown op: {op}"}
+        except KeyError as error:
+            return {"ok": False, "error": f"unknown or missing key: {error.args[0]}"}
+        except (TypeError, ValueError) as error:
+            return {"ok": False, "error": str(error)}
+
+    async def _serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as error:
+                    response = {"ok": False, "error": f"invalid JSON: {error}"}
+                else:
+                    if isinstance(request, dict):
+                        response = self.handle(request)
+                    else:
+                        response = {"ok": False, "error": "request must be a JSON object"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Start listening on a TCP port, or on a Unix socket when unix_path is given."""
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self._serve_client, path=unix_path)
+        return await asyncio.start_server(self._serve_client, host, port)
+
+
+async def serve(manager, host="127.0.0.1", port=8765, unix_path=None, cache_size=DEFAULT_CACHE_SIZE):
+    """Run a GradeService until cancelled."""
+    server = await GradeService(manager, cache_size).start(host, port, unix_path)
+    where = unix_path or "%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"✓ Grade service listening on {where}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve GSI grade queries over a local socket.")
+    parser.add_argument("--csv", default="gsi_curriculum.csv", help="curriculum CSV file")
+    parser.add_argument("--snapshot", help="snapshot file used to start instantly (see save_snapshot)")
+    parser.add_argument("--grades", help="grade export to load into the cohort")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        manager = GSIAcademicManager.load_cached(args.csv, args.snapshot)
+    else:
+        manager = GSIAcademicManager()
+        manager = manager if manager.load_from_csv(args.csv) else None
+    if manager is None:
+        return 1
+    if args.grades:
+        manager.load_grades_csv(args.grades)
+    if manager.cohort is None:
+        manager.enable_cohort([])
+
+    try:
+        asyncio.run(serve(manager, args.host, args.port, args.unix, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
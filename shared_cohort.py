@@ -0,0 +1,97 @@
+import sys
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cohort import Cohort
+
+SharedGrades = namedtuple("SharedGrades", ["name", "shape", "dtype"])
+SharedGrades.__doc__ = """Picklable reference to a grade array in shared memory."""
+
+CohortHandle = namedtuple("CohortHandle", ["grades", "student_ids", "module_codes"])
+CohortHandle.__doc__ = """Picklable description of a shared cohort: its grade block and its layout."""
+
+ManagerHandle = namedtuple("ManagerHandle", ["rows", "cohort"])
+ManagerHandle.__doc__ = """Curriculum rows and shared cohort, enough to rebuild a manager in a worker."""
+
+# Blocks attached by this process, kept open for its lifetime: name -> (block, array)
+_attached = {}
+
+
+def _open(name):
+    if sys.version_info >= (3, 13):
+        # Only the creating process may unlink the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _as_array(block, shape, dtype):
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def create_shared(grades):
+    """Copy a grade array into a new shared memory block; returns (block, array)."""
+    grades = np.asarray(grades)
+    block = shared_memory.SharedMemory(create=True, size=max(grades.nbytes, 1))
+    array = _as_array(block, grades.shape, grades.dtype)
+    array[...] = grades
+    return block, array
+
+
+def attach_grades(shared):
+    """Map a shared grade array into this process without copying it."""
+    attached = _attached.get(shared.name)
+    if attached is None:
+        block = _open(shared.name)
+        attached = _attached[shared.name] = (block, _as_array(block, shared.shape, shared.dtype))
+    return attached[1]
+
+
+def is_shared(cohort):
+    """Whether the cohort's grades currently live in its shared memory block."""
+    block = cohort._buffer
+    return block is not None and np.shares_memory(cohort._grades, _as_array(block, (block.size,), np.uint8))
+
+
+def share(cohort):
+    """Move the grades of a cohort into shared memory and return its handle.
+
+    The cohort keeps working as before on the shared block, so workers
+    attached to the handle see every later grade update. Adding students
+    moves the grades back to private memory (share again to publish them);
+    call release() when done.
+    """
+    if not is_shared(cohort):
+        release(cohort)
+        cohort._buffer, cohort._grades = create_shared(cohort.grades)
+    return handle(cohort)
+
+
+def handle(cohort):
+    """Handle of an already shared cohort."""
+    if not is_shared(cohort):
+        raise ValueError("Cohort grades are not in shared memory: call share() first")
+    return CohortHandle(SharedGrades(cohort._buffer.name, cohort._grades.shape, cohort._grades.dtype.str),
+                        cohort.student_ids, cohort.module_codes)
+
+
+def release(cohort):
+    """Copy the grades back to private memory and free the shared block."""
+    block = cohort._buffer
+    if block is None:
+        return
+    cohort._grades = np.array(cohort._grades)
+    cohort._buffer = None
+    block.unlink()
+    try:
+        block.close()
+    except BufferError:
+        # Views handed out earlier still use the mapping; it goes away with them
+        pass
+
+
+def attach(cohort_handle):
+    """Build a Cohort over the shared grades of a handle, without copying them."""
+    grades = attach_grades(cohort_handle.grades)
+    return Cohort.from_array(cohort_handle.student_ids, cohort_handle.module_codes, grades)
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from cohort import Cohort
+
+MAGIC = b"GSISNAP3"
+# Grade data starts on an aligned offset so it can be memory-mapped directly
+ALIGNMENT = 64
+
+Snapshot = namedtuple("Snapshot", ["rows", "cohort", "source_hash"])
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hash a file in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_snapshot(path, rows, cohort=None, source_hash=None):
+    """Write curriculum rows and cohort grades to a binary snapshot.
+
+    Layout: magic, little-endian uint64 header length, JSON header, padding,
+    then the raw C-ordered (modules, students, components) grade array.
+    """
+    header = {"source_hash": source_hash, "rows": rows, "cohort": None}
+    grades = None
+    if cohort is not None:
+        grades = np.ascontiguousarray(cohort.grades)
+        header["cohort"] = {
+            "student_ids": cohort.student_ids,
+            "module_codes": cohort.module_codes,
+            "dtype": grades.dtype.str,
+            "shape": list(grades.shape),
+        }
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix_size = len(MAGIC) + 8 + len(header_bytes)
+    padding = -prefix_size % ALIGNMENT
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", len(header_bytes) + padding))
+        file.write(header_bytes)
+        file.write(b' ' * padding)
+        if grades is not None:
+            file.write(grades.tobytes())
+
+
+def read_snapshot(path):
+    """Read a snapshot; the cohort grades are a copy-on-write memory map."""
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a GSI snapshot")
+        (header_size,) = struct.unpack("<Q", file.read(8))
+        header = json.loads(file.read(header_size).decode('utf-8'))
+
+    cohort = None
+    layout = header["cohort"]
+    if layout is not None and 0 in layout["shape"]:
+        # Nothing to map: an empty cohort has no grade bytes on disk
+        cohort = Cohort(layout["student_ids"], layout["module_codes"])
+    elif layout is not None:
+        grades = np.memmap(path, dtype=np.dtype(layout["dtype"]), mode='c',
+                           offset=len(MAGIC) + 8 + header_size,
+                           shape=tuple(layout["shape"]))
+        cohort = Cohort.from_array(layout["student_ids"], layout["module_codes"], grades)
+    return Snapshot(header["rows"], cohort, header["source_hash"])
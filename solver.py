@@ -0,0 +1,66 @@
+from collections import namedtuple
+
+import numpy as np
+
+from cohort import GRADE_DTYPE, GRADE_SCALE, decode_grades
+from policies import EXAM
+from plan import PASS_MARK
+
+MAX_GRADE = 20
+ROUNDING_TOLERANCE = 1e-9
+
+RequiredExam = namedtuple("RequiredExam", ["modules", "units", "semester"])
+RequiredExam.__doc__ = """Minimum exam grade needed to reach the target, per student.
+
+modules (modules, students): exam grade needed in each module on its own,
+never below the module's eliminatory grade. Under a resit policy this is
+the exam grade that must count, whichever session it comes from.
+units (units, students) and semester (students,): the single exam grade
+that, obtained in every exam of the unit/semester, reaches the target.
+Grades are rounded up to the next quarter point, as they are stored.
+0 means the target is already reached whatever the exam grade; inf means it
+cannot be reached even with 20/20; NaN means a TP/TD grade is still missing.
+"""
+
+
+def solve_linear(constant, slope, target):
+    """Smallest quarter point x in [0, 20] with constant + slope * x >= target, vectorized."""
+    constant = np.asarray(constant, dtype=np.float64)
+    slope = np.broadcast_to(np.asarray(slope, dtype=np.float64), constant.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        needed = (target - constant) / slope
+    needed = np.where(slope > 0, needed, np.where(constant >= target, 0.0, np.inf))
+    # The tolerance keeps float noise on an exact quarter point from rounding up to the next one
+    needed = np.ceil(np.maximum(needed, 0.0) * GRADE_SCALE - ROUNDING_TOLERANCE) / GRADE_SCALE
+    return np.where(needed > MAX_GRADE, np.inf, needed)
+
+
+def required_exam_grades(plan, grades, target=PASS_MARK):
+    """Solve the exam grade each student needs, in closed form, for a whole cohort.
+
+    plan is a compiled SemesterPlan and grades its (modules, students,
+    components) block. Module averages are linear in the exam grade, with a
+    slope equal to the exam weight and an intercept given by the current
+    TP/TD grades; unit and semester averages are fixed combinations of those,
+    so every threshold is one division over arrays.
+    """
+    if grades.dtype == GRADE_DTYPE:
+        grades = decode_grades(grades)
+    exam = plan.module_weights[:, EXAM]
+    continuous_weights = plan.module_weights.copy()
+    continuous_weights[:, EXAM] = 0
+    # The exam grade is the unknown, and grades without weight do not count:
+    # only a missing TP/TD grade that counts leaves the result unknown
+    grades = np.where(continuous_weights[:, None, :] > 0, grades, 0)
+    # Average each module would have with a zero exam grade
+    continuous = np.einsum("mk,msk->ms", continuous_weights, grades)
+
+    semester_factors = plan.unit_factors @ plan.unit_matrix
+    modules = solve_linear(continuous, exam[:, None], target)
+    # An eliminatory grade between two quarter points needs the next one up
+    minimums = np.ceil(plan.minimums * GRADE_SCALE) / GRADE_SCALE
+    return RequiredExam(
+        np.maximum(modules, minimums[:, None]),
+        solve_linear(plan.unit_matrix @ continuous, (plan.unit_matrix @ exam)[:, None], target),
+        solve_linear(semester_factors @ continuous, semester_factors @ exam, target),
+    )
@@ -0,0 +1,242 @@
+import sqlite3
+from itertools import islice
+
+from grade_ingest import parse_chunks, read_chunks, validate_chunks
+from cohort import COMPONENTS
+from plan import PASS_MARK, PASS_TOLERANCE
+from policies import MAX_GRADE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS elements (
+    code TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    parent TEXT NOT NULL DEFAULT '',
+    coef REAL, credit INTEGER,
+    hours_lecture REAL, hours_td REAL, hours_tp REAL,
+    teaching_mode TEXT, continous_percent REAL, exam_percent REAL,
+    -- Evaluation policy of a module, or the rules of a "policy" row
+    policy TEXT, rules TEXT,
+    -- Compiled evaluation weights (modules only): module average from its
+    -- grades, and the module average's share in its unit and semester average
+    semester TEXT,
+    weight_tp REAL, weight_td REAL, weight_exam REAL,
+    unit_factor REAL, semester_factor REAL,
+    -- Compiled policy rules (modules only)
+    resit_mode TEXT, resit_cap REAL, minimum REAL
+);
+CREATE INDEX IF NOT EXISTS elements_parent ON elements(parent);
+
+CREATE TABLE IF NOT EXISTS grades (
+    student_id TEXT NOT NULL,
+    module_code TEXT NOT NULL,
+    tp REAL, td REAL, exam REAL, resit REAL,
+    PRIMARY KEY (student_id, module_code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grades_module ON grades(module_code, student_id);
+"""
+
+ELEMENT_COLUMNS = (
+    "code", "type", "title", "parent", "coef", "credit", "hours_lecture",
+    "hours_td", "hours_tp", "teaching_mode", "continous_percent", "exam_percent",
+    "policy", "rules",
+    "semester", "weight_tp", "weight_td", "weight_exam", "unit_factor", "semester_factor",
+    "resit_mode", "resit_cap", "minimum",
+)
+
+# Exam grade counted by the module's policy: the resit grade, capped, taken
+# when better (max) or whenever present (replace)
+RESIT_GRADE = f"MIN(g.resit, COALESCE(e.resit_cap, {MAX_GRADE}))"
+EXAM_GRADE = (f"(CASE e.resit_mode WHEN 'max' THEN COALESCE(MAX(g.exam, {RESIT_GRADE}), g.exam, {RESIT_GRADE})"
+              f" WHEN 'replace' THEN COALESCE({RESIT_GRADE}, g.exam) ELSE g.exam END)")
+
+# Module average of a grade row joined with its module's element row; NULL
+# (incomplete) when a component that counts has no grade
+MODULE_AVERAGE = ("(CASE WHEN e.weight_tp > 0 THEN g.tp ELSE 0 END * e.weight_tp"
+                  " + CASE WHEN e.weight_td > 0 THEN g.td ELSE 0 END * e.weight_td"
+                  f" + CASE WHEN e.weight_exam > 0 THEN {EXAM_GRADE} ELSE 0 END * e.weight_exam)")
+
+# Whether the module is passed: average reached, and no eliminatory exam grade
+MODULE_PASSED = (f"({MODULE_AVERAGE} >= {PASS_MARK - PASS_TOLERANCE}"
+                 f" AND (e.minimum IS NULL OR {EXAM_GRADE} >= e.minimum))")
+
+
+def _complete_average(factor, group):
+    """Weighted sum of module averages, NULL unless every counting module of the group has one."""
+    return (f"CASE WHEN SUM(e.{factor} > 0 AND {MODULE_AVERAGE} IS NOT NULL) = "
+            f"(SELECT COUNT(*) FROM elements m WHERE m.{group} = e.{group} AND m.{factor} > 0) "
+            f"THEN SUM({MODULE_AVERAGE} * e.{factor}) END")
+
+
+# Whether no module of the group was failed on an eliminatory exam grade
+NOT_ELIMINATED = f"COALESCE(SUM(e.minimum IS NOT NULL AND {EXAM_GRADE} < e.minimum), 0) = 0"
+
+
+def _required_credits(factor, group):
+    """Credits of every module of the group, awarded when its average compensates."""
+    return f"(SELECT SUM(m.credit) FROM elements m WHERE m.{group} = e.{group} AND m.{factor} IS NOT NULL)"
+
+
+# Unit results per student, with the semester of the unit: all the unit's
+# credits when its average reaches the pass mark (compensation)
+UNIT_RESULTS = (
+    f"SELECT g.student_id, e.semester, e.parent AS unit, {_complete_average('unit_factor', 'parent')} AS average, "
+    f"CASE WHEN {_complete_average('unit_factor', 'parent')} >= {PASS_MARK - PASS_TOLERANCE} AND {NOT_ELIMINATED} "
+    f"THEN {_required_credits('unit_factor', 'parent')} "
+    f"ELSE SUM(CASE WHEN {MODULE_PASSED} THEN e.credit ELSE 0 END) END AS credits "
+    f"FROM grades g JOIN elements e ON e.code = g.module_code "
+    f"WHERE e.unit_factor IS NOT NULL{{where}} GROUP BY g.student_id, e.parent"
+)
+
+
+# Existing components are kept when an upserted grade leaves them NULL
+UPSERT_GRADE = """
+INSERT INTO grades (student_id, module_code, tp, td, exam, resit) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (student_id, module_code) DO UPDATE SET
+    tp = COALESCE(excluded.tp, grades.tp),
+    td = COALESCE(excluded.td, grades.td),
+    exam = COALESCE(excluded.exam, grades.exam),
+    resit = COALESCE(excluded.resit, grades.resit)
+"""
+
+
+def _none_if_nan(value):
+    return None if value != value else value
+
+
+class SQLiteGradeStore:
+    """Persistent curriculum and per-student grades in a local SQLite file.
+
+    Aggregates are pushed into SQL: every module row carries its compiled
+    evaluation weights and its share of the unit and semester averages, so
+    unit and semester averages are single GROUP BY queries over the grades.
+    As in the object model, a missing grade that counts makes the module
+    average NULL (incomplete), and a unit or semester is incomplete while
+    one of its modules is, or has no grade row at all.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save_curriculum(self, rows):
+        """Replace the curriculum with rows from GSIAcademicManager.curriculum_rows()."""
+        with self.connection:
+            self.connection.execute("DELETE FROM elements")
+            self.connection.executemany(
+                f"INSERT INTO elements ({', '.join(ELEMENT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(ELEMENT_COLUMNS))})",
+                (tuple(row.get(column) for column in ELEMENT_COLUMNS) for row in rows),
+            )
+
+    def curriculum_rows(self):
+        """Return the stored curriculum as rows accepted by the manager."""
+        cursor = self.connection.execute(f"SELECT {', '.join(ELEMENT_COLUMNS)} FROM elements ORDER BY rowid")
+        return [dict(zip(ELEMENT_COLUMNS, values)) for values in cursor]
+
+    def insert_grades(self, records, batch_size=50_000):
+        """Upsert (student_id, module_code, tp, td, exam[, resit]) records in batched transactions.
+
+        None (or NaN) components leave the stored value unchanged.
+        Returns the number of records written.
+        """
+        records = iter(records)
+        written = 0
+        while True:
+            batch = [
+                (sid, code, *map(_none_if_nan, values), *(None,) * (len(COMPONENTS) - len(values)))
+                for sid, code, *values in islice(records, batch_size)
+            ]
+            if not batch:
+                return written
+            with self.connection:
+                self.connection.executemany(UPSERT_GRADE, batch)
+            written += len(batch)
+
+    def import_grades_csv(self, csv_file, chunk_size=50_000):
+        """Stream a grade export into the database; returns (accepted, rejected)."""
+        module_codes = [code for (code,) in self.connection.execute(
+            "SELECT code FROM elements WHERE type = 'module'")]
+        counters = {"rejected": 0}
+        accepted = 0
+        for chunk in validate_chunks(parse_chunks(read_chunks(csv_file, chunk_size)),
+                                     module_codes, counters):
+            accepted += self.insert_grades(
+                (sid, code, *values)
+                for sid, code, values in zip(chunk.student_ids, chunk.module_codes, chunk.values.tolist())
+            )
+        return accepted, counters["rejected"]
+
+    def grade_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM grades").fetchone()[0]
+
+    def student_ids(self):
+        """Iterate over distinct student ids, in index order."""
+        for (student_id,) in self.connection.execute("SELECT DISTINCT student_id FROM grades ORDER BY student_id"):
+            yield student_id
+
+    def grades_for(self, student_ids):
+        """Yield (student_id, module_code, tp, td, exam, resit) for the given students only."""
+        student_ids = list(student_ids)
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(student_ids), 500):
+            batch = student_ids[start:start + 500]
+            yield from self.connection.execute(
+                f"SELECT student_id, module_code, tp, td, exam, resit FROM grades "
+                f"WHERE student_id IN ({', '.join('?' * len(batch))})", batch)
+
+    def _student_filter(self, student_id):
+        if student_id is None:
+            return "", ()
+        return " AND g.student_id = ?", (student_id,)
+
+    def module_results(self, student_id=None, module_code=None):
+        """Return (student_id, module_code, average, credits) rows."""
+        where, params = self._student_filter(student_id)
+        if module_code is not None:
+            where += " AND g.module_code = ?"
+            params += (module_code,)
+        return self.connection.execute(
+            f"SELECT g.student_id, g.module_code, {MODULE_AVERAGE} AS average, "
+            f"CASE WHEN {MODULE_PASSED} THEN e.credit ELSE 0 END "
+            f"FROM grades g JOIN elements e ON e.code = g.module_code WHERE 1{where} "
+            f"ORDER BY g.student_id, g.module_code", params).fetchall()
+
+    def unit_results(self, student_id=None):
+        """Return (student_id, unit_code, average, credits) rows."""
+        where, params = self._student_filter(student_id)
+        return self.connection.execute(
+            f"SELECT student_id, unit, average, credits FROM ({UNIT_RESULTS.format(where=where)}) "
+            f"ORDER BY student_id, unit", params).fetchall()
+
+    def semester_results(self, student_id=None, semester_code=None):
+        """Return (student_id, semester_code, average, credits) rows.
+
+        Credits are those of the units, or all of the semester's when its
+        average compensates.
+        """
+        where, params = self._student_filter(student_id)
+        if semester_code is not None:
+            where += " AND e.semester = ?"
+            params += (semester_code,)
+        return self.connection.execute(
+            f"SELECT s.student_id, s.semester, s.average, "
+            f"CASE WHEN s.average >= {PASS_MARK - PASS_TOLERANCE} AND s.complete THEN s.required ELSE u.credits END "
+            f"FROM (SELECT g.student_id, e.semester, "
+            f"{_complete_average('semester_factor', 'semester')} AS average, {NOT_ELIMINATED} AS complete, "
+            f"{_required_credits('semester_factor', 'semester')} AS required "
+            f"FROM grades g JOIN elements e ON e.code = g.module_code "
+            f"WHERE e.semester_factor IS NOT NULL{where} GROUP BY g.student_id, e.semester) s "
+            f"JOIN (SELECT student_id, semester, SUM(credits) AS credits "
+            f"FROM ({UNIT_RESULTS.format(where=where)}) GROUP BY student_id, semester) u "
+            f"USING (student_id, semester) ORDER BY s.student_id, s.semester", params + params).fetchall()
@@ -0,0 +1,90 @@
+import csv
+import random
+
+import numpy as np
+
+from cohort import encode_grades
+
+CURRICULUM_FIELDS = (
+    "type", "code", "title", "coef", "credit", "hours_lecture", "hours_td",
+    "hours_tp", "teaching_mode", "continous_percent", "exam_percent", "parent",
+)
+
+GRADE_FIELDS = ("student_id", "module_code", "tp", "td", "exam")
+
+
+def synthetic_curriculum_rows(semesters, units, modules, seed=0):
+    """Yield curriculum rows for semesters x units x modules elements.
+
+    Units and modules are emitted before their parents, as in the GSI file.
+    Module hours cycle through lecture-only, TD, TP and TD+TP layouts.
+    """
+    rng = random.Random(seed)
+    layouts = ((0, 0), (1.5, 0), (0, 1.5), (1.5, 1.5))
+    semester_rows = []
+    for s in range(1, semesters + 1):
+        semester_code = f"S{s}"
+        unit_rows = []
+        for u in range(1, units + 1):
+            unit_code = f"U{s}_{u}"
+            for m in range(1, modules + 1):
+                hours_td, hours_tp = layouts[(u + m) % len(layouts)]
+                continous = rng.choice((30, 40, 50))
+                yield {
+                    "type": "module", "code": f"M{s}_{u}_{m}",
+                    "title": f"Module {s}.{u}.{m}",
+                    "coef": rng.randint(1, 4), "credit": rng.randint(1, 6),
+                    "hours_lecture": 1.5, "hours_td": hours_td, "hours_tp": hours_tp,
+                    "teaching_mode": "In-person",
+                    "continous_percent": continous, "exam_percent": 100 - continous,
+                    "parent": unit_code,
+                }
+            unit_rows.append(_container_row("unit", unit_code, f"Unit {s}.{u}", semester_code))
+        yield from unit_rows
+        semester_rows.append(_container_row("semester", semester_code, f"Semester {s}", ""))
+    yield from semester_rows
+
+
+def _container_row(element_type, code, title, parent):
+    return {
+        "type": element_type, "code": code, "title": title, "coef": 0, "credit": 0,
+        "hours_lecture": 0, "hours_td": 0, "hours_tp": 0, "teaching_mode": "In-person",
+        "continous_percent": 0, "exam_percent": 0, "parent": parent,
+    }
+
+
+def write_synthetic_curriculum(path, semesters, units, modules, seed=0):
+    """Write a synthetic curriculum CSV and return the list of module codes."""
+    module_codes = []
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CURRICULUM_FIELDS)
+        writer.writeheader()
+        for row in synthetic_curriculum_rows(semesters, units, modules, seed):
+            if row["type"] == "module":
+                module_codes.append(row["code"])
+            writer.writerow(row)
+    return module_codes
+
+
+def synthetic_student_ids(students):
+    """Return deterministic student ids."""
+    return [f"STU{i:07d}" for i in range(students)]
+
+
+def write_synthetic_grades(path, module_codes, students, seed=0):
+    """Write a student_id,module_code,tp,td,exam export with random quarter-point grades."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(GRADE_FIELDS)
+        for student_id in synthetic_student_ids(students):
+            for code in module_codes:
+                writer.writerow((student_id, code,
+                                 rng.randint(0, 80) / 4, rng.randint(0, 80) / 4, rng.randint(0, 80) / 4))
+
+
+def fill_random_grades(cohort, seed=0):
+    """Fill every grade of a cohort with random quarter-point values."""
+    rng = np.random.default_rng(seed)
+    cohort.grades[...] = encode_grades(rng.integers(0, 81, cohort.grades.shape) / 4)
+    cohort.invalidate()
@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from main import GSIAcademicManager
+from bulk_csv import parse_curriculum
+from test_grade_ingest import write_temp_csv
+from test_plan import CURRICULUM_CSV
+
+HEADER = "type,code,title,coef,credit,hours_lecture,hours_td,hours_tp,teaching_mode,continous_percent,exam_percent,parent\n"
+
+def test_curriculum_problems_collected():
+    """Test that every curriculum problem is reported in one pass"""
+    path = write_temp_csv(
+        HEADER
+        + "module,M1,Good,2,4,1.5,1.5,0,In-person,40,60,U1\n"
+        + "module,M2,Bad sum,2,4,1.5,0,0,In-person,40,50,U1\n"
+        + "module,M3,Negative,2,4,-1,0,0,In-person,40,60,U1\n"
+        + "\n"
+        + "module,M4,Mode,2,4,1.5,0,0,By post,40,60,U1\n"
+        + "module,M1,Duplicate,x,4,1.5,0,0,In-person,40,60,U1\n"
+        + "unit,U1,Unit,0,0,0,0,0,In-person,0,0,S1\n"
+        + "semester,S1,Semester,0,0,0,0,0,In-person,0,0,\n"
+    )
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path) is False
+        assert not manager.modules
+        _, report = parse_curriculum(path)
+    finally:
+        os.remove(path)
+
+    found = {(problem.line, problem.column) for problem in report.problems}
+    assert found == {(3, "exam_percent"), (4, "hours_lecture"), (6, "teaching_mode"),
+                     (7, "coef"), (7, "code")}
+    assert report.rows == 7
+    print("✓ Curriculum validation test passed")
+
+def test_bulk_load_types_and_grade_report():
+    """Test typed module fields and the grade file report"""
+    manager = GSIAcademicManager()
+    assert manager.load_from_csv(CURRICULUM_CSV)
+    assert manager.validation_report.ok
+    module = manager.modules["F111"]
+    assert (module.coef, module.credit, module.evaluation_exam_percent) == (3, 6, 60)
+    assert isinstance(module.coef, int) and module.hours_td == 1.5
+
+    path = write_temp_csv(
+        "student_id,module_code,tp,td,exam\n"
+        "S1,F111,12,14,10\n"
+        "S1,NOPE,1,2,3\n"
+        ",F111,21,abc,\n"
+    )
+    try:
+        report = manager.validate_grades_csv(path)
+    finally:
+        os.remove(path)
+    assert report.rows == 3
+    assert [(p.line, p.column) for p in report.problems] == [
+        (3, "module_code"), (4, "student_id"), (4, "tp"), (4, "td")]
+    print("✓ Bulk load and grade report test passed")
+
+if __name__ == "__main__":
+    test_curriculum_problems_collected()
+    test_bulk_load_types_and_grade_report()
+    print("All bulk CSV tests passed! ")
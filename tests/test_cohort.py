@@ -0,0 +1,133 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from cohort import Cohort, MISSING, encode_grades, decode_grades
+from module import Module
+from unit import Unit
+from semester import Semester
+from test_plan import build_cohort_manager
+
+def build_cohort_semester(student_ids):
+    """Build a one-unit semester whose modules share a cohort"""
+    module1 = Module("TEST1", "Test Module 1", coef=2, credit=3, hours_tp=1.5)
+    module2 = Module("TEST2", "Test Module 2", coef=1, credit=2, hours_td=1.5)
+    cohort = Cohort(student_ids, ["TEST1", "TEST2"])
+    module1.bind_cohort(cohort)
+    module2.bind_cohort(cohort)
+    unit = Unit("UTEST", "Test Unit")
+    unit.add_module(module1)
+    unit.add_module(module2)
+    semester = Semester("S1", "Semester 1")
+    semester.add_unit(unit)
+    return cohort, module1, module2, semester
+
+def test_cohort_module_average_matches_single_student():
+    """Test that cohort averages equal the per-student computation"""
+    cohort, module1, _, _ = build_cohort_semester(["A", "B"])
+    module1.set_grade(tp=16, exam=14, student="A")
+    module1.set_grade(tp=5, exam=5, student="B")
+
+    single = Module("TEST1", "Test Module 1", coef=2, credit=3, hours_tp=1.5)
+    single.set_grade(tp=16, exam=14)
+
+    averages = module1.calculate_average()
+    assert averages.shape == (2,)
+    assert abs(averages[0] - single.calculate_average()) < 1e-9
+    assert list(module1.calculate_credits()) == [3, 0]
+    print("✓ Cohort module average test passed")
+
+def test_cohort_semester_vectors():
+    """Test that unit and semester aggregation return one value per student"""
+    cohort, module1, module2, semester = build_cohort_semester(["A", "B", "C"])
+    for student in ("A", "B", "C"):
+        module1.set_grade(tp=12, exam=12, student=student)
+        module2.set_grade(td=15, exam=15, student=student)
+    module2.set_grade(td=2, exam=2, student="C")
+
+    assert list(semester.calculate_credits()) == [5, 5, 3]
+    assert semester.calculate_average().shape == (3,)
+    print("✓ Cohort semester vector test passed")
+
+def test_cohort_requires_student():
+    """Test that cohort-mode modules refuse grades without a student"""
+    _, module1, _, _ = build_cohort_semester(["A"])
+    try:
+        module1.set_grade(exam=12)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("✓ Cohort student requirement test passed")
+
+def test_cohort_add_students_keeps_grades():
+    """Test that growing the cohort preserves existing grades"""
+    cohort, module1, _, _ = build_cohort_semester(["A"])
+    module1.set_grade(tp=11, exam=13, student="A")
+    cohort.add_students(["S%d" % i for i in range(100)])
+    assert len(cohort) == 101
+    grades = cohort.student_grades("A", "TEST1")
+    assert (grades["tp"], grades["exam"]) == (11.0, 13.0)
+    assert np.isnan(grades["td"])
+    print("✓ Cohort growth test passed")
+
+def test_grade_encoding_round_trip():
+    """Test that grades are stored as quarter points with a missing sentinel"""
+    codes = encode_grades([12.3, float("nan"), 20, 0])
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [49, MISSING, 80, 0]
+    decoded = decode_grades(codes)
+    assert decoded[0] == 12.25 and np.isnan(decoded[1]) and decoded[2] == 20
+    print("✓ Grade encoding test passed")
+
+def test_out_of_range_grades_are_rejected():
+    """Test that grades outside 0-20 raise instead of wrapping around in a byte"""
+    for value in (21, 63.75, 64, 70, -1, float("inf")):
+        try:
+            encode_grades([12, value])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{value} was encoded")
+    assert encode_grades([0, 20, 19.9]).tolist() == [0, 80, 80]
+
+    manager = build_cohort_manager(n_students=3)
+    cohort = manager.cohort
+    before = cohort.grades.copy()
+    for write in (lambda: manager.modules["F111"].set_grade(exam=64, student="S1"),
+                  lambda: manager.set_student_grade("S1", "F111", tp=12, exam=-1)):
+        try:
+            write()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("out-of-range grade was stored")
+    assert np.array_equal(cohort.grades, before)
+    print("✓ Grade range test passed")
+
+def test_missing_grade_makes_results_incomplete():
+    """Test that a missing weighted grade propagates NaN up to the semester"""
+    manager = build_cohort_manager(n_students=5)
+    cohort = manager.cohort
+    cohort.grades[cohort.slot("F111"), cohort.row("S2"), 2] = MISSING
+    cohort.invalidate()
+
+    semester = manager.semesters["S1"]
+    result = semester.compile().evaluate_cohort(cohort)
+    assert np.isnan(manager.modules["F111"].calculate_average()[2])
+    assert np.isnan(result.average[2]) and np.isnan(semester.calculate_average()[2])
+    assert not np.isnan(result.average[[0, 1, 3, 4]]).any()
+    assert result.module_credits[0, 2] == 0
+    assert np.allclose(result.average[[0, 1, 3, 4]], semester.calculate_average()[[0, 1, 3, 4]])
+    print("✓ Incomplete result test passed")
+
+if __name__ == "__main__":
+    test_cohort_module_average_matches_single_student()
+    test_cohort_semester_vectors()
+    test_cohort_requires_student()
+    test_cohort_add_students_keeps_grades()
+    test_grade_encoding_round_trip()
+    test_out_of_range_grades_are_rejected()
+    test_missing_grade_makes_results_incomplete()
+    print("All cohort tests passed! ")
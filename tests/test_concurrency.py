@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from concurrency import ConcurrentManager, ReadWriteLock
+from events import grade_event
+from test_plan import build_cohort_manager
+
+def test_readers_share_writers_exclude():
+    """Test that readers overlap while a writer waits for them"""
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(3, timeout=5)
+    done_reading = threading.Event()
+    written = threading.Event()
+
+    def reader():
+        with lock.read():
+            both_reading.wait()
+            done_reading.wait(5)
+
+    def writer():
+        with lock.write():
+            written.set()
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    both_reading.wait()
+    writing = threading.Thread(target=writer)
+    writing.start()
+    time.sleep(0.05)
+    assert not written.is_set()
+    done_reading.set()
+    for thread in readers + [writing]:
+        thread.join(5)
+    assert written.is_set()
+    print("✓ Read-write lock test passed")
+
+def test_batches_are_never_half_applied():
+    """Test that concurrent readers only see whole grade batches"""
+    manager = build_cohort_manager(n_students=20, seed=8)
+    concurrent = ConcurrentManager(manager)
+    codes = list(manager.modules)
+    slots = [manager.cohort.slot(code) for code in codes]
+    row = manager.cohort.row("S0")
+
+    def write(value):
+        concurrent.apply_events(grade_event("S0", code, "exam", value) for code in codes)
+
+    def read(_):
+        with concurrent.read():
+            seen = set(manager.cohort.grades[slots, row, 2].tolist())
+        assert len(seen) == 1, seen
+        return concurrent.result("S0", "S1")["average"]
+
+    write(0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        writes = [executor.submit(write, value) for value in range(1, 21)]
+        list(executor.map(read, range(200)))
+        for future in writes:
+            future.result()
+    assert concurrent.rank("S1", "S0") >= 1
+    assert concurrent.statistics("F111")["count"] == 20
+    print("✓ Concurrent batch test passed")
+
+if __name__ == "__main__":
+    test_readers_share_writers_exclude()
+    test_batches_are_never_half_applied()
+    print("All concurrency tests passed! ")
@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from test_hierarchy import write_temp_csv
+from test_year import YEARS_CSV, build_years_manager
+
+def load_version(content):
+    """Load a curriculum version from CSV text"""
+    path = write_temp_csv(content)
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path)
+    finally:
+        os.remove(path)
+    return manager
+
+def with_grades_of(manager, old):
+    """Give a curriculum version the cohort grades of another one"""
+    cohort = manager.enable_cohort(old.cohort.student_ids)
+    for code in cohort.module_codes:
+        if code in old.cohort.module_codes:
+            cohort.grades[cohort.slot(code)] = old.cohort.grades[old.cohort.slot(code)]
+    cohort.invalidate()
+    return manager
+
+def changed_cells(old, new, registry, codes):
+    """(student, code) cells whose average or credits differ between two fully evaluated versions"""
+    cells = set()
+    for code in codes:
+        before, after = getattr(old, registry)[code], getattr(new, registry)[code]
+        differs = (before.calculate_credits() != after.calculate_credits()) | ~np.isclose(
+            before.calculate_average(), after.calculate_average(), rtol=0, atol=1e-9, equal_nan=True)
+        cells.update((student, code) for student in np.array(old.cohort.student_ids)[differs])
+    return cells
+
+def reported_cells(report, codes):
+    return {(delta.student, delta.code) for delta in report.deltas() if delta.code in codes}
+
+WEIGHT_CSV = (YEARS_CSV
+              .replace("module,A,Algebra,2,6", "module,A,Linear Algebra,3,6")
+              .replace("module,E,English,1,2,1.5,1.5,0,Online,40,60", "module,E,English,1,2,1.5,1.5,0,Online,20,80")
+              .replace("module,F,Finance,2,10,1.5,1.5,0,In-person", "module,F,Finance,2,10,1.5,1.5,0,Hybrid"))
+
+def test_changes_are_classified():
+    """Test that structural, weight and cosmetic changes are told apart"""
+    old = load_version(YEARS_CSV)
+    diff = old.compare_curriculum(load_version(WEIGHT_CSV))
+    assert [(c.code, c.kind, c.fields) for c in diff.changes] == [
+        ("A", "weight", ("title", "coef")),
+        ("E", "weight", ("continous_percent", "exam_percent")),
+        ("F", "cosmetic", ("teaching_mode",)),
+    ]
+    assert not diff.structural
+
+    moved = YEARS_CSV.replace("module,C,Chemistry,1,5,1.5,1.5,1.5,In-person,40,60,U12",
+                              "module,C,Chemistry,1,5,1.5,1.5,1.5,In-person,40,60,U11")
+    diff = old.compare_curriculum(load_version(moved + "module,G,Geology,1,3,1.5,0,0,In-person,40,60,U31\n"))
+    assert [(c.code, c.kind, c.fields) for c in diff.changes] == [
+        ("C", "structural", ("parent",)), ("G", "structural", ("added",))]
+    assert old.compare_curriculum(load_version(YEARS_CSV)).changes == []
+    print("✓ Change classification test passed")
+
+def test_weight_change_only_reevaluates_changed_modules():
+    """Test that a weight-only change re-evaluates only its modules and reports every changed result"""
+    old = build_years_manager(n_students=60, seed=1)
+    new = load_version(WEIGHT_CSV)
+    report = old.redeliberate(new)
+    assert report.recomputed == {"S1": ["A"], "S2": ["E"]}
+
+    full = with_grades_of(load_version(WEIGHT_CSV), old)
+    for registry, codes in (("modules", ["A", "E"]), ("units", ["U11", "U12", "U21"]),
+                            ("semesters", ["S1", "S2"]), ("years", ["Y1"]), ("diplomas", ["MGSI"])):
+        assert reported_cells(report, codes) == changed_cells(old, full, registry, codes), registry
+    assert reported_cells(report, ["S3", "Y2", "B", "C", "D"]) == set()
+    assert report.students and set(report.students) <= set(old.cohort.student_ids)
+
+    delta = next(delta for delta in report.deltas() if delta.code == "S1")
+    row = old.cohort.row(delta.student)
+    assert np.isclose(delta.new_average, full.semesters["S1"].calculate_average()[row])
+    print("✓ Targeted redeliberation test passed")
+
+def test_structural_change_reevaluates_whole_semesters():
+    """Test that moved and added modules re-evaluate their semesters whole"""
+    old = build_years_manager(n_students=30, seed=2)
+    content = (YEARS_CSV.replace("module,C,Chemistry,1,5,1.5,1.5,1.5,In-person,40,60,U12",
+                                 "module,C,Chemistry,1,5,1.5,1.5,1.5,In-person,40,60,U21")
+               + "unit,U13,Unit 1.3,0,0,0,0,0,In-person,0,0,S1\n"
+               + "module,G,Geology,1,3,1.5,0,0,In-person,40,60,U13\n")
+    report = old.redeliberate(load_version(content))
+    assert report.recomputed == {"S1": None, "S2": None}
+
+    full = with_grades_of(load_version(content), old)
+    for registry, codes in (("semesters", ["S1", "S2", "S3"]), ("years", ["Y1", "Y2"]), ("diplomas", ["MGSI"])):
+        assert reported_cells(report, codes) == changed_cells(old, full, registry, codes), registry
+    # Geology has no grade yet: every student's S1 is incomplete
+    assert all(np.isnan(delta.new_average) for delta in report.deltas() if delta.code == "S1")
+    print("✓ Structural redeliberation test passed")
+
+if __name__ == "__main__":
+    test_changes_are_classified()
+    test_weight_change_only_reevaluates_changed_modules()
+    test_structural_change_reevaluates_whole_semesters()
+    print("All curriculum diff tests passed! ")
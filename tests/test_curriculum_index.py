@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from main import GSIAcademicManager
+from curriculum_index import INDEX_SUFFIX, build_index, load_index
+from test_grade_ingest import write_temp_csv
+
+HEADER = "type,code,title,coef,credit,hours_lecture,hours_td,hours_tp,teaching_mode,continous_percent,exam_percent,parent,program\n"
+
+PROGRAMS_CSV = (
+    HEADER
+    + "module,A1,Algebra,2,4,1.5,1.5,0,In-person,40,60,UA,\n"
+    + "module,B1,Biology,1,3,1.5,0,1.5,Online,40,60,UB,\n"
+    + "module,A2,Analysis,1,2,1.5,1.5,0,In-person,40,60,UA,\n"
+    + "\n"
+    + "module,C1,Chemistry,1,2,1.5,0,0,In-person,40,60,UC,\n"
+    + "unit,UA,Maths,0,0,0,0,0,In-person,0,0,SA,\n"
+    + "unit,UB,Life,0,0,0,0,0,In-person,0,0,SB,\n"
+    + "unit,UC,Matter,0,0,0,0,0,In-person,0,0,SC,\n"
+    + "semester,SA,Semester A,0,0,0,0,0,In-person,0,0,,MATH\n"
+    + "semester,SB,Semester B,0,0,0,0,0,In-person,0,0,,BIO\n"
+    + "semester,SC,Semester C,0,0,0,0,0,In-person,0,0,,BIO\n"
+)
+
+def test_index_maps_semesters_and_programs_to_spans():
+    """Test that each semester's rows are found through its byte spans"""
+    path = write_temp_csv(PROGRAMS_CSV)
+    try:
+        index = build_index(path)
+        with open(path, "rb") as file:
+            data = file.read()
+    finally:
+        os.remove(path)
+    assert index.programs == {"MATH": ["SA"], "BIO": ["SB", "SC"]}
+    rows = [data[span.offset:span.offset + span.length].decode() for span in index.semesters["SA"]]
+    assert [span.line for span in index.semesters["SA"]] == [2, 4, 7, 10]
+    assert "".join(rows).count("\n") == 4 and rows[0].startswith("module,A1")
+    print("✓ Curriculum index test passed")
+
+def test_lazy_loading_reads_only_requested_semesters():
+    """Test that semesters load on first access and match a full load"""
+    path = write_temp_csv(PROGRAMS_CSV)
+    try:
+        full = GSIAcademicManager()
+        assert full.load_from_csv(path)
+        lazy = GSIAcademicManager()
+        assert lazy.open_curriculum(path)
+        assert os.path.exists(path + INDEX_SUFFIX)
+        assert not lazy.modules and not lazy.semesters
+
+        semester = lazy.semesters["SA"]
+        assert sorted(lazy.modules) == ["A1", "A2"] and list(lazy.semesters) == ["SA"]
+        assert [module.name for module in semester._units[0]._modules] == ["A1", "A2"]
+        assert lazy.load_program("BIO")
+        assert sorted(lazy.modules) == sorted(full.modules)
+        for code, module in full.modules.items():
+            assert lazy.modules[code].to_csv() == module.to_csv()
+
+        # The sidecar is reused while the file is unchanged, rebuilt after an edit
+        assert load_index(path) == lazy.curriculum_index
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("module,A3,Geometry,1,2,1.5,x,0,In-person,40,60,UA,\n")
+        edited = GSIAcademicManager()
+        assert edited.open_curriculum(path)
+        assert edited.curriculum_index != lazy.curriculum_index
+        assert edited.load_semesters(["SA"]) is False
+        assert [(p.line, p.column) for p in edited.validation_report.problems] == [(13, "hours_td")]
+    finally:
+        os.remove(path)
+        os.remove(path + INDEX_SUFFIX)
+    print("✓ Lazy curriculum loading test passed")
+
+if __name__ == "__main__":
+    test_index_maps_semesters_and_programs_to_spans()
+    test_lazy_loading_reads_only_requested_semesters()
+    print("All curriculum index tests passed! ")
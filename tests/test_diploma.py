@@ -0,0 +1,53 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from unit import Unit
+from semester import Semester
+from year import Year
+from diploma import Diploma
+from test_year import build_years_manager, exam_only
+
+def test_diploma_is_not_compensated():
+    """Test that a diploma needs every year validated, whatever its average"""
+    first = Year("Y1", "Year 1", [Semester("S1", "Semester 1", [Unit("U1", "Unit 1", [exam_only("M1", 30, 19)])])])
+    second = Year("Y2", "Year 2", [Semester("S2", "Semester 2", [Unit("U2", "Unit 2", [exam_only("M2", 30, 8)])])])
+    diploma = Diploma("D", "Diploma", [first, second])
+    assert diploma.calculate_average() == 13.5
+    assert diploma.calculate_credits() == 30
+    assert diploma.required_credits() == 60 and not diploma.awarded()
+
+    second._semesters[0]._units[0]._modules[0].set_grade(exam=10)
+    assert diploma.calculate_credits() == 60 and diploma.awarded()
+    print("✓ Diploma compensation test passed")
+
+def test_diploma_rollup_survives_snapshot():
+    """Test that diploma results match the object tree, before and after a snapshot"""
+    manager = build_years_manager(n_students=25, seed=3)
+    diploma = manager.diplomas["MGSI"]
+    result = manager.evaluate_diploma("MGSI")
+    assert np.allclose(result.average, diploma.calculate_average())
+    assert np.array_equal(result.credits, diploma.calculate_credits())
+    assert np.array_equal(result.child_credits[0], manager.evaluate_year("Y1").credits)
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "years.snap")
+    try:
+        manager.save_snapshot(path)
+        restored = GSIAcademicManager.from_snapshot(path)
+    finally:
+        os.remove(path)
+        os.rmdir(workdir)
+    assert [year.name for year in restored.diplomas["MGSI"]._years] == ["Y1", "Y2"]
+    assert [semester.name for semester in restored.years["Y1"]._semesters] == ["S1", "S2"]
+    assert np.allclose(restored.evaluate_diploma("MGSI").average, result.average)
+    print("✓ Diploma rollup test passed")
+
+if __name__ == "__main__":
+    test_diploma_is_not_compensated()
+    test_diploma_rollup_survives_snapshot()
+    print("All diploma tests passed! ")
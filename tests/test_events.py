@@ -0,0 +1,47 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from events import GradeEvent, grade_event
+from test_plan import build_cohort_manager
+
+def test_events_are_logged_with_old_values():
+    """Test that applied events record the previous grade, in order"""
+    manager = build_cohort_manager(n_students=10, seed=5)
+    before = manager.cohort.student_grades("S2", "F111")["exam"]
+    manager.apply_events([grade_event("S2", "F111", "exam", 3),
+                          grade_event("S2", "F111", "exam", 4, timestamp=1.0)])
+    first, second = manager.events
+    assert first.old == before and first.new == 3
+    assert second.old == 3 and second.new == 4 and second.timestamp == 1.0
+    assert manager.cohort.student_grades("S2", "F111")["exam"] == 4
+    try:
+        grade_event("S2", "F111", "oral", 12)
+        assert False, "unknown component accepted"
+    except ValueError:
+        pass
+    print("✓ Event log test passed")
+
+def test_change_feed_lists_only_flips():
+    """Test that the feed reports exactly the flipped credits and statuses"""
+    manager = build_cohort_manager(n_students=20, seed=6)
+    for module in manager.modules.values():
+        manager.set_student_grade("S3", module.name, tp=12, td=12, exam=12)
+    module_credits = manager.modules["F111"].calculate_credits()
+    row = manager.cohort.row("S3")
+
+    feed = manager.apply_events([GradeEvent("S3", "F111", "exam", None, 0, 0.0)])
+    codes = {change.code for change in feed}
+    assert "F111" in codes and all(change.student == "S3" for change in feed)
+    change = next(change for change in feed if change.code == "F111")
+    assert change.old_credits == module_credits[row] and change.new_credits == 0
+    assert change.old_passed and not change.new_passed
+    assert manager.modules["F111"].calculate_credits()[row] == 0
+
+    assert manager.set_student_grade("S3", "F111", tp=13) == []
+    print("✓ Change feed test passed")
+
+if __name__ == "__main__":
+    test_events_are_logged_with_old_values()
+    test_change_feed_lists_only_flips()
+    print("All event tests passed! ")
@@ -0,0 +1,86 @@
+import sys
+import os
+import tempfile
+import math
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from main import GSIAcademicManager
+from grade_ingest import ingest_grades
+from cohort import Cohort
+
+CURRICULUM_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gsi_curriculum.csv")
+
+def write_temp_csv(content):
+    """Write content to a temporary CSV file and return its path"""
+    handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8")
+    handle.write(content)
+    handle.close()
+    return handle.name
+
+def test_ingest_grades_in_chunks():
+    """Test that grades are scattered into the cohort across several chunks"""
+    cohort = Cohort([], ["F111", "F112"])
+    path = write_temp_csv(
+        "student_id,module_code,tp,td,exam,resit\n"
+        "S1,F111,12,14,10,11\n"
+        "S2,F111,8,,9,\n"
+        "S1,F112,,15,16,5\n"
+        "S3,F112,1,2,3,\n"
+        "S2,F111,,11,,12.5\n"
+    )
+    try:
+        stats = ingest_grades(path, cohort, chunk_size=2)
+    finally:
+        os.remove(path)
+
+    assert (stats.rows, stats.accepted, stats.rejected) == (5, 5, 0)
+    assert cohort.student_ids == ["S1", "S2", "S3"]
+    assert cohort.student_grades("S1", "F111") == {"tp": 12.0, "td": 14.0, "exam": 10.0, "resit": 11.0}
+    assert cohort.student_grades("S2", "F111") == {"tp": 8.0, "td": 11.0, "exam": 9.0, "resit": 12.5}
+    grades = cohort.student_grades("S1", "F112")
+    assert math.isnan(grades.pop("tp"))
+    assert grades == {"td": 15.0, "exam": 16.0, "resit": 5.0}
+    assert stats.rows_per_second > 0
+    print("✓ Chunked grade ingestion test passed")
+
+def test_ingest_grades_rejects_invalid_rows():
+    """Test that bad rows are counted and skipped without aborting the load"""
+    cohort = Cohort([], ["F111"])
+    path = write_temp_csv(
+        "student_id,module_code,tp,td,exam\n"
+        "S1,F111,12,14,10\n"
+        "S2,F999,12,14,10\n"
+        "S3,F111,abc,14,10\n"
+        "S4,F111,12,14,25\n"
+        ",F111,12,14,10\n"
+    )
+    try:
+        stats = ingest_grades(path, cohort, chunk_size=10)
+    finally:
+        os.remove(path)
+
+    assert (stats.accepted, stats.rejected) == (1, 4)
+    assert cohort.student_ids == ["S1"]
+    print("✓ Invalid grade rows test passed")
+
+def test_manager_load_grades_invalidates_aggregates():
+    """Test that loading grades refreshes cached cohort averages"""
+    manager = GSIAcademicManager()
+    manager.load_from_csv(CURRICULUM_CSV)
+    manager.enable_cohort(["S1"])
+    module = manager.modules["F112"]
+    assert math.isnan(module.calculate_average()[0])
+
+    path = write_temp_csv("student_id,module_code,tp,td,exam\nS1,F112,,20,20\n")
+    try:
+        manager.load_grades_csv(path)
+    finally:
+        os.remove(path)
+    assert module.calculate_average()[0] == 20
+    print("✓ Manager grade loading test passed")
+
+if __name__ == "__main__":
+    test_ingest_grades_in_chunks()
+    test_ingest_grades_rejects_invalid_rows()
+    test_manager_load_grades_invalidates_aggregates()
+    print("All grade ingestion tests passed! ")
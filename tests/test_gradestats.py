@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from cohort import MISSING
+from gradestats import GradeStats
+from test_plan import build_cohort_manager
+
+def _assert_matches(stats, values):
+    assert stats.count == len(values)
+    assert abs(stats.mean - values.mean()) < 1e-9
+    assert abs(stats.variance - values.var()) < 1e-9
+    assert abs(stats.minimum - values.min()) < 1e-9 and abs(stats.maximum - values.max()) < 1e-9
+    assert stats.passed == (values >= 10).sum()
+    assert stats.histogram.sum() == len(values)
+
+def test_merge_and_remove():
+    """Test that shard summaries merge and removals undo additions"""
+    values = np.random.default_rng(1).uniform(0, 20, 1000)
+    merged = GradeStats.merge_all(GradeStats.from_values(shard) for shard in np.array_split(values, 7))
+    _assert_matches(merged, values)
+    assert np.array_equal(merged.histogram, np.histogram(values, bins=np.arange(21))[0])
+
+    merged.remove(values[:300])
+    kept = values[300:]
+    assert abs(merged.mean - kept.mean()) < 1e-9
+    assert abs(merged.variance - kept.var()) < 1e-9
+    print("✓ Statistics merge and remove test passed")
+
+def test_element_and_tracked_statistics():
+    """Test per-element statistics and their incremental maintenance"""
+    manager = build_cohort_manager(n_students=60, seed=2)
+    semester = manager.semesters["S1"]
+    _assert_matches(semester.statistics(), semester.calculate_average())
+
+    tracked = manager.statistics()
+    manager.set_student_grade("S4", "F111", tp=0, td=0, exam=0)
+    manager.set_student_grade("S9", "F111", tp=20, td=20, exam=20)
+    for code, element in (("F111", manager.modules["F111"]), ("UEF11", manager.units["UEF11"]), ("S1", semester)):
+        _assert_matches(tracked[code], element.calculate_average())
+        assert abs(tracked[code].mean - element.statistics().mean) < 1e-9
+    print("✓ Element statistics test passed")
+
+def test_incomplete_records_are_counted_apart():
+    """Test that NaN averages of incomplete records are left out of the statistics"""
+    manager = build_cohort_manager(n_students=30, seed=5)
+    semester = manager.semesters["S1"]
+    tracked = manager.statistics()
+    cohort = manager.cohort
+    cohort.grades[cohort.slot("F111"), cohort.row("S2")] = MISSING
+    cohort.grades[cohort.slot("F112"), cohort.row("S8")] = MISSING
+    cohort.invalidate()
+
+    averages = semester.calculate_average()
+    complete = averages[~np.isnan(averages)]
+    assert len(complete) == 28
+    for stats in (semester.statistics(), tracked["S1"]):
+        _assert_matches(stats, complete)
+        assert stats.incomplete == 2 and stats.as_dict()["incomplete"] == 2
+
+    manager.set_student_grade("S2", "F111", tp=12, td=12, exam=12)
+    assert tracked["S1"].incomplete == 1 and tracked["S1"].count == 29
+    stats = GradeStats.from_values([np.nan, np.nan])
+    assert stats.count == 0 and stats.incomplete == 2 and stats.histogram.sum() == 0
+    print("✓ Incomplete statistics test passed")
+
+if __name__ == "__main__":
+    test_merge_and_remove()
+    test_element_and_tracked_statistics()
+    test_incomplete_records_are_counted_apart()
+    print("All statistics tests passed! ")
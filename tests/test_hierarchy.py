@@ -0,0 +1,76 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from main import GSIAcademicManager
+
+CURRICULUM_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gsi_curriculum.csv")
+
+HEADER = "type,code,title,coef,credit,hours_lecture,hours_td,hours_tp,teaching_mode,continous_percent,exam_percent,parent\n"
+
+def write_temp_csv(content):
+    """Write content to a temporary CSV file and return its path"""
+    handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8")
+    handle.write(content)
+    handle.close()
+    return handle.name
+
+def test_hierarchy_from_parent_column():
+    """Test that the GSI curriculum is wired from the parent column"""
+    manager = GSIAcademicManager()
+    assert manager.load_from_csv(CURRICULUM_CSV)
+    assert manager.hierarchy_report.orphans == []
+    assert manager.hierarchy_report.dangling == []
+    assert [u.name for u in manager.semesters["S1"]._units] == ["UEF11", "UEF12", "UEM11", "UED11", "UET11"]
+    assert [m.name for m in manager.units["UEF11"]._modules] == ["F111", "F112"]
+    print("✓ Hierarchy from parent column test passed")
+
+def test_hierarchy_reports_problems_in_bulk():
+    """Test that orphans and dangling references are all reported"""
+    path = write_temp_csv(
+        HEADER
+        + "module,A1,Module A1,1,1,1.5,0,0,In-person,40,60,U1\n"
+        + "module,A2,Module A2,1,1,1.5,0,0,In-person,40,60,\n"
+        + "module,A3,Module A3,1,1,1.5,0,0,In-person,40,60,UX\n"
+        + "module,A4,Module A4,1,1,1.5,0,0,In-person,40,60,S1\n"
+        + "unit,U1,Unit 1,0,0,0,0,0,In-person,0,0,S1\n"
+        + "semester,S1,Semester 1,0,0,0,0,0,In-person,0,0,\n"
+    )
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path)
+    finally:
+        os.remove(path)
+
+    orphans, dangling = manager.hierarchy_report
+    assert orphans == ["A2"]
+    assert [(code, parent) for code, parent, _ in dangling] == [("A3", "UX"), ("A4", "S1")]
+    assert [m.name for m in manager.units["U1"]._modules] == ["A1"]
+    print("✓ Hierarchy bulk problem report test passed")
+
+def test_hierarchy_sidecar_mapping():
+    """Test that a sidecar mapping file overrides the parent column"""
+    path = write_temp_csv(
+        HEADER
+        + "module,A1,Module A1,1,1,1.5,0,0,In-person,40,60,\n"
+        + "unit,U1,Unit 1,0,0,0,0,0,In-person,0,0,\n"
+        + "semester,S1,Semester 1,0,0,0,0,0,In-person,0,0,\n"
+    )
+    mapping = write_temp_csv("code,parent\nA1,U1\nU1,S1\n")
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path, hierarchy_file=mapping)
+    finally:
+        os.remove(path)
+        os.remove(mapping)
+
+    assert manager.hierarchy_report.orphans == []
+    assert manager.semesters["S1"]._units[0]._modules[0].name == "A1"
+    print("✓ Hierarchy sidecar mapping test passed")
+
+if __name__ == "__main__":
+    test_hierarchy_from_parent_column()
+    test_hierarchy_reports_problems_in_bulk()
+    test_hierarchy_sidecar_mapping()
+    print("All hierarchy tests passed! ")
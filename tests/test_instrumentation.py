@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import instrumentation
+from module import Module
+from unit import Unit
+from main import GSIAcademicManager
+
+def build_unit():
+    """Build a unit with two graded modules"""
+    unit = Unit("UTEST", "Test Unit")
+    for code in ("TEST1", "TEST2"):
+        module = Module(code, "Test Module", exam_percent=100)
+        module.set_grade(exam=12)
+        unit.add_module(module)
+    return unit
+
+def test_instrumentation_records_calls_and_cache_hits():
+    """Test that enabled instrumentation counts computations and cache hits"""
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        unit = build_unit()
+        unit.calculate_average()
+        unit.calculate_average()
+    finally:
+        instrumentation.disable()
+
+    recorded = GSIAcademicManager().stats()
+    assert recorded["timings"]["Unit.calculate_average"]["calls"] == 1
+    assert recorded["timings"]["Module.calculate_average"]["calls"] == 2
+    assert recorded["caches"]["Unit.calculate_average"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert "Unit.calculate_average" in instrumentation.format_stats(recorded)
+    print("✓ Instrumentation recording test passed")
+
+def test_instrumentation_disabled_records_nothing():
+    """Test that nothing is recorded while instrumentation is off"""
+    instrumentation.reset()
+    build_unit().calculate_average()
+    assert instrumentation.stats()["timings"] == {}
+    assert instrumentation.stats()["caches"] == {}
+    print("✓ Disabled instrumentation test passed")
+
+if __name__ == "__main__":
+    test_instrumentation_records_calls_and_cache_hits()
+    test_instrumentation_disabled_records_nothing()
+    print("All instrumentation tests passed! ")
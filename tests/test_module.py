@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from cohort import Cohort
 from module import Module
 
 def test_module_creation():
@@ -38,9 +39,32 @@ def test_module_failing_credits():
     assert credits == 0  # Should get no credits
     print("✓ Module failing credits test passed")
 
+def test_module_passes_at_exactly_ten():
+    """Test that a module averaging exactly 10 passes in single-student and cohort mode"""
+    # 1.75 * 40 / 100 + 15.5 * 60 / 100 == 10, but 1.75 * 0.4 + 15.5 * 0.6 lands just below
+    module = Module("TEST", "Test Module", credit=3, hours_tp=1.5)
+    module.set_grade(tp=1.75, exam=15.5)
+    assert module.calculate_average() == 10
+    assert module.calculate_credits() == 3
+
+    module.bind_cohort(Cohort(["S1"], ["TEST"]))
+    module.set_grade(tp=1.75, exam=15.5, student="S1")
+    assert module.calculate_credits().tolist() == [3]
+    print("✓ Module pass mark boundary test passed")
+
+def test_module_slotted_layout():
+    """Test that modules have no per-instance __dict__ and keep class constants"""
+    module = Module("TEST", "Test Module", hours_td=1.5)
+    assert not hasattr(module, "__dict__")
+    assert module._WEEKS == 15
+    assert module.total_hours == 15 * (1.5 + 1.5)
+    print("✓ Module slotted layout test passed")
+
 if __name__ == "__main__":
     test_module_creation()
     test_module_average()
     test_module_credits()
     test_module_failing_credits()
+    test_module_passes_at_exactly_ten()
+    test_module_slotted_layout()
     print("All module tests passed! ")
\ No newline at end of file
@@ -0,0 +1,38 @@
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from parallel import MIN_STUDENTS_PER_WORKER, pool_workers
+from test_plan import build_cohort_manager
+
+def test_batch_results_match_sequential():
+    """Test that pooled results equal the object tree results"""
+    manager = build_cohort_manager(n_students=37)
+    semester = manager.semesters["S1"]
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = manager.batch_results(workers=2, shard_size=10, executor=executor)["S1"]
+        again = manager.batch_results(shard_size=10, executor=executor)["S1"]
+    assert np.array_equal(again.credits, results.credits)
+    assert results.student_ids == manager.cohort.student_ids
+    assert np.allclose(results.averages, semester.calculate_average())
+    assert np.array_equal(results.credits, semester.calculate_credits())
+    assert np.array_equal(results.passed, semester.calculate_average() >= 10)
+    assert pool_workers(37, workers=4) == 1 and pool_workers(10 * MIN_STUDENTS_PER_WORKER, workers=1) == 1
+    print("✓ Batch results test passed")
+
+def test_batch_results_single_worker():
+    """Test that one worker runs inline and gives the same results"""
+    manager = build_cohort_manager(n_students=12)
+    pooled = manager.batch_results(workers=2, shard_size=5)["S1"]
+    inline = manager.batch_results(workers=1)["S1"]
+    assert np.allclose(pooled.averages, inline.averages)
+    print("✓ Single worker batch results test passed")
+
+if __name__ == "__main__":
+    test_batch_results_match_sequential()
+    test_batch_results_single_worker()
+    print("All parallel tests passed! ")
@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from unit import Unit
+from semester import Semester
+from cohort import encode_grades
+from test_year import exam_only
+
+CURRICULUM_CSV = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gsi_curriculum.csv")
+
+def build_cohort_manager(n_students=50, seed=0):
+    """Load the GSI curriculum with a random cohort"""
+    manager = GSIAcademicManager()
+    manager.load_from_csv(CURRICULUM_CSV)
+    cohort = manager.enable_cohort(["S%d" % i for i in range(n_students)])
+    rng = np.random.default_rng(seed)
+    for module in manager.modules.values():
+        for student in cohort.student_ids:
+            tp, td, exam = rng.uniform(0, 20, 3)
+            module.set_grade(tp=tp, td=td, exam=exam, student=student)
+    return manager
+
+def test_plan_matches_object_tree():
+    """Test that the compiled plan reproduces the Module/Unit/Semester results"""
+    manager = build_cohort_manager()
+    semester = manager.semesters["S1"]
+    result = manager.evaluate_cohort("S1")
+
+    assert np.allclose(result.average, semester.calculate_average())
+    assert np.array_equal(result.credits, semester.calculate_credits())
+    for row, unit in enumerate(semester._units):
+        assert np.allclose(result.unit_averages[row], unit.calculate_average())
+        assert np.array_equal(result.unit_credits[row], unit.calculate_credits())
+    plan = semester.compile()
+    assert np.allclose(plan.average(plan.gather(manager.cohort)), result.average)
+    print("✓ Plan matches object tree test passed")
+
+def test_plan_recompiled_on_structure_change():
+    """Test that coefficient changes recompile the plan but grade changes do not"""
+    manager = build_cohort_manager(n_students=5)
+    semester = manager.semesters["S1"]
+    plan = semester.compile()
+
+    manager.set_student_grade("S0", "F111", exam=20)
+    assert semester.compile() is plan
+
+    manager.modules["F111"].coef = 7
+    recompiled = semester.compile()
+    assert recompiled is not plan
+    assert np.allclose(recompiled.evaluate_cohort(manager.cohort).average,
+                       semester.calculate_average())
+    print("✓ Plan recompilation test passed")
+
+def test_plan_and_tree_compensate_alike_at_the_pass_mark():
+    """Test that a unit averaging exactly 10 is compensated by both evaluation paths"""
+    # (3.5 + 12.5 + 14) / 3 == 10, but 3.5/3 + 12.5/3 + 14/3 lands just below
+    exams = (3.5, 12.5, 14)
+    modules = [exam_only("M%d" % i, 2, exam) for i, exam in enumerate(exams)]
+    semester = Semester("S", "Semester", [Unit("U1", "Unit 1", modules),
+                                          Unit("U2", "Unit 2", [exam_only("M9", 4, 4)])])
+    grades = encode_grades([[[np.nan, np.nan, exam, np.nan]] for exam in exams + (4,)])
+    result = semester.compile().evaluate(grades)
+    assert semester._units[0].calculate_credits() == result.unit_credits[0, 0] == 6
+    assert semester.calculate_credits() == result.credits[0] == 6
+    print("✓ Compensation boundary test passed")
+
+if __name__ == "__main__":
+    test_plan_matches_object_tree()
+    test_plan_recompiled_on_structure_change()
+    test_plan_and_tree_compensate_alike_at_the_pass_mark()
+    print("All plan tests passed! ")
@@ -0,0 +1,179 @@
+import sys
+import os
+import shutil
+import tempfile
+import io
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from concurrency import ConcurrentManager
+from service import GradeService
+from cohort import encode_grades
+from module import Module
+from policies import STANDARD, parse_policy
+from test_grade_ingest import write_temp_csv
+
+HEADER = "type,code,title,coef,credit,hours_lecture,hours_td,hours_tp,teaching_mode,continous_percent,exam_percent,parent,policy,rules\n"
+
+POLICIES_CSV = (
+    HEADER
+    + "policy,RESIT_MAX,Best of both sessions,,,,,,,,,,,resit=max;resit_cap=12\n"
+    + "policy,RESIT_ELIM,Resit replaces exam,,,,,,,,,,,resit=replace;minimum=6\n"
+    + "module,M1,Algebra,2,4,1.5,1.5,0,In-person,40,60,UA,RESIT_MAX,\n"
+    + "module,M2,Physics,1,3,1.5,0,1.5,In-person,40,60,UA,RESIT_ELIM,\n"
+    + "module,M3,English,1,2,1.5,1.5,1.5,Online,40,60,UB,,\n"
+    + "unit,UA,Sciences,2,0,0,0,0,In-person,0,0,S1,,\n"
+    + "unit,UB,Languages,1,0,0,0,0,In-person,0,0,S1,,\n"
+    + "semester,S1,Semester 1,0,0,0,0,0,In-person,0,0,,,\n"
+)
+
+def load_policy_manager():
+    """Load the policy curriculum"""
+    path = write_temp_csv(POLICIES_CSV)
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path)
+    finally:
+        os.remove(path)
+    return manager
+
+def build_policy_manager(n_students=200, seed=0):
+    """Load the policy curriculum with random grades, some resits and exams missing"""
+    manager = load_policy_manager()
+    cohort = manager.enable_cohort(["S%d" % i for i in range(n_students)])
+    rng = np.random.default_rng(seed)
+    grades = rng.integers(0, 81, cohort.grades.shape) / 4
+    grades[..., 3][rng.random(grades.shape[:2]) < 0.5] = np.nan
+    grades[..., 2][rng.random(grades.shape[:2]) < 0.1] = np.nan
+    cohort.grades[...] = encode_grades(grades)
+    cohort.invalidate()
+    return manager
+
+def test_parse_policy_rules():
+    """Test that policy rules are parsed, checked and written back"""
+    policy = parse_policy("P", "resit=max; resit_cap=12;minimum=7.5")
+    assert (policy.resit, policy.resit_cap, policy.minimum) == ("max", 12.0, 7.5)
+    assert parse_policy("P", policy.rules()) == policy
+    assert parse_policy("standard", "") == STANDARD and STANDARD.linear
+    for rules in ("resit=best", "cap=12", "minimum=25", "resit_cap=x"):
+        try:
+            parse_policy("P", rules)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    print("✓ Policy parsing test passed")
+
+def test_single_student_resit_and_eliminatory_grade():
+    """Test resit and eliminatory rules on one student's module"""
+    module = Module("M", "Module", hours_td=1.5, policy=parse_policy("P", "resit=max;resit_cap=12;minimum=6"))
+    module.set_grade(td=16, exam=4)
+    assert abs(module.calculate_average() - (0.4 * 16 + 0.6 * 4)) < 1e-9
+    module.set_grade(resit=15)
+    # The resit counts, capped at 12
+    assert abs(module.calculate_average() - (0.4 * 16 + 0.6 * 12)) < 1e-9
+    assert module.calculate_credits() == 1
+    module.policy = parse_policy("P", "resit=none;minimum=6")
+    assert module.calculate_credits() == 0
+    print("✓ Single-student policy test passed")
+
+def test_policy_kernels_match_object_tree():
+    """Test that compiled policy kernels agree with the modules and SQL"""
+    manager = build_policy_manager()
+    semester = manager.semesters["S1"]
+    plan = semester.compile()
+    assert [policy.name for policy, _ in plan.policy_groups] == ["RESIT_MAX", "RESIT_ELIM"]
+    result = plan.evaluate_cohort(manager.cohort)
+    for m, code in enumerate(plan.module_codes):
+        module = manager.modules[code]
+        assert np.allclose(result.module_averages[m], module.calculate_average(), equal_nan=True)
+        assert np.array_equal(result.module_credits[m], module.calculate_credits())
+    assert np.allclose(result.average, semester.calculate_average(), equal_nan=True)
+
+    # An exam missing at the first session is made up by the resit
+    grades = manager.cohort.module_grades(manager.cohort.slot("M1"))
+    made_up = np.isnan(grades[:, 2]) & ~np.isnan(grades[:, 3])
+    assert made_up.any() and not np.isnan(result.module_averages[0][made_up]).any()
+    # Passed on average but eliminated by the exam grade counted in M2
+    counted = manager.cohort.module_grades(manager.cohort.slot("M2"))
+    counted = np.where(np.isnan(counted[:, 3]), counted[:, 2], counted[:, 3])
+    eliminated = (result.module_averages[1] >= 10) & (counted < 6)
+    assert eliminated.any() and not result.module_credits[1][eliminated].any()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "policies.db")
+        manager.save_to_database(path)
+        restored = GSIAcademicManager.from_database(path)
+        assert restored.modules["M2"].policy == manager.modules["M2"].policy
+        rows = restored.database.semester_results()
+        restored.database.close()
+    finally:
+        shutil.rmtree(workdir)
+    rows = {student: (average, credits) for student, _, average, credits in rows}
+    rows = [rows[student] for student in manager.cohort.student_ids]
+    averages = np.array([np.nan if average is None else average for average, _ in rows])
+    assert np.allclose(averages, result.average, equal_nan=True)
+    assert [credits for _, credits in rows] == result.credits.astype(int).tolist()
+    print("✓ Policy kernel test passed")
+
+def test_eliminated_results_are_not_passed():
+    """Test that a module failed on an eliminatory grade fails its unit and semester everywhere"""
+    # M2: 0.4 * 20 + 0.6 * 5 = 11 on average, but an exam of 5 under minimum=6
+    manager = load_policy_manager()
+    for code, (tp, td, exam) in {"M1": (12, 12, 12), "M2": (20, 0, 5), "M3": (12, 12, 12)}.items():
+        manager.modules[code].set_grade(tp=tp, td=td, exam=exam)
+    tree = manager.result_tree()
+    semester = tree[0]
+    module = semester["units"][0]["modules"][1]
+    assert module["average"] >= 10 and module["credits"] == 0
+    assert not module["passed"] and module["eliminated"]
+    assert not semester["units"][0]["passed"] and semester["units"][1]["passed"]
+    assert semester["average"] >= 10 and not semester["passed"]
+    out = io.StringIO()
+    manager.export_report(out)
+    text = out.getvalue()
+    assert "(Credits: 0) ✗ ELIMINATED" in text and "✓ PASS (Credits: 0)" not in text
+    assert "Status: ✗ ELIMINATED" in text and "Student must repeat the semester" in text
+
+    manager.enable_cohort(["A", "B"])
+    for code, (tp, td, exam) in {"M1": (12, 12, 12), "M2": (20, 0, 5), "M3": (12, 12, 12)}.items():
+        for student in ("A", "B"):
+            manager.modules[code].set_grade(tp=tp, td=td, exam=exam if student == "A" else 12, student=student)
+    assert manager.batch_results(workers=1)["S1"].passed.tolist() == [False, True]
+    assert GradeService(manager).result("A", "S1")["status"] == "ELIMINATED"
+    assert ConcurrentManager(manager).result("B", "S1")["status"] == "PASS"
+    transcripts = io.StringIO()
+    manager.write_transcripts(transcripts)
+    assert transcripts.getvalue().count("✗ ELIMINATED") == 2
+
+    feed = manager.set_student_grade("B", "M2", exam=5)
+    flipped = {change.code: change for change in feed}
+    assert not flipped["M2"].new_passed and not flipped["UA"].new_passed and not flipped["S1"].new_passed
+    print("✓ Eliminated status test passed")
+
+def test_policy_references_are_validated():
+    """Test that undeclared policies and invalid rules are reported"""
+    path = write_temp_csv(
+        HEADER
+        + "policy,BAD,Bad,,,,,,,,,,,resit=sometimes\n"
+        + "module,M1,Algebra,2,4,1.5,1.5,0,In-person,40,60,UA,NOPE,\n"
+        + "unit,UA,Sciences,1,0,0,0,0,In-person,0,0,S1,,\n"
+        + "semester,S1,Semester 1,0,0,0,0,0,In-person,0,0,,,\n"
+    )
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path) is False
+    finally:
+        os.remove(path)
+    assert [(p.line, p.column) for p in manager.validation_report.problems] == [(2, "rules"), (3, "policy")]
+    print("✓ Policy validation test passed")
+
+if __name__ == "__main__":
+    test_parse_policy_rules()
+    test_single_student_resit_and_eliminatory_grade()
+    test_policy_kernels_match_object_tree()
+    test_eliminated_results_are_not_passed()
+    test_policy_references_are_validated()
+    print("All policy tests passed! ")
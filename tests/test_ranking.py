@@ -0,0 +1,112 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from cohort import MISSING
+from ranking import CohortRanking, Ranking
+from synthetic import fill_random_grades
+from test_plan import build_cohort_manager
+
+def _expected_rank(values, index):
+    return int((np.asarray(values) > values[index]).sum()) + 1
+
+def test_ranking_ties_and_percentiles():
+    """Test competition ranks, percentiles and top-k with ties"""
+    ranking = Ranking(["a", "b", "c", "d"], [12.0, 15.0, 12.0, 8.0])
+    assert [ranking.rank(i) for i in range(4)] == [2, 1, 2, 4]
+    assert ranking.percentile(1) == 100.0
+    assert ranking.percentile(3) == 25.0
+    assert ranking.value_at_percentile(50) == 12.0
+    assert ranking.top(2) == [("b", 15.0), ("a", 12.0)]
+
+    ranking.update(3, 16.0)
+    assert ranking.rank(3) == 1 and ranking.rank(1) == 2
+    print("✓ Ranking ties and percentiles test passed")
+
+def test_incomplete_students_are_not_ranked():
+    """Test that students with a NaN average have no rank and do not shift the others"""
+    nan = float("nan")
+    ranking = Ranking(["a", "b", "c", "d"], [nan, 15.0, 12.0, nan])
+    assert len(ranking) == 2
+    assert [ranking.rank(i) for i in range(4)] == [None, 1, 2, None]
+    assert ranking.percentile(0) is None and ranking.percentile(2) == 50.0
+    assert ranking.top(3) == [("b", 15.0), ("c", 12.0)]
+
+    ranking.update(0, 13.0)
+    ranking.update(1, nan)
+    assert [ranking.rank(i) for i in range(4)] == [1, None, 2, None]
+    assert ranking.value_at_percentile(100) == 13.0
+    assert Ranking(["a"], [nan]).value_at_percentile(50) is None
+
+    manager = build_cohort_manager(n_students=20, seed=6)
+    cohort = manager.cohort
+    cohort.grades[cohort.slot("F111"), cohort.row("S3")] = MISSING
+    cohort.invalidate()
+    rankings = manager.rankings()
+    values = manager.semesters["S1"].calculate_average()
+    assert rankings.rank("S1", "S3") is None
+    row = cohort.row("S5")
+    assert rankings.rank("S1", "S5") == _expected_rank(values, row)
+    print("✓ Incomplete ranking test passed")
+
+def test_rankings_follow_grade_updates():
+    """Test that rankings stay exact after single and bulk grade changes"""
+    manager = build_cohort_manager(n_students=40, seed=4)
+    rankings = manager.rankings()
+    row = manager.cohort.row("S7")
+
+    manager.set_student_grade("S7", "F112", tp=20, td=20, exam=20)
+    assert rankings.rank("F112", "S7") == 1
+    for code in ("F112", "UEF11", "S1"):
+        element = manager.modules.get(code) or manager.units.get(code) or manager.semesters[code]
+        values = element.calculate_average()
+        assert abs(rankings.rankings[code].value(row) - values[row]) < 1e-9
+        assert rankings.rank(code, "S7") == _expected_rank(values, row)
+
+    fill_random_grades(manager.cohort, seed=9)
+    averages = manager.semesters["S1"].calculate_average()
+    best = int(np.argmax(averages))
+    assert rankings.top("S1", 1)[0][0] == manager.cohort.student_ids[best]
+    assert manager.rankings() is rankings
+    print("✓ Ranking update test passed")
+
+def test_incremental_rankings_match_a_rebuild():
+    """Test that ties rank alike whether reached by updates or by a rebuild"""
+    manager = build_cohort_manager(n_students=40, seed=11)
+    rankings = manager.rankings()
+    rng = np.random.default_rng(11)
+    codes = list(manager.modules)
+    for _ in range(200):
+        tp, td, exam = rng.integers(0, 81, 3) / 4
+        manager.set_student_grade("S%d" % rng.integers(40), codes[rng.integers(len(codes))],
+                                  tp=tp, td=td, exam=exam)
+    rebuilt = CohortRanking(manager.semesters.values(), manager.cohort)
+    for code in rankings.rankings:
+        assert [rankings.rank(code, student) for student in manager.cohort.student_ids] == \
+            [rebuilt.rank(code, student) for student in manager.cohort.student_ids], code
+    rebuilt.close()
+    print("✓ Incremental ranking consistency test passed")
+
+def test_trackers_follow_curriculum_changes():
+    """Test that rankings and statistics are rebuilt after a coefficient or credit change"""
+    manager = build_cohort_manager(n_students=30, seed=7)
+    rankings, statistics = manager.rankings(), manager.statistics()
+    manager.modules["F111"].coef = 10
+    manager.modules["F112"].credit = 1
+
+    assert manager.rankings() is rankings and manager.statistics() is statistics
+    values = manager.semesters["S1"].calculate_average()
+    row = int(np.argmax(values))
+    assert rankings.rank("S1", manager.cohort.student_ids[row]) == 1
+    assert abs(statistics["S1"].mean - values.mean()) < 1e-9
+    print("✓ Tracker curriculum change test passed")
+
+if __name__ == "__main__":
+    test_ranking_ties_and_percentiles()
+    test_incomplete_students_are_not_ranked()
+    test_rankings_follow_grade_updates()
+    test_incremental_rankings_match_a_rebuild()
+    test_trackers_follow_curriculum_changes()
+    print("All ranking tests passed! ")
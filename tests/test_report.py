@@ -0,0 +1,112 @@
+import sys
+import os
+import csv
+import io
+import json
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from main import GSIAcademicManager
+from test_plan import build_cohort_manager, CURRICULUM_CSV
+from cohort import MISSING
+
+def load_manager():
+    """Load the GSI curriculum with its default grades"""
+    manager = GSIAcademicManager()
+    manager.load_from_csv(CURRICULUM_CSV)
+    return manager
+
+def test_text_report_is_buffered_to_stream():
+    """Test that the structure report can be written to any stream"""
+    manager = load_manager()
+    out = io.StringIO()
+    credits = manager.display_academic_structure(out)
+    text = out.getvalue()
+    assert "GSI ACADEMIC STRUCTURE - SEMESTER 1" in text
+    assert "Semester Average: 11.28/20" in text
+    assert f"Semester Credits: {credits}/" in text
+    print("✓ Buffered text report test passed")
+
+def test_json_and_csv_reports_agree():
+    """Test that JSON and CSV renderings carry the same results"""
+    manager = load_manager()
+    as_json = io.StringIO()
+    as_csv = io.StringIO()
+    manager.export_report(as_json, fmt="json")
+    manager.export_report(as_csv, fmt="csv")
+
+    tree = json.loads(as_json.getvalue())
+    rows = list(csv.DictReader(io.StringIO(as_csv.getvalue())))
+    assert len(rows) == 1 + 5 + 8
+    assert rows[0]["code"] == tree[0]["code"] == "S1"
+    assert abs(float(rows[0]["average"]) - tree[0]["average"]) < 1e-9
+    assert [r["code"] for r in rows if r["level"] == "module"][:2] == ["F111", "F112"]
+    print("✓ JSON and CSV report test passed")
+
+def test_cohort_reports_are_per_student():
+    """Test that reports in cohort mode show one student's results"""
+    manager = build_cohort_manager(n_students=4, seed=8)
+    result = manager.evaluate_cohort("S1")
+    tree = manager.result_tree("S2")
+    assert abs(tree[0]["average"] - result.average[2]) < 1e-9
+    assert tree[0]["credits"] == int(result.credits[2])
+    assert [module["credits"] for module in tree[0]["units"][0]["modules"]] == \
+        result.module_credits[:2, 2].astype(int).tolist()
+
+    out = io.StringIO()
+    assert manager.display_academic_structure(out, student_id="S2") == int(result.credits[2])
+    as_json = io.StringIO()
+    manager.export_report(as_json, fmt="json", student_id="S2")
+    assert json.loads(as_json.getvalue()) == tree
+    try:
+        manager.export_report(io.StringIO())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a cohort report needs a student")
+    print("✓ Per-student cohort report test passed")
+
+def test_cohort_transcripts_stream_in_chunks():
+    """Test that one transcript per student is streamed in every format"""
+    manager = build_cohort_manager(n_students=7)
+    result = manager.evaluate_cohort("S1")
+
+    text = io.StringIO()
+    assert manager.write_transcripts(text, fmt="text", chunk_size=3) == 7
+    assert text.getvalue().count("Student S") == 7
+
+    lines = io.StringIO()
+    manager.write_transcripts(lines, fmt="jsonl", chunk_size=3)
+    records = [json.loads(line) for line in lines.getvalue().splitlines()]
+    assert [r["student_id"] for r in records] == ["S%d" % i for i in range(7)]
+    assert abs(records[4]["semesters"][0]["average"] - result.average[4]) < 1e-3
+
+    table = io.StringIO()
+    manager.write_transcripts(table, fmt="csv", chunk_size=3)
+    rows = list(csv.DictReader(io.StringIO(table.getvalue())))
+    assert len(rows) == 7 * (1 + 5 + 8)
+    print("✓ Cohort transcript streaming test passed")
+
+def test_incomplete_results_are_reported():
+    """Test that missing grades show as incomplete instead of a number"""
+    manager = build_cohort_manager(n_students=3)
+    cohort = manager.cohort
+    cohort.grades[cohort.slot("F111"), cohort.row("S1"), 2] = MISSING
+    cohort.invalidate()
+
+    text = io.StringIO()
+    manager.write_transcripts(text, fmt="text")
+    assert text.getvalue().count("⚠ INCOMPLETE") == 2
+    lines = io.StringIO()
+    manager.write_transcripts(lines, fmt="jsonl")
+    record = json.loads(lines.getvalue().splitlines()[1])
+    assert record["semesters"][0]["average"] is None
+    assert record["semesters"][0]["modules"]["F111"] is None
+    print("✓ Incomplete report test passed")
+
+if __name__ == "__main__":
+    test_text_report_is_buffered_to_stream()
+    test_json_and_csv_reports_agree()
+    test_cohort_reports_are_per_student()
+    test_cohort_transcripts_stream_in_chunks()
+    test_incomplete_results_are_reported()
+    print("All report tests passed! ")
@@ -49,9 +49,31 @@ def test_semester_credits():
     assert credits == 3  # Should get credits
     print("✓ Semester credits calculation test passed")
 
+def test_semester_cache_only_recomputes_ancestor_path():
+    """Test that a grade change only invalidates the changed module's ancestors"""
+    semester = Semester("S1", "Semester 1")
+    unit1 = Unit("U1", "Unit 1")
+    unit2 = Unit("U2", "Unit 2")
+    module1 = Module("TEST1", "Test Module 1", credit=3, exam_percent=100)
+    module2 = Module("TEST2", "Test Module 2", credit=2, exam_percent=100)
+    module1.set_grade(exam=4)
+    module2.set_grade(exam=14)
+    unit1.add_module(module1)
+    unit2.add_module(module2)
+    semester.add_unit(unit1)
+    semester.add_unit(unit2)
+
+    assert semester.calculate_credits() == 2
+    module1.set_grade(exam=12)
+    assert "calculate_credits" in (unit2._cache or {})
+    assert "calculate_credits" not in (unit1._cache or {})
+    assert semester.calculate_credits() == 5
+    print("✓ Semester ancestor path invalidation test passed")
+
 if __name__ == "__main__":
     test_semester_creation()
     test_semester_add_unit()
     test_semester_average()
     test_semester_credits()
+    test_semester_cache_only_recomputes_ancestor_path()
     print("All semester tests passed! ")
\ No newline at end of file
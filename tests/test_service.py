@@ -0,0 +1,61 @@
+import sys
+import os
+import asyncio
+import json
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from service import GradeService
+from test_plan import build_cohort_manager
+
+def test_service_results_and_cache_invalidation():
+    """Test cached results and their invalidation on grade updates"""
+    manager = build_cohort_manager(n_students=4)
+    service = GradeService(manager, cache_size=2)
+    expected = manager.evaluate_cohort("S1")
+
+    first = service.handle({"op": "result", "student": "S2", "semester": "S1"})
+    assert first["ok"] and abs(first["average"] - expected.average[2]) < 1e-3
+    assert service.handle({"op": "result", "student": "S2", "semester": "S1"}) == first
+    assert service.stats() == {"cached": 1, "hits": 1, "misses": 1}
+
+    assert service.handle({"op": "set_grade", "student": "S2", "module": "F111", "exam": 0})["ok"]
+    updated = service.handle({"op": "result", "student": "S2", "semester": "S1"})
+    assert abs(updated["average"] - manager.evaluate_cohort("S1").average[2]) < 1e-3
+    assert updated["average"] < first["average"]
+
+    for student in ("S0", "S1", "S3"):
+        service.handle({"op": "result", "student": student, "semester": "S1"})
+    assert service.stats()["cached"] == 2
+    assert not service.handle({"op": "result", "student": "NOPE", "semester": "S1"})["ok"]
+    assert not service.handle({"op": "dance"})["ok"]
+    print("✓ Service cache test passed")
+
+def test_service_over_tcp():
+    """Test the JSON-lines protocol with concurrent clients"""
+    manager = build_cohort_manager(n_students=3)
+    service = GradeService(manager)
+
+    async def client(port, student):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(json.dumps({"op": "result", "student": student, "semester": "S1"}).encode() + b"\n")
+        writer.write(b"not json\n")
+        await writer.drain()
+        answers = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        return answers
+
+    async def scenario():
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(*(client(port, "S%d" % (i % 3)) for i in range(20)))
+
+    results = asyncio.run(scenario())
+    assert all(answer["ok"] and not error["ok"] for answer, error in results)
+    assert service.stats()["misses"] == 3
+    print("✓ Service TCP protocol test passed")
+
+if __name__ == "__main__":
+    test_service_results_and_cache_invalidation()
+    test_service_over_tcp()
+    print("All service tests passed! ")
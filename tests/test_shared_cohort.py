@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from main import GSIAcademicManager
+from cohort import encode_grades
+from test_plan import build_cohort_manager
+
+def _worker(handle):
+    manager = GSIAcademicManager.attach(handle)
+    averages = manager.semesters["S1"].calculate_average()
+    manager.cohort.grades[manager.cohort.slot("F111"), manager.cohort.row("S0")] = encode_grades(19.5)
+    return averages
+
+def test_workers_share_grades():
+    """Test that attached workers read and write the parent's grade buffer"""
+    manager = build_cohort_manager(n_students=25, seed=7)
+    expected = manager.semesters["S1"].calculate_average()
+    handle = manager.share_cohort()
+    try:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            averages = executor.submit(_worker, handle).result()
+        assert np.allclose(averages, expected)
+        assert manager.cohort.student_grades("S0", "F111") == {"tp": 19.5, "td": 19.5, "exam": 19.5, "resit": 19.5}
+
+        results = manager.batch_results(workers=2, shard_size=10)["S1"]
+        manager.cohort.invalidate()
+        assert np.allclose(results.averages, manager.semesters["S1"].calculate_average())
+    finally:
+        manager.release_cohort()
+    manager.set_student_grade("S1", "F111", exam=3)
+    assert manager.cohort.student_grades("S1", "F111")["exam"] == 3
+    print("✓ Shared cohort test passed")
+
+if __name__ == "__main__":
+    test_workers_share_grades()
+    print("All shared cohort tests passed! ")
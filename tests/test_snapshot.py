@@ -0,0 +1,63 @@
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from test_plan import build_cohort_manager, CURRICULUM_CSV
+
+def test_snapshot_round_trip():
+    """Test that a snapshot restores structure, grades and cohort"""
+    manager = build_cohort_manager(n_students=20)
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "gsi.snap")
+        manager.save_snapshot(path)
+        restored = GSIAcademicManager.from_snapshot(path)
+
+        assert isinstance(restored.cohort._grades, np.memmap)
+        assert restored.cohort.student_ids == manager.cohort.student_ids
+        assert [u.name for u in restored.semesters["S1"]._units] == [u.name for u in manager.semesters["S1"]._units]
+        assert np.allclose(restored.semesters["S1"].calculate_average(),
+                           manager.semesters["S1"].calculate_average())
+        assert restored.modules["F111"]._grades == manager.modules["F111"]._grades
+    finally:
+        shutil.rmtree(workdir)
+    print("✓ Snapshot round trip test passed")
+
+def test_snapshot_invalidated_by_source_change():
+    """Test that editing the source CSV makes the snapshot stale"""
+    workdir = tempfile.mkdtemp()
+    try:
+        csv_file = os.path.join(workdir, "curriculum.csv")
+        snapshot_file = os.path.join(workdir, "curriculum.snap")
+        shutil.copy(CURRICULUM_CSV, csv_file)
+
+        assert GSIAcademicManager.load_cached(csv_file, snapshot_file) is not None
+        assert GSIAcademicManager.from_snapshot(snapshot_file, source_csv=csv_file) is not None
+
+        with open(csv_file, "a", encoding="utf-8") as file:
+            file.write("\nmodule,X111,Extra,1,1,1.5,0,0,In-person,40,60,UEF11\n")
+        assert GSIAcademicManager.from_snapshot(snapshot_file, source_csv=csv_file) is None
+
+        reloaded = GSIAcademicManager.load_cached(csv_file, snapshot_file)
+        assert "X111" in reloaded.modules
+        assert GSIAcademicManager.from_snapshot(snapshot_file, source_csv=csv_file) is not None
+
+        # A missing source makes the snapshot stale instead of raising
+        os.remove(csv_file)
+        assert GSIAcademicManager.from_snapshot(snapshot_file, source_csv=csv_file) is None
+        assert GSIAcademicManager.load_cached(csv_file, snapshot_file) is None
+        reloaded.save_snapshot(snapshot_file, source_csv=csv_file)
+        assert GSIAcademicManager.from_snapshot(snapshot_file) is not None
+    finally:
+        shutil.rmtree(workdir)
+    print("✓ Snapshot invalidation test passed")
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_snapshot_invalidated_by_source_change()
+    print("All snapshot tests passed! ")
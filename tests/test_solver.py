@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from module import Module
+from unit import Unit
+from semester import Semester
+from policies import parse_policy
+from solver import required_exam_grades, solve_linear
+from test_plan import build_cohort_manager
+
+def test_solve_linear_edge_cases():
+    """Test already-passed, reachable, unreachable and exam-free cases"""
+    needed = solve_linear([12, 4, 0, 9, 11], [0.6, 0.6, 0.4, 0, 0], 10)
+    assert needed[0] == 0
+    assert abs(needed[1] - 10) < 1e-9
+    assert np.isinf(needed[2])
+    assert np.isinf(needed[3])
+    assert needed[4] == 0
+    print("✓ Linear solver edge cases test passed")
+
+def test_exact_quarter_points_are_not_rounded_up():
+    """Test that float noise on an exact quarter-point answer does not add a quarter point"""
+    # 0.6 * 11.5 + 0.4 * 7.75 == 10, but (10 - 6.9) / 0.4 lands just above 7.75
+    needed = solve_linear([0.6 * 11.5, 0.7 * 7, 0.2 * 19], [0.4, 0.3, 0.8], 10)
+    assert needed.tolist() == [7.75, 17.0, 7.75]
+
+    # An eliminatory grade of 7.3 needs 7.5, the next grade that can be stored
+    module = Module("M", "Module", exam_percent=100, policy=parse_policy("P", "minimum=7.3"))
+    plan = Semester("S", "Semester", [Unit("U", "Unit", [module])]).compile()
+    required = required_exam_grades(plan, np.zeros((1, 1, 4)), target=5)
+    assert required.modules[0, 0] == 7.5 and required.semester[0] == 5
+    print("✓ Exact quarter point test passed")
+
+def test_required_exam_reaches_target():
+    """Test that the solved exam grades exactly reach 10/20"""
+    manager = build_cohort_manager(n_students=30, seed=3)
+    for module in manager.modules.values():
+        manager.set_student_grade("S5", module.name, tp=8, td=7, exam=0)
+    required = manager.required_exam_grades("S1", student_ids=["S1", "S5"])
+    assert required.semester.shape == (2,)
+
+    plan = manager.semesters["S1"].compile()
+    module_exam = required.modules[plan.module_codes.index("F112"), 1]
+    semester_exam = required.semester[1]
+    assert 0 < module_exam < 20 and 0 < semester_exam < 20
+
+    row = manager.cohort.row("S5")
+    manager.set_student_grade("S5", "F112", exam=module_exam)
+    # Rounded up to a quarter point: reaches 10 by less than one quarter of exam weight
+    assert 10 <= manager.modules["F112"].calculate_average()[row] < 10 + 0.25
+
+    for module in manager.modules.values():
+        manager.set_student_grade("S5", module.name, exam=semester_exam)
+    assert 10 <= manager.semesters["S1"].calculate_average()[row] < 10 + 0.25
+    print("✓ Required exam grade test passed")
+
+if __name__ == "__main__":
+    test_solve_linear_edge_cases()
+    test_exact_quarter_points_are_not_rounded_up()
+    test_required_exam_reaches_target()
+    print("All solver tests passed! ")
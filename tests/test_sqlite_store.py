@@ -0,0 +1,68 @@
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from sqlite_store import SQLiteGradeStore
+from test_plan import build_cohort_manager
+
+def result_unit_codes(manager):
+    """Unit codes of S1 in plan order"""
+    return manager.semesters["S1"].compile().unit_codes
+
+def test_sql_aggregates_match_compiled_plan():
+    """Test that SQL unit and semester aggregates equal the in-memory results"""
+    manager = build_cohort_manager(n_students=15)
+    result = manager.evaluate_cohort("S1")
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "grades.db")
+        manager.save_to_database(path)
+        with SQLiteGradeStore(path) as store:
+            assert store.grade_count() == 15 * 8
+            semesters = store.semester_results()
+            assert [row[0] for row in semesters] == sorted(manager.cohort.student_ids)
+            by_student = {sid: (avg, credits) for sid, _, avg, credits in semesters}
+            for index, sid in enumerate(manager.cohort.student_ids):
+                assert abs(by_student[sid][0] - result.average[index]) < 1e-9
+                assert by_student[sid][1] == result.credits[index]
+
+            units = {code: avg for _, code, avg, _ in store.unit_results(student_id="S3")}
+            for u, code in enumerate(result_unit_codes(manager)):
+                assert abs(units[code] - result.unit_averages[u, 3]) < 1e-9
+    finally:
+        shutil.rmtree(workdir)
+    print("✓ SQL aggregates test passed")
+
+def test_partial_cohort_load_and_upsert():
+    """Test loading only some students and upserting partial grades"""
+    manager = build_cohort_manager(n_students=6)
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "grades.db")
+        manager.save_to_database(path)
+        with SQLiteGradeStore(path) as store:
+            store.insert_grades([("S2", "F112", None, 19.5, None)])
+
+        restored = GSIAcademicManager.from_database(path)
+        assert restored.load_students_from_database(["S2", "S4"]) == 16
+        assert restored.cohort.student_ids == ["S2", "S4"]
+        expected = manager.cohort.student_grades("S2", "F112")
+        expected["td"] = 19.5
+        restored_grades = restored.cohort.student_grades("S2", "F112")
+        assert restored_grades.keys() == expected.keys()
+        assert np.array_equal(list(restored_grades.values()), list(expected.values()), equal_nan=True)
+        assert [u.name for u in restored.semesters["S1"]._units] == result_unit_codes(manager)
+        restored.database.close()
+    finally:
+        shutil.rmtree(workdir)
+    print("✓ Partial cohort load test passed")
+
+if __name__ == "__main__":
+    test_sql_aggregates_match_compiled_plan()
+    test_partial_cohort_load_and_upsert()
+    print("All SQLite store tests passed! ")
@@ -0,0 +1,32 @@
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from main import GSIAcademicManager
+from synthetic import write_synthetic_curriculum, write_synthetic_grades
+
+def test_synthetic_curriculum_loads_cleanly():
+    """Test that a generated curriculum and grade export load without problems"""
+    workdir = tempfile.mkdtemp()
+    curriculum_csv = os.path.join(workdir, "curriculum.csv")
+    grades_csv = os.path.join(workdir, "grades.csv")
+    module_codes = write_synthetic_curriculum(curriculum_csv, semesters=2, units=3, modules=4)
+    write_synthetic_grades(grades_csv, module_codes, students=5)
+
+    manager = GSIAcademicManager()
+    assert manager.load_from_csv(curriculum_csv)
+    stats = manager.load_grades_csv(grades_csv)
+    os.remove(curriculum_csv)
+    os.remove(grades_csv)
+    os.rmdir(workdir)
+
+    assert len(module_codes) == 24
+    assert manager.hierarchy_report == ([], [])
+    assert [len(s._units) for s in manager.semesters.values()] == [3, 3]
+    assert (stats.accepted, stats.rejected) == (5 * 24, 0)
+    print("✓ Synthetic curriculum test passed")
+
+if __name__ == "__main__":
+    test_synthetic_curriculum_loads_cleanly()
+    print("All synthetic generator tests passed! ")
@@ -36,8 +36,30 @@ def test_unit_average():
     assert average > 0
     print("✓ Unit average calculation test passed")
 
+def test_unit_average_cache_invalidation():
+    """Test that cached unit averages follow grade and coefficient changes"""
+    unit = Unit("UTEST", "Test Unit")
+    module1 = Module("TEST1", "Test Module 1", coef=1, exam_percent=100)
+    module2 = Module("TEST2", "Test Module 2", coef=1, exam_percent=100)
+    module1.set_grade(exam=10)
+    module2.set_grade(exam=20)
+    unit.add_module(module1)
+    unit.add_module(module2)
+
+    assert unit.calculate_average() == 15
+    assert "calculate_average" in (unit._cache or {})
+
+    module1.set_grade(exam=16)
+    assert "calculate_average" not in (unit._cache or {})
+    assert unit.calculate_average() == 18
+
+    module2.coef = 3
+    assert unit.calculate_average() == 19
+    print("✓ Unit cache invalidation test passed")
+
 if __name__ == "__main__":
     test_unit_creation()
     test_unit_add_module()
     test_unit_average()
+    test_unit_average_cache_invalidation()
     print("All unit tests passed! ")
\ No newline at end of file
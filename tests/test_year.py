@@ -0,0 +1,123 @@
+import sys
+import os
+import csv
+import io
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+from main import GSIAcademicManager
+from module import Module
+from unit import Unit
+from semester import Semester
+from year import Year
+from policies import parse_policy
+from test_hierarchy import HEADER, write_temp_csv
+
+YEARS_CSV = (
+    HEADER
+    + "diploma,MGSI,Master GSI,0,0,0,0,0,In-person,0,0,\n"
+    + "year,Y1,Year 1,0,0,0,0,0,In-person,0,0,MGSI\n"
+    + "year,Y2,Year 2,0,0,0,0,0,In-person,0,0,MGSI\n"
+    + "semester,S1,Semester 1,0,0,0,0,0,In-person,0,0,Y1\n"
+    + "semester,S2,Semester 2,0,0,0,0,0,In-person,0,0,Y1\n"
+    + "semester,S3,Semester 3,0,0,0,0,0,In-person,0,0,Y2\n"
+    + "unit,U11,Unit 1.1,0,0,0,0,0,In-person,0,0,S1\n"
+    + "unit,U12,Unit 1.2,0,0,0,0,0,In-person,0,0,S1\n"
+    + "unit,U21,Unit 2.1,0,0,0,0,0,In-person,0,0,S2\n"
+    + "unit,U31,Unit 3.1,0,0,0,0,0,In-person,0,0,S3\n"
+    + "module,A,Algebra,2,6,1.5,1.5,0,In-person,40,60,U11\n"
+    + "module,B,Biology,1,4,1.5,0,1.5,In-person,40,60,U11\n"
+    + "module,C,Chemistry,1,5,1.5,1.5,1.5,In-person,40,60,U12\n"
+    + "module,D,Databases,3,8,1.5,1.5,0,In-person,40,60,U21\n"
+    + "module,E,English,1,2,1.5,1.5,0,Online,40,60,U21\n"
+    + "module,F,Finance,2,10,1.5,1.5,0,In-person,40,60,U31\n"
+)
+
+def load_years_manager():
+    """Load the two-year curriculum"""
+    path = write_temp_csv(YEARS_CSV)
+    try:
+        manager = GSIAcademicManager()
+        assert manager.load_from_csv(path)
+    finally:
+        os.remove(path)
+    return manager
+
+def build_years_manager(n_students=40, seed=0):
+    """Load the two-year curriculum with a random cohort"""
+    manager = load_years_manager()
+    cohort = manager.enable_cohort(["S%d" % i for i in range(n_students)])
+    rng = np.random.default_rng(seed)
+    for module in manager.modules.values():
+        for student in cohort.student_ids:
+            tp, td, exam = rng.uniform(4, 16, 3)
+            module.set_grade(tp=tp, td=td, exam=exam, student=student)
+    return manager
+
+def exam_only(code, credit, exam):
+    """A module graded on its exam alone"""
+    module = Module(code, code, credit=credit, exam_percent=100)
+    module.set_grade(exam=exam)
+    return module
+
+def test_year_compensates_semesters():
+    """Test that a year average of 10 awards the credits of a failed semester"""
+    weak = Semester("S1", "Semester 1", [Unit("U1", "Unit 1", [exam_only("M1", 4, 6), exam_only("M2", 2, 11)])])
+    strong = Semester("S2", "Semester 2", [Unit("U2", "Unit 2", [exam_only("M3", 6, 16)])])
+    year = Year("Y1", "Year 1", [weak, strong])
+    assert weak.calculate_credits() == 2
+    assert year.required_credits() == 12
+    assert year.calculate_average() == (8.5 + 16) / 2
+    assert year.calculate_credits() == 12
+
+    # An eliminatory grade blocks compensation at every level
+    weak._units[0]._modules[0].policy = parse_policy("ELIM", "minimum=7")
+    assert year.calculate_credits() == 8
+    print("✓ Year compensation test passed")
+
+def test_year_rollup_reuses_semester_results():
+    """Test that year results match the object tree and reuse unchanged semesters"""
+    manager = build_years_manager()
+    year = manager.years["Y1"]
+    result = manager.evaluate_year("Y1")
+    assert np.allclose(result.average, year.calculate_average())
+    assert np.array_equal(result.credits, year.calculate_credits())
+    assert np.array_equal(result.child_credits[1], manager.semesters["S2"].calculate_credits())
+    compensated = result.child_credits.sum(axis=0) < result.credits
+    assert compensated.any() and (result.average[compensated] >= 10).all()
+    assert manager.evaluate_year("Y1") is result
+
+    first = manager.semesters["S1"].evaluate_cohort(manager.cohort)
+    manager.set_student_grade("S3", "D", exam=20)
+    updated = manager.evaluate_year("Y1")
+    assert updated is not result
+    assert manager.semesters["S1"].evaluate_cohort(manager.cohort) is first
+    assert np.allclose(updated.average, year.calculate_average())
+    print("✓ Year rollup test passed")
+
+def test_required_credits_are_derived_in_reports():
+    """Test that reports show credit totals derived from the structure"""
+    manager = load_years_manager()
+    for module in manager.modules.values():
+        module.set_grade(tp=12, td=12, exam=12)
+    assert [manager.semesters[code].required_credits() for code in ("S1", "S2", "S3")] == [15, 10, 10]
+    assert manager.diplomas["MGSI"].required_credits() == 35
+
+    out = io.StringIO()
+    manager.calculate_student_results(out)
+    text = out.getvalue()
+    assert "Credits Obtained: 15/15" in text and "Credits Obtained: 35/35" in text
+    assert "Student has validated the year" in text and "Diploma awarded" in text
+
+    table = io.StringIO()
+    manager.export_report(table, fmt="csv")
+    rows = list(csv.DictReader(io.StringIO(table.getvalue())))
+    assert [(row["level"], row["parent"]) for row in rows[:3]] == [("diploma", ""), ("year", "MGSI"), ("semester", "Y1")]
+    print("✓ Derived credit totals test passed")
+
+if __name__ == "__main__":
+    test_year_compensates_semesters()
+    test_year_rollup_reuses_semester_results()
+    test_required_credits_are_derived_in_reports()
+    print("All year tests passed! ")
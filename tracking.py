@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Above this share of changed students, rebuilding beats incremental updates
+REBUILD_FRACTION = 0.1
+
+
+class CohortTracker(ABC):
+    """Per-element view of a cohort's results, kept up to date as grades change.
+
+    Subclasses receive the averages of every module, unit and semester
+    through reset(code, values) on (re)build, then update(code, rows, values)
+    with the new averages of the changed students only. The tracker follows
+    the cohort: a grade change re-evaluates the changed students through the
+    compiled plans, and bulk or structural changes trigger a rebuild.
+    """
+
+    def __init__(self, semesters, cohort):
+        self.semesters = list(semesters)
+        self.cohort = cohort
+        self.rebuild()
+        cohort.subscribe(self._on_change)
+
+    def close(self):
+        """Stop following grade changes."""
+        self.cohort.unsubscribe(self._on_change)
+
+    @abstractmethod
+    def reset(self, code, values):
+        """Take the averages of every student in an element, on (re)build."""
+        pass
+
+    @abstractmethod
+    def update(self, code, rows, values):
+        """Take the new averages of the students at rows in an element."""
+        pass
+
+    def rebuild(self):
+        """Recompute every element from scratch."""
+        self._plans = {}
+        # module slot -> [(semester code, module index)]
+        self._by_slot = {}
+        for semester in self.semesters:
+            plan = semester.compile()
+            slots = np.array([self.cohort.slot(code) for code in plan.module_codes], dtype=np.intp)
+            self._plans[semester.name] = (plan, slots)
+            result = plan.evaluate(self.cohort.grades[slots])
+
+            self.reset(semester.name, result.average)
+            for u, code in enumerate(plan.unit_codes):
+                self.reset(code, result.unit_averages[u])
+            for m, code in enumerate(plan.module_codes):
+                self.reset(code, result.module_averages[m])
+                self._by_slot.setdefault(int(slots[m]), []).append((semester.name, m))
+
+    def stale(self):
+        """Whether a semester was recompiled (coefficients, credits or structure changed) since the last build."""
+        return any(semester.compile() is not self._plans[semester.name][0]
+                   for semester in self.semesters)
+
+    def _on_change(self, slots, rows):
+        if slots is None or self.stale() or len(rows) > REBUILD_FRACTION * len(self.cohort):
+            self.rebuild()
+            return
+
+        # semester code -> module index -> changed rows
+        touched = {}
+        for slot, row in zip(np.asarray(slots).tolist(), np.asarray(rows).tolist()):
+            for semester_code, m in self._by_slot.get(slot, ()):
+                touched.setdefault(semester_code, {}).setdefault(m, set()).add(row)
+
+        for semester_code, modules in touched.items():
+            plan, plan_slots = self._plans[semester_code]
+            changed = np.array(sorted(set().union(*modules.values())), dtype=np.intp)
+            result = plan.evaluate(self.cohort.grades[np.ix_(plan_slots, changed)])
+            column = {row: i for i, row in enumerate(changed.tolist())}
+
+            unit_rows = {}
+            for m, module_rows in modules.items():
+                module_rows = sorted(module_rows)
+                columns = [column[row] for row in module_rows]
+                self.update(plan.module_codes[m], np.array(module_rows, dtype=np.intp),
+                            result.module_averages[m, columns])
+                for u in np.flatnonzero(plan.unit_membership[:, m]).tolist():
+                    unit_rows.setdefault(u, set()).update(module_rows)
+            for u, rows_of_unit in unit_rows.items():
+                rows_of_unit = sorted(rows_of_unit)
+                self.update(plan.unit_codes[u], np.array(rows_of_unit, dtype=np.intp),
+                            result.unit_averages[u, [column[row] for row in rows_of_unit]])
+            self.update(semester_code, changed, result.average)
@@ -1,30 +1,47 @@
-from academicelement import AcademicElement
+from academicelement import AcademicElement, cached_aggregate
+from instrumentation import instrumented
 
 class Unit(AcademicElement):
     """Represents a teaching unit containing multiple modules."""
 
+    __slots__ = ("_modules",)
+
     def __init__(self, name, title, modules=None):
         super().__init__(name, title)
-        self._modules = modules if modules is not None else []
-        self.coef = 1
+        self._modules = []
+        self._coef = 1
+        for module in modules or []:
+            self.add_module(module)
 
     def add_module(self, module):
         """Add a module to the unit."""
         self._modules.append(module)
+        self._adopt(module)
+
+    # Generic entry point used by the hierarchy builder
+    add_child = add_module
+
+    def children(self):
+        return self._modules
 
+    @cached_aggregate
+    @instrumented("Unit.calculate_average")
     def calculate_average(self):
-        """Calculate unit average from module averages."""
+        """Calculate unit average from module averages (NaN while one is incomplete)."""
         if not self._modules:
             return 0
-        total = sum(m.calculate_average() * m.coef for m in self._modules)
+        # Modules without weight cannot make the unit incomplete
+        total = sum(m.calculate_average() * m.coef for m in self._modules if m.coef)
         coef_sum = sum(m.coef for m in self._modules)
         return total / coef_sum if coef_sum != 0 else 0
 
+    @cached_aggregate
+    @instrumented("Unit.calculate_credits")
     def calculate_credits(self):
-        """Calculate total credits for the unit."""
+        """Calculate total credits for the unit, all of them when its average compensates."""
         if not self._modules:
             return 0
-        return sum(m.calculate_credits() for m in self._modules)
+        return self._compensate(sum(m.calculate_credits() for m in self._modules))
 
     def display_modules(self):
         """Display all modules in this unit."""
@@ -0,0 +1,95 @@
+from collections import namedtuple
+
+import numpy as np
+
+from academicelement import AcademicElement, cached_aggregate, cached_cohort_result
+from instrumentation import instrumented
+from plan import passes
+
+RollupResult = namedtuple("RollupResult", ["averages", "average", "credits", "child_credits", "eliminated"])
+RollupResult.__doc__ = """Cohort results of a year or diploma, one column per student.
+
+averages and child_credits have one row per semester (or year), in order.
+The average is NaN (incomplete) while a weighted child average is.
+"""
+
+
+def rollup(results, coefs, required, compensate=True):
+    """Combine the cohort results of the children of an element into its own.
+
+    results holds one SemesterResult or RollupResult per child and coefs
+    their weights. With compensate, an average reaching the pass mark awards
+    the required credits, unless a module was failed on an eliminatory grade.
+    Only the children's averages and credits are read: no module is
+    evaluated again.
+    """
+    averages = np.array([result.average for result in results], dtype=np.float64)
+    child_credits = np.array([result.credits for result in results], dtype=np.float64)
+    eliminated = np.logical_or.reduce([result.eliminated for result in results])
+    coefs = np.asarray(coefs, dtype=np.float64)
+    weighted = coefs > 0
+    # Children without weight cannot make the average incomplete
+    average = coefs[weighted] @ averages[weighted] / coefs.sum() if weighted.any() \
+        else np.zeros(averages.shape[1:])
+    credits = child_credits.sum(axis=0)
+    if compensate:
+        credits = np.where(passes(average) & ~eliminated, required, credits)
+    return RollupResult(averages, average, credits, child_credits, eliminated)
+
+
+class Year(AcademicElement):
+    """Represents an academic year containing its semesters."""
+
+    __slots__ = ("_semesters",)
+
+    def __init__(self, name, title, semesters=None):
+        super().__init__(name, title)
+        self._semesters = []
+        self._coef = 1
+        for semester in semesters or []:
+            self.add_semester(semester)
+
+    def add_semester(self, semester):
+        """Add a semester to the year."""
+        self._semesters.append(semester)
+        self._adopt(semester)
+
+    # Generic entry point used by the hierarchy builder
+    add_child = add_semester
+
+    def children(self):
+        return self._semesters
+
+    @cached_aggregate
+    @instrumented("Year.calculate_average")
+    def calculate_average(self):
+        """Calculate the year average from semester averages (NaN while one is incomplete)."""
+        if not self._semesters:
+            return 0
+        total = sum(semester.calculate_average() * semester.coef for semester in self._semesters if semester.coef)
+        coef_sum = sum(semester.coef for semester in self._semesters)
+        return total / coef_sum if coef_sum != 0 else 0
+
+    @cached_aggregate
+    @instrumented("Year.calculate_credits")
+    def calculate_credits(self):
+        """Calculate the credits earned in the year, all of them when its average compensates."""
+        if not self._semesters:
+            return 0
+        return self._compensate(sum(semester.calculate_credits() for semester in self._semesters))
+
+    @cached_cohort_result
+    @instrumented("Year.evaluate_cohort")
+    def evaluate_cohort(self, cohort):
+        """RollupResult of every cohort student, from the cached semester results."""
+        return rollup([semester.evaluate_cohort(cohort) for semester in self._semesters],
+                      [semester.coef for semester in self._semesters], self.required_credits())
+
+    def display_semesters(self):
+        """Display all semesters in this year."""
+        return [semester.display_info() for semester in self._semesters]
+
+    @classmethod
+    def from_csv(cls, csv_data):
+        """Create Year instance from CSV data."""
+        return cls(csv_data['code'], csv_data['title'])